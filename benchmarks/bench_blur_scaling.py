@@ -0,0 +1,142 @@
+# bench_blur_scaling.py
+
+"""
+블러 작업 스레드 수에 따른 처리량 벤치마크
+
+BlurPipeline이 작업 스레드 풀에서 실행하는 것과 같은 방식(가로 띠 분할 + render_band)으로
+전체 프레임을 블러하고, 스레드 수별 초당 처리 메가픽셀과 1스레드 대비 배율을 출력합니다.
+GUI가 필요 없으므로 디스플레이 없이 실행됩니다.
+--mode pixelate를 주면 같은 조건에서 모자이크(합 영역 테이블) 경로를 측정합니다.
+--downscale n을 주면 BlurPipeline의 축소 해상도 계산처럼 프레임을 1/n로 줄이고
+강도(블록 크기)도 1/n로 나눠 측정합니다. 처리 메가픽셀은 원본 프레임 기준입니다.
+기본값(0)은 앱과 같이 강도로 n을 자동 선택합니다 (축소 자체의 비용은 포함하지 않음).
+
+사용법:
+    python benchmarks/bench_blur_scaling.py
+    python benchmarks/bench_blur_scaling.py --workers 1 2 4 8 --strength 16 --output scaling.json
+    python benchmarks/bench_blur_scaling.py --mode pixelate --strength 32
+    python benchmarks/bench_blur_scaling.py --downscale 1 2 4
+    python benchmarks/bench_blur_scaling.py --workers 1 --downscale 0 1
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from concurrent.futures import ThreadPoolExecutor, wait
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+
+from python.soft_blur import default_engine, default_pixelate_engine
+from python.blur_workers import split_bands, render_band
+from python.blur_pipeline import choose_downscale, AUTO_DOWNSCALE
+
+FRAME_SIZES = [(1920, 1080), (3840, 2160)]
+
+
+def worker_counts(limit):
+    """1, 2, 4, ... limit 까지의 스레드 수 목록"""
+    counts = []
+    workers = 1
+    while workers < limit:
+        counts.append(workers)
+        workers *= 2
+    counts.append(limit)
+    return counts
+
+
+def blur_frame(executor, workers, pixels, strength, engine=default_engine):
+    """프레임 하나를 workers개의 띠로 나눠 블러합니다."""
+    height, width = pixels.shape[:2]
+    out = np.empty_like(pixels)
+    regions = [(0, height, 0, width)]
+    futures = [
+        executor.submit(render_band, engine, pixels, None, out, band, regions, strength)
+        for band in split_bands(height, workers)
+    ]
+    wait(futures)
+    for future in futures:
+        future.result()
+    return out
+
+
+def bench_scaling(sizes, counts, strength, repeats, engine=default_engine, downscale=1):
+    rng = np.random.default_rng(0)
+    results = {}
+    if downscale > 1:
+        strength = max(1, strength // downscale) if engine is default_pixelate_engine \
+            else strength / downscale
+    for width, height in sizes:
+        pixels = rng.integers(0, 256, size=(-(-height // downscale), -(-width // downscale), 4),
+                              dtype=np.uint8)
+        megapixels = width * height / 1e6
+        baseline = None
+        rows = {}
+        for workers in counts:
+            with ThreadPoolExecutor(workers) as executor:
+                blur_frame(executor, workers, pixels, strength, engine)  # 준비 실행
+                samples = []
+                for _ in range(repeats):
+                    started = time.perf_counter()
+                    blur_frame(executor, workers, pixels, strength, engine)
+                    samples.append(time.perf_counter() - started)
+            best = min(samples)
+            throughput = megapixels / best
+            baseline = baseline or throughput
+            rows[str(workers)] = {
+                "frame_ms": best * 1000.0,
+                "megapixels_per_s": throughput,
+                "speedup": throughput / baseline,
+            }
+            print(f"{width}x{height} 1/{downscale}  workers {workers:2d}  {best * 1000.0:8.2f} ms  "
+                  f"{throughput:8.1f} MP/s  x{throughput / baseline:4.2f}")
+        key = f"{width}x{height}" if downscale == 1 else f"{width}x{height}@1/{downscale}"
+        results[key] = rows
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScreenBlur 블러 스레드 수 확장성 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", help="측정할 스레드 수 (기본: 1, 2, 4, ... 코어 수)")
+    parser.add_argument("--strength", type=int, default=12, help="블러 강도 또는 모자이크 블록 크기 (기본 12)")
+    parser.add_argument("--mode", choices=("blur", "pixelate"), default="blur", help="측정할 표시 방식")
+    parser.add_argument("--downscale", type=int, nargs="+", default=[AUTO_DOWNSCALE],
+                        help="측정할 축소 배율 n (1/n 해상도로 계산, 기본 0 = 강도로 자동 선택)")
+    parser.add_argument("--repeats", type=int, default=10, help="스레드 수별 반복 횟수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    counts = args.workers or worker_counts(os.cpu_count() or 1)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": args.mode,
+            "strength": args.strength,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scaling": {},
+    }
+    engine = default_pixelate_engine if args.mode == "pixelate" else default_engine
+    for downscale in args.downscale:
+        if downscale == AUTO_DOWNSCALE:
+            # 앱과 같은 자동 선택 (화면 배율 1 기준)
+            downscale = choose_downscale(args.mode, args.strength, args.strength, 1.0)
+        results["scaling"].update(bench_scaling(
+            FRAME_SIZES, counts, args.strength, args.repeats, engine, max(1, downscale)))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+# bench_gui.py
+
+"""
+GUI 핫패스 벤치마크 (헤드리스)
+
+Qt offscreen 플랫폼에서 실행되므로 디스플레이 없이 CI나 원격 리눅스에서 돌릴 수 있습니다.
+PySide6 업그레이드나 코드 변경으로 반응성이 나빠졌는지 확인하는 용도입니다.
+
+측정 항목:
+    cover_create_ms        가리개 하나 생성 + 표시 시간 (닫힌 창 재사용 풀 사용)
+    cover_teardown_ms      가리개 하나 닫기 + 정리 시간 (닫힌 창 재사용 풀 사용)
+    cover_create_unpooled_ms    풀 없이(매번 새 창) 가리개 하나 생성 + 표시 시간
+    cover_teardown_unpooled_ms  풀 없이(창 삭제) 가리개 하나 닫기 + 정리 시간
+    drag_event_us          InteractionHandler에 합성 마우스 이동 이벤트 하나를 보내는 시간
+    overlay_paint_<해상도>_ms  SelectionOverlay 전체 다시 그리기 시간
+    settings_save_ms       설정 파일 동기 저장 시간
+    settings_set_us        쓰기 지연 모드 set() 호출 시간
+
+사용법:
+    python benchmarks/bench_gui.py --output bench.json
+    python benchmarks/bench_gui.py --output bench.json --baseline benchmarks/baseline.json
+    python benchmarks/bench_gui.py --save-baseline benchmarks/baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+
+# Qt가 import되기 전에 설정해야 함
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 사용자 설정 파일을 건드리지 않도록 임시 디렉토리를 설정 경로로 사용
+os.environ["APPDATA"] = tempfile.mkdtemp(prefix="screenblur-bench-")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from PySide6 import __version__ as PYSIDE_VERSION
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QRect, QPoint, QPointF, QEvent
+from PySide6.QtGui import QMouseEvent
+
+# 기준값 대비 이 비율 이상 느려지면 회귀로 판단
+DEFAULT_THRESHOLD = 0.25
+
+
+def summarize(samples):
+    """측정값 목록의 요약 통계를 반환합니다."""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(len(ordered) * 0.95)) - 1)
+    return {
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[max(0, p95_index)],
+        "min": ordered[0],
+        "samples": len(ordered),
+    }
+
+
+def bench_cover_lifecycle(app, count, pool_size=4, suffix=""):
+    """가리개 생성/해제 지연 시간 (ms)
+
+    Args:
+        pool_size (int): 닫힌 가리개 창 재사용 풀 크기 (0이면 매번 새 창을 만들고 삭제).
+        suffix (str): 결과 이름에 붙일 접미사 (예: "_unpooled").
+    """
+    from python.cover_controller import CoverController
+
+    controller = CoverController(pool_size)
+    create, teardown = [], []
+    for i in range(count):
+        rect = QRect(50 + (i % 20) * 10, 50 + (i % 10) * 10, 320, 240)
+
+        started = time.perf_counter()
+        controller.create_cover(rect)
+        app.processEvents()
+        create.append((time.perf_counter() - started) * 1000.0)
+
+        started = time.perf_counter()
+        controller.close_all()
+        app.processEvents()
+        teardown.append((time.perf_counter() - started) * 1000.0)
+
+    pool_stats = controller.cover_pool.stats()
+    controller.shutdown()
+    controller.deleteLater()
+    app.processEvents()
+    return {
+        f"cover_create{suffix}_ms": summarize(create),
+        f"cover_teardown{suffix}_ms": summarize(teardown),
+        f"cover_pool{suffix}": pool_stats,
+    }
+
+
+def _mouse_event(event_type, handler, global_pos, button, buttons):
+    local = QPointF(handler.mapFromGlobal(global_pos))
+    return QMouseEvent(event_type, local, QPointF(global_pos), button, buttons, Qt.NoModifier)
+
+
+def bench_drag(app, moves):
+    """InteractionHandler 합성 드래그 이벤트 처리량 (이벤트당 us)"""
+    from python.viewport import Viewport
+    from python.interaction_handler import InteractionHandler
+
+    class _ControllerStub:
+        quit_enabled = False
+        input_mode = "full"
+
+        def start_viewport_selection(self):
+            pass
+
+        def build_snap_index(self, cover):
+            return None
+
+        def quit_application(self):
+            pass
+
+    viewport = Viewport()
+    handler = InteractionHandler(viewport, _ControllerStub())
+    rect = QRect(100, 100, 400, 300)
+    viewport.setGeometry(rect)
+    handler.setGeometry(rect)
+    viewport.show()
+    handler.show()
+    app.processEvents()
+
+    position = QPoint(rect.center())
+    app.sendEvent(handler, _mouse_event(QEvent.MouseButtonPress, handler, position, Qt.LeftButton, Qt.LeftButton))
+
+    # 한 방향으로만 움직여야 합쳐진 이동의 순변위가 0이 되지 않아 실제로 반영됨
+    samples = []
+    for i in range(moves):
+        position = position + QPoint(1, 1 if i % 2 else 0)
+        event = _mouse_event(QEvent.MouseMove, handler, position, Qt.NoButton, Qt.LeftButton)
+        started = time.perf_counter()
+        app.sendEvent(handler, event)
+        samples.append((time.perf_counter() - started) * 1e6)
+        if i % 16 == 0:
+            app.processEvents()
+
+    app.sendEvent(handler, _mouse_event(QEvent.MouseButtonRelease, handler, position, Qt.LeftButton, Qt.NoButton))
+    app.processEvents()
+
+    result = {"drag_event_us": summarize(samples)}
+    coalescer = getattr(handler, "drag_coalescer", None)
+    if coalescer is not None:
+        result["drag_coalescing"] = coalescer.stats()
+
+    viewport.close()
+    handler.close()
+    app.processEvents()
+    return result
+
+
+def bench_overlay_paint(app, sizes, repeats):
+    """SelectionOverlay 전체 다시 그리기 비용 (ms)"""
+    from python.selection_overlay import SelectionOverlay
+
+    results = {}
+    for width, height in sizes:
+        overlay = SelectionOverlay()
+        overlay.setGeometry(0, 0, width, height)
+        overlay.start_point = QPoint(width // 4, height // 4)
+        overlay.end_point = QPoint(width * 3 // 4, height * 3 // 4)
+
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            overlay.grab()  # paintEvent를 오프스크린 픽스맵에 실행
+            samples.append((time.perf_counter() - started) * 1000.0)
+        results[f"overlay_paint_{width}x{height}_ms"] = summarize(samples)
+        overlay.deleteLater()
+    app.processEvents()
+    return results
+
+
+def bench_settings(repeats):
+    """설정 저장 지연 시간"""
+    from python.settings import SettingsManager
+
+    sync_manager = SettingsManager(write_behind=False)
+    save = []
+    for i in range(repeats):
+        sync_manager.settings["bench_counter"] = i
+        started = time.perf_counter()
+        sync_manager.save_settings()
+        save.append((time.perf_counter() - started) * 1000.0)
+
+    behind_manager = SettingsManager(write_behind=True)
+    set_calls = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        behind_manager.set("bench_counter", i)
+        set_calls.append((time.perf_counter() - started) * 1e6)
+    behind_manager.flush()
+
+    return {"settings_save_ms": summarize(save), "settings_set_us": summarize(set_calls)}
+
+
+def compare(results, baseline, threshold):
+    """기준값과 비교해 median이 threshold 비율 이상 느려진 항목 목록을 반환합니다."""
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if not isinstance(current, dict) or "median" not in current:
+            continue
+        if not reference or not reference.get("median"):
+            continue
+        ratio = current["median"] / reference["median"]
+        status = "회귀" if ratio > 1.0 + threshold else "정상"
+        print(f"  {name:<32} {reference['median']:10.3f} -> {current['median']:10.3f}  x{ratio:5.2f}  {status}")
+        if ratio > 1.0 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScreenBlur 헤드리스 GUI 벤치마크")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--save-baseline", help="결과를 기준값으로 저장할 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="회귀로 판단할 median 증가 비율 (기본 0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="반복 횟수를 줄여 빠르게 실행")
+    args = parser.parse_args()
+
+    scale = 0.2 if args.quick else 1.0
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    benchmarks = {}
+    benchmarks.update(bench_cover_lifecycle(app, max(5, int(50 * scale))))
+    # 풀 재사용 효과를 알 수 있도록 풀 없이 창을 만들고 삭제하는 경우도 측정
+    benchmarks.update(bench_cover_lifecycle(app, max(5, int(50 * scale)), pool_size=0, suffix="_unpooled"))
+    benchmarks.update(bench_drag(app, max(100, int(2000 * scale))))
+    benchmarks.update(bench_overlay_paint(
+        app, [(1920, 1080), (2560, 1440), (3840, 2160)], max(3, int(20 * scale))
+    ))
+    benchmarks.update(bench_settings(max(10, int(100 * scale))))
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pyside6": PYSIDE_VERSION,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": benchmarks,
+    }
+
+    for name, value in benchmarks.items():
+        if isinstance(value, dict) and "median" in value:
+            print(f"{name:<32} median {value['median']:10.3f}  p95 {value['p95']:10.3f}")
+        else:
+            print(f"{name:<32} {value}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n기준값 비교 (임계값 +{args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
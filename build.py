@@ -161,6 +161,29 @@ class BuildManager:
             "--hidden-import", "python.system_tray",
             "--hidden-import", "python.settings",
             "--hidden-import", "python.utils",
+            "--hidden-import", "python.soft_blur",
+            "--hidden-import", "python.tiling",
+            "--hidden-import", "python.refresh_scheduler",
+            "--hidden-import", "python.viewport_registry",
+            "--hidden-import", "python.blur_pipeline",
+            "--hidden-import", "python.compositor",
+            "--hidden-import", "python.drag_coalescer",
+            "--hidden-import", "python.startup_profile",
+            "--hidden-import", "python.ipc",
+            "--hidden-import", "python.layouts",
+            "--hidden-import", "python.instrumentation",
+            "--hidden-import", "python.hud",
+            "--hidden-import", "python.cover_pool",
+            "--hidden-import", "python.template_matcher",
+            "--hidden-import", "python.region_detector",
+            "--hidden-import", "python.blur_workers",
+            "--hidden-import", "python.cover_controller",
+            "--hidden-import", "python.snapping",
+            "--hidden-import", "python.input_mask",
+            "--hidden-import", "python.cover_shape",
+            "--hidden-import", "python.frame_cache",
+            "--hidden-import", "python.screen_capture",
+            "--hidden-import", "PySide6.QtNetwork",
             "--clean",  # 빌드 전 캐시 정리
             "main.py"
         ]
@@ -1,41 +1,152 @@
 # main.py
 
+# 시작 단계 측정은 다른 모든 import보다 먼저 시작해야 함
+from python.startup_profile import StartupProfiler
+
 import sys
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QSharedMemory
+import json
+import argparse
+
+from python.ipc import send_commands, wait_for_server, IpcError
+
+
+def parse_args(argv):
+    """실행 옵션과 원격 명령을 해석합니다 (Qt 전용 인자는 무시)."""
+    parser = argparse.ArgumentParser(prog="ScreenBlur", description="화면 가리개")
+    parser.add_argument("--tray", action="store_true",
+                        help="컨트롤러 창 없이 트레이 아이콘만 띄우고 시작 (로그인 시 자동 실행용)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="시작 단계별 소요 시간을 출력")
+
+    commands = parser.add_argument_group("명령 (실행 중인 인스턴스에 전달)")
+    commands.add_argument("--create", nargs=4, type=int, action="append", metavar=("X", "Y", "W", "H"),
+                          help="지정한 전역 좌표에 가리개 생성 (여러 번 지정 가능)")
+    commands.add_argument("--close-all", action="store_true", help="모든 가리개 닫기")
+    lock = commands.add_mutually_exclusive_group()
+    lock.add_argument("--lock", action="store_true", help="모든 가리개 고정")
+    lock.add_argument("--unlock", action="store_true", help="모든 가리개 고정 해제")
+    commands.add_argument("--load-layout", metavar="NAME", help="저장된 레이아웃 복원 (현재 가리개는 닫힘)")
+    commands.add_argument("--save-layout", metavar="NAME", help="현재 가리개 배치를 레이아웃으로 저장")
+    commands.add_argument("--detect", choices=("on", "off"), help="템플릿 자동 감지 켜기/끄기")
+    commands.add_argument("--diagnostics", action="store_true", help="핸들러 실행 시간과 진단 정보를 JSON으로 출력")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def build_commands(args):
+    """해석된 옵션을 IPC 명령 목록으로 변환합니다 (순서대로 실행됨)."""
+    commands = []
+    if args.close_all:
+        commands.append({"cmd": "close_all"})
+    if args.load_layout:
+        commands.append({"cmd": "load_layout", "name": args.load_layout})
+    for rect in args.create or ():
+        commands.append({"cmd": "create", "rect": rect})
+    if args.lock or args.unlock:
+        commands.append({"cmd": "lock", "locked": args.lock})
+    if args.save_layout:
+        commands.append({"cmd": "save_layout", "name": args.save_layout})
+    if args.detect:
+        commands.append({"cmd": "detect", "enabled": args.detect == "on"})
+    if args.diagnostics:
+        commands.append({"cmd": "diagnostics"})
+    return commands
+
+
+def report_replies(commands, replies):
+    """전달한 명령의 응답을 출력하고 종료 코드를 반환합니다."""
+    exit_code = 0
+    for command, reply in zip(commands, replies):
+        if not reply.get("ok"):
+            print(f"명령 실패 ({command['cmd']}): {reply.get('error')}")
+            exit_code = 1
+        elif "diagnostics" in reply:
+            print(json.dumps(reply["diagnostics"], indent=2, ensure_ascii=False))
+    return exit_code
+
+
+def forward_to_running(send, commands, commands_to_forward):
+    """실행 중인 인스턴스에 명령을 보내고, 전달되었으면 응답을 출력한 뒤 종료합니다.
+
+    실행 중인 인스턴스가 없으면 그대로 반환합니다. 연결한 뒤 응답을 받지 못했으면
+    명령이 이미 처리 중일 수 있으므로 다시 보내지 않고 오류로 종료합니다.
+    """
+    try:
+        replies = send(commands_to_forward)
+    except IpcError as e:
+        print(f"명령 전달 실패: {e}")
+        sys.exit(1)
+    if replies is not None:
+        sys.exit(report_replies(commands, replies))
 
-from python.main_window import MainWindow
 
 if __name__ == "__main__":
     """애플리케이션의 메인 진입점"""
 
-    # QApplication 인스턴스 생성
-    app = QApplication(sys.argv)
+    args = parse_args(sys.argv[1:])
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    commands = build_commands(args)
 
-    # --- 중복 실행 방지 로직 ---
-    # 애플리케이션을 식별하기 위한 고유한 키를 정의합니다.
-    unique_key = "blur_viewport_unique_key_af892374"
+    # --- 실행 중인 인스턴스에 명령 전달 ---
+    # 이미 실행 중인 인스턴스가 있으면 명령(없으면 컨트롤러 표시)을 보내고 바로 종료합니다.
+    # 이 단계는 PySide6를 import하지 않으므로 수 밀리초 안에 끝납니다.
+    if not commands and not args.tray:
+        commands_to_forward = [{"cmd": "show"}]
+    else:
+        commands_to_forward = commands
+    forward_to_running(send_commands, commands, commands_to_forward)
+    profiler.mark("ipc probe")
 
-    # 이 키로 공유 메모리(Shared Memory) 세그먼트를 확인합니다.
-    shared_memory = QSharedMemory(unique_key)
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
 
-    # attach()를 시도하여 이미 생성된 공유 메모리가 있는지 확인합니다.
-    # attach()에 성공하면, 다른 인스턴스가 이미 실행 중이라는 의미입니다.
-    if shared_memory.attach():
-        print("프로그램이 이미 실행 중입니다. 새로운 인스턴스를 종료합니다.")
-        sys.exit(0) # 정상 종료
+    from python.main_window import MainWindow
+    from python.ipc import IpcServer
 
-    # attach()에 실패했다면, 현재 인스턴스가 첫 번째 인스턴스입니다.
-    # create()를 호출하여 공유 메모리 세그먼트를 생성합니다.
-    # 이 메모리는 프로그램이 종료될 때까지 유지됩니다.
-    if not shared_memory.create(1): # 1바이트 크기의 세그먼트 생성
-        print(f"공유 메모리 생성에 실패했습니다: {shared_memory.errorString()}")
+    profiler.mark("imports")
+
+    # QApplication 인스턴스 생성
+    app = QApplication(sys.argv)
+    profiler.mark("QApplication")
+
+    # --- 중복 실행 방지 + 제어 채널 ---
+    # 첫 번째 인스턴스가 로컬 소켓 서버를 열어 이후 실행되는 인스턴스의 명령을 받습니다.
+    # 인스턴스 잠금을 잡은 경우에만 서버를 열며, 비정상 종료로 남은 소켓은 그때 제거됩니다.
+    # 다른 인스턴스가 한발 먼저 시작해 잠금을 잡았다면 서버가 열릴 때까지 기다렸다가 명령을 넘깁니다.
+    # 명령은 이벤트 루프에서만 처리되므로 그 시점에는 main_win이 이미 존재합니다.
+    ipc_server = IpcServer(lambda command: main_win.handle_command(command))
+    if not ipc_server.listen():
+        if ipc_server.already_running:
+            forward_to_running(wait_for_server, commands, commands_to_forward)
+            print("실행 중인 인스턴스가 응답하지 않습니다")
         sys.exit(-1) # 비정상 종료
+    profiler.mark("ipc server")
 
     # --- 메인 윈도우 생성 및 실행 ---
-    # 애플리케이션의 메인 창(컨트롤러)을 생성하고 화면에 표시합니다.
-    main_win = MainWindow()
-    main_win.show()
+    # 트레이 우선 모드에서는 트레이 아이콘과 설정만 만들고 컨트롤러 레이아웃은 미룹니다.
+    main_win = MainWindow(lazy_ui=args.tray)
+    profiler.mark("tray")
+    time_to_tray = profiler.elapsed_ms()
+
+    if not args.tray:
+        # 애플리케이션의 메인 창(컨트롤러)을 생성하고 화면에 표시합니다.
+        main_win.show()
+        profiler.mark("first window")
+
+    # 첫 실행에 함께 지정된 명령은 이 인스턴스에서 직접 처리
+    for command in commands:
+        reply = main_win.handle_command(command)
+        if not reply.get("ok"):
+            print(f"명령 실패 ({command['cmd']}): {reply.get('error')}")
+
+    def report_startup():
+        """이벤트 루프가 처음 돌기 시작한 시점에 측정 결과를 출력합니다."""
+        profiler.mark("event loop")
+        profiler.report()
+        if profiler.enabled:
+            print(f"  time-to-tray     {time_to_tray:8.1f} ms")
+
+    QTimer.singleShot(0, report_startup)
 
     # 애플리케이션 이벤트 루프를 시작합니다.
     # 이 함수는 프로그램이 종료될 때까지 블로킹됩니다.
@@ -2,6 +2,21 @@
 
 """
 ScreenBlur Python 모듈 패키지
+
+다른 PySide6 프로그램에 내장할 때는 CoverController를 사용합니다.
+
+    from python import CoverController
+
+main.py의 IPC 경로는 PySide6 없이 실행되어야 하므로 공개 API는 처음 접근할 때 import 합니다.
 """
 
 __version__ = "1.0.0"
+
+__all__ = ["CoverController", "CoverInfo"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import cover_controller
+        return getattr(cover_controller, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
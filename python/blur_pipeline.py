@@ -0,0 +1,299 @@
+# blur_pipeline.py
+
+"""
+소프트웨어 블러 파이프라인
+
+화면 캡처 → 바뀐 타일 판별 → 블러 → 표시용 QImage 생성 과정을 묶은 클래스입니다.
+개별 창 가리개(Viewport)와 단일 오버레이 모드의 가리개(CompositorCover)가
+같은 파이프라인을 공유합니다.
+
+submit()은 캡처와 타일 비교만 GUI 스레드에서 하고 블러 계산은 작업 스레드 풀에 맡깁니다.
+가리개가 이동하거나 닫히면 세대(generation)가 바뀌어 진행 중이던 결과는 버려집니다.
+
+블러는 결과가 원래 흐릿하므로 캡처를 1/n 해상도로 줄여서 계산하고, 그릴 때 다시 늘립니다.
+계산량과 버퍼 메모리는 n²에 비례해 줄어듭니다. 강도와 블록 크기는 논리 픽셀 단위이며,
+캡처의 devicePixelRatio를 곱해 실제 픽셀 단위로 바꾼 뒤 축소 배율을 고릅니다.
+
+내용이 바뀐 캡처는 먼저 블러 결과 캐시(frame_cache)에서 찾아보고, 같은 크기/설정/내용의
+결과가 있으면 블러를 계산하지 않고 그대로 사용합니다. 캐시에는 전체를 다시 계산한 결과만 넣습니다.
+"""
+
+from functools import partial
+
+import numpy as np
+from PySide6.QtCore import Qt
+
+from .soft_blur import (default_engine, default_pixelate_engine, qimage_to_array,
+                        array_to_qimage, DEFAULT_BLOCK_SIZE)
+from .tiling import TileTracker
+from .cover_shape import shape_mask
+from .frame_cache import default_frame_cache
+from .blur_workers import BlurJob, split_bands, render_band
+
+# 기본 블러 강도 (가우시안 시그마, 픽셀)
+DEFAULT_STRENGTH = 12
+
+# 표시 방식: 가우시안 블러 / 모자이크
+MODE_BLUR = "blur"
+MODE_PIXELATE = "pixelate"
+RENDER_MODES = (MODE_BLUR, MODE_PIXELATE)
+
+# 축소 배율: 0이면 강도와 devicePixelRatio로 자동 선택, 1이면 원본 해상도
+AUTO_DOWNSCALE = 0
+MAX_DOWNSCALE = 8
+
+# 자동 선택 시 축소된 해상도에서도 유지할 최소 시그마 (픽셀)
+# 이보다 작아지면 다시 늘렸을 때 계단 현상이 보이기 시작함
+MIN_SCALED_SIGMA = 2.0
+
+
+def choose_downscale(mode, strength, block_size, ratio):
+    """자동 축소 배율 n을 고릅니다 (1이면 원본 해상도).
+
+    블러는 축소 후 시그마가 MIN_SCALED_SIGMA 이상 남는 가장 큰 n을,
+    모자이크는 실제 픽셀 블록 크기를 나누어떨어지게 하는 가장 큰 n을 고릅니다.
+    모자이크는 n x n 평균 후 블록 평균을 내도 원본에서 블록 평균을 낸 것과 같습니다.
+    """
+    if mode == MODE_PIXELATE:
+        block = max(1, round(block_size * ratio))
+        return max(n for n in range(1, MAX_DOWNSCALE + 1) if block % n == 0)
+    return max(1, min(MAX_DOWNSCALE, int(strength * ratio / MIN_SCALED_SIGMA)))
+
+
+class BlurPipeline:
+    """캡처된 화면에서 바뀐 부분만 다시 블러해 표시용 이미지를 만드는 파이프라인"""
+
+    def __init__(self, engine=None, strength=DEFAULT_STRENGTH, cache=None):
+        """
+        Args:
+            engine (BlurEngine, optional): 사용할 블러 엔진. 생략하면 공유 기본 엔진.
+            strength (int): 블러 강도 (가우시안 시그마, 논리 픽셀).
+            cache (FrameCache, optional): 블러 결과 캐시. 생략하면 공유 기본 캐시.
+        """
+        self.engine = engine or default_engine
+        self.cache = cache if cache is not None else default_frame_cache()
+        self.pixelate_engine = default_pixelate_engine
+        self.strength = strength
+        self.mode = MODE_BLUR                  # 표시 방식 (RENDER_MODES)
+        self.block_size = DEFAULT_BLOCK_SIZE   # 모자이크 블록 크기 (논리 픽셀)
+        self.downscale = AUTO_DOWNSCALE        # 1/n 해상도로 계산 (AUTO_DOWNSCALE이면 자동)
+        self.shape = None                      # 가리개 모양 (cover_shape.CoverShape, 사각형이면 None)
+        self.tile_tracker = TileTracker()
+        self._visible = None                   # 모양과 겹치는 타일 마스크
+        self._visible_key = None               # _visible을 만든 (모양, 높이, 너비)
+
+        self.frame = None            # 마지막 블러 결과 (QImage)
+        self._pixels = None          # 블러 결과 배열 (바뀐 타일만 덮어씀, 캐시에 넣으면 읽기 전용)
+        self._pixels_params = None   # _pixels를 만든 (방식, 강도/블록 크기, 축소 배율, 모양)
+
+        # --- 비동기 처리 상태 ---
+        self.generation = 0     # invalidate/release마다 증가
+        self._in_flight = None  # 작업 스레드에서 계산 중인 BlurJob (오래된 작업 포함)
+        self.on_frame = None    # 비동기 결과로 frame이 바뀌면 GUI 스레드에서 호출
+        self.on_job_cost = None  # 작업이 끝날 때마다(버려진 작업 포함) 작업 스레드 CPU 시간(초)으로 호출
+        self.busy_skips = 0     # 이전 작업이 끝나지 않아 건너뛴 갱신 수
+
+    def invalidate(self):
+        """다음 처리에서 전체 영역을 다시 계산하도록 하고, 진행 중인 작업의 결과는 버립니다."""
+        self.tile_tracker.reset()
+        self.generation += 1
+
+    def downscale_for(self, ratio):
+        """devicePixelRatio가 ratio인 캡처에 사용할 축소 배율 n을 반환합니다."""
+        if self.downscale:
+            return self.downscale
+        return choose_downscale(self.mode, self.strength, self.block_size, ratio)
+
+    @property
+    def smooth_scaling(self):
+        """결과를 늘려 그릴 때 보간할지 여부 (모자이크는 블록 경계가 뭉개지지 않도록 보간하지 않음)"""
+        return self.mode == MODE_BLUR
+
+    def _prepare(self, source):
+        """캡처를 축소 배율만큼 줄여 계산에 필요한 값들을 반환합니다.
+
+        Returns:
+            tuple: (픽셀 배열, 엔진, 축소 해상도 기준 강도/블록 크기, 결과 식별 키, 결과의 devicePixelRatio)
+        """
+        ratio = source.devicePixelRatio()
+        n = self.downscale_for(ratio)
+        if n > 1:
+            # SmoothTransformation의 축소는 영역 평균이라 블러 전에 앨리어싱이 생기지 않음
+            source = source.scaled(max(1, -(-source.width() // n)),
+                                   max(1, -(-source.height() // n)),
+                                   Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        pixels = qimage_to_array(source)
+
+        if self.mode == MODE_PIXELATE:
+            engine = self.pixelate_engine
+            param = max(1, round(self.block_size * ratio / n))
+        else:
+            engine = self.engine
+            # 강도를 0.25 단위로 맞춰 블러 커널 캐시가 늘어나지 않도록 함
+            param = round(self.strength * ratio / n * 4) / 4
+        # 결과는 축소된 크기이므로 devicePixelRatio도 1/n로 줄여 원래 논리 크기로 그려지게 함
+        return pixels, engine, param, (self.mode, param, n, self.shape), ratio / n
+
+    def _visible_tiles(self, pixels):
+        """모양과 겹치는 타일 마스크를 반환합니다 (사각형이면 None). 모양과 크기마다 한 번만 계산합니다."""
+        if self.shape is None:
+            return None
+        height, width = pixels.shape[:2]
+        key = (self.shape, height, width)
+        if key != self._visible_key:
+            image = shape_mask(self.shape, width, height)
+            # 명도 이미지의 각 행은 4바이트 단위로 채워져 있으므로 너비만큼 잘라 씀
+            mask = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.sizeInBytes())
+            mask = mask.reshape(height, image.bytesPerLine())[:, :width]
+            self._visible = self.tile_tracker.tile_coverage(mask)
+            self._visible_key = key
+        return self._visible
+
+    def _dirty_regions(self, pixels, engine, param, params):
+        """바뀐 영역 목록과 전체 재계산 여부를 반환합니다.
+
+        모양이 있는 가리개는 모양과 전혀 겹치지 않는 타일을 블러하지 않습니다.
+        """
+        if (self._pixels is None
+                or self._pixels.shape != pixels.shape
+                or self._pixels_params != params):
+            # 크기, 방식, 강도가 바뀌면 타일 비교가 의미 없으므로 전체를 다시 계산
+            self.tile_tracker.reset()
+
+        regions = self.tile_tracker.update(pixels, halo=engine.radius(param),
+                                           visible=self._visible_tiles(pixels))
+        full = self.tile_tracker.clean_tiles == 0
+        return regions, full
+
+    def _use_cached(self, key, params, ratio):
+        """캐시에 같은 결과가 있으면 블러 없이 frame으로 사용합니다.
+
+        Returns:
+            bool: 캐시 결과를 사용했으면 True.
+        """
+        cached = self.cache.get(key)
+        if cached is None:
+            return False
+        self._set_pixels(cached, params, ratio)
+        return True
+
+    def _set_pixels(self, pixels, params, ratio):
+        self._pixels = pixels
+        self._pixels_params = params
+        self.frame = array_to_qimage(pixels)
+        self.frame.setDevicePixelRatio(ratio)
+
+    def process(self, source):
+        """캡처 이미지를 받아 블러 결과(frame)를 갱신합니다.
+
+        이전 프레임과 비교해 바뀐 타일(과 블러 반경만큼의 주변)만 다시 블러합니다.
+
+        Args:
+            source (QImage): 가리개 뒤 화면의 캡처 이미지.
+
+        Returns:
+            bool: 내용이 바뀌어 frame이 갱신되었으면 True.
+        """
+        pixels, engine, param, params, ratio = self._prepare(source)
+
+        regions, full = self._dirty_regions(pixels, engine, param, params)
+        if not regions:
+            return False
+
+        key = self.cache.make_key(pixels, params, self.tile_tracker.signature)
+        if self._use_cached(key, params, ratio):
+            return True
+
+        if full and self.shape is None:
+            out = engine.blur_pixels(pixels, param)
+        else:
+            if full:
+                # 모양 밖 타일은 그려지지 않으므로 비워 둠
+                out = np.zeros_like(pixels)
+            else:
+                # 캐시에 들어간 이전 결과는 읽기 전용이므로 복사해서 덮어씀
+                out = self._pixels if self._pixels.flags.writeable else self._pixels.copy()
+            for region in regions:
+                engine.blur_region(pixels, out, region, param)
+
+        self._set_pixels(out, params, ratio)
+        if full:
+            self.cache.put(key, out)
+        return True
+
+    def submit(self, source, pool):
+        """캡처 이미지의 블러 계산을 작업 스레드 풀에 맡깁니다.
+
+        결과는 pool이 GUI 스레드에서 finish_job()으로 돌려주며, 그때 frame이 바뀌고
+        on_frame이 호출됩니다. 한 번에 하나의 작업만 진행하므로, 드래그 중처럼 결과가
+        계속 버려지는 동안에도 작업이 풀에 쌓이지 않습니다.
+
+        Args:
+            source (QImage): 가리개 뒤 화면의 캡처 이미지.
+            pool (BlurWorkerPool): 블러 작업을 실행할 스레드 풀.
+
+        Returns:
+            bool: 화면 내용이 바뀌어 작업을 제출했으면 True (이전 작업이 진행 중이어도 True).
+        """
+        if self._in_flight is not None:
+            self.busy_skips += 1
+            return True
+
+        pixels, engine, param, params, ratio = self._prepare(source)
+
+        regions, full = self._dirty_regions(pixels, engine, param, params)
+        if not regions:
+            return False
+
+        key = self.cache.make_key(pixels, params, self.tile_tracker.signature)
+        if self._use_cached(key, params, ratio):
+            if self.on_frame is not None:
+                self.on_frame()
+            return True
+
+        height = pixels.shape[0]
+        base = None if full else self._pixels
+        # 모양이 있으면 블러하지 않는 타일이 남으므로 비운 배열에서 시작
+        out = np.empty_like(pixels) if self.shape is None else np.zeros_like(pixels)
+        # 바뀐 타일만 계산한 결과는 캐시에 넣지 않음
+        job = BlurJob(self, self.generation, out, params, ratio, key if full else None)
+        tasks = [
+            partial(render_band, engine, pixels, base, job.out, band, regions, param)
+            for band in split_bands(height, pool.workers)
+        ]
+        self._in_flight = job
+        pool.submit(job, tasks)
+        return True
+
+    def finish_job(self, job):
+        """GUI 스레드: 완료된 작업의 결과를 반영합니다.
+
+        Returns:
+            bool: 결과를 반영했으면 True, 오래된 작업이라 버렸으면 False.
+        """
+        if job is self._in_flight:
+            self._in_flight = None
+        if self.on_job_cost is not None:
+            # 결과를 버리더라도 계산에 쓴 CPU 시간은 갱신 예산에 반영해야 함
+            self.on_job_cost(job.cost)
+        if job.generation != self.generation:
+            return False
+
+        if job.error is not None:
+            print(f"경고: 소프트웨어 블러 실패 - {job.error}")
+            self.tile_tracker.reset()
+            return False
+
+        self._set_pixels(job.out, job.params, job.ratio)
+        if job.cache_key is not None:
+            self.cache.put(job.cache_key, job.out)
+        if self.on_frame is not None:
+            self.on_frame()
+        return True
+
+    def release(self):
+        """보관 중인 버퍼를 해제하고 진행 중인 작업의 결과는 버립니다."""
+        self.frame = None
+        self._pixels = None
+        self._pixels_params = None
+        self.invalidate()
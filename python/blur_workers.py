@@ -0,0 +1,168 @@
+# blur_workers.py
+
+"""
+소프트웨어 블러 작업 스레드 풀
+
+큰 가리개나 여러 가리개의 블러를 GUI 스레드에서 계산하면 그동안 마우스 입력 처리가 멈춥니다.
+블러할 영역을 가로 띠(row band)로 나눠 스레드 풀에서 동시에 계산합니다.
+NumPy의 누적합/산술 연산은 GIL을 놓고 실행되므로 띠 수만큼 코어를 활용할 수 있습니다.
+
+띠 작업은 각자 결과 배열의 서로 다른 행에만 기록하므로 잠금이 필요 없으며,
+마지막 띠가 끝나면 큐 연결(QueuedConnection) 시그널로 GUI 스레드에 결과를 넘깁니다.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, Signal
+
+# 띠 하나의 최소 높이 (너무 얇으면 블러 반경만큼의 여분 계산이 띠 크기보다 커짐)
+MIN_BAND_HEIGHT = 32
+
+
+def default_worker_count():
+    """기본 작업 스레드 수 (코어 수, 최대 4)"""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def split_bands(height, count, min_height=MIN_BAND_HEIGHT):
+    """[0, height) 행을 최대 count개의 띠 (y0, y1)로 나눕니다."""
+    if height <= 0:
+        return []
+    count = max(1, min(count, height // min_height))
+    step = -(-height // count)
+    return [(y, min(height, y + step)) for y in range(0, height, step)]
+
+
+def clip_regions(regions, y0, y1):
+    """사각형 (y0, y1, x0, x1) 목록을 [y0, y1) 행 범위로 자릅니다."""
+    return [(max(r0, y0), min(r1, y1), x0, x1)
+            for r0, r1, x0, x1 in regions if r0 < y1 and r1 > y0]
+
+
+def render_band(engine, pixels, base, out, band, regions, strength):
+    """띠 하나의 결과를 out에 기록합니다 (작업 스레드에서 실행).
+
+    Args:
+        engine (BlurEngine): 블러 엔진.
+        pixels (np.ndarray): 캡처 원본 (읽기 전용으로 공유).
+        base (np.ndarray): 이전 블러 결과. None이면 regions가 띠 전체를 덮어야 합니다.
+        out (np.ndarray): 결과 배열 (띠의 행에만 기록).
+        band (tuple): (y0, y1) 행 범위.
+        regions (list): 다시 블러할 사각형 (y0, y1, x0, x1) 목록.
+        strength (int): 블러 강도 (모자이크 엔진이면 블록 크기).
+    """
+    y0, y1 = band
+    if base is not None:
+        out[y0:y1] = base[y0:y1]
+    for region in clip_regions(regions, y0, y1):
+        engine.blur_region(pixels, out, region, strength)
+
+
+class BlurJob:
+    """가리개 하나의 블러 작업 (띠 작업 여러 개로 나뉨)"""
+
+    __slots__ = ("pipeline", "generation", "out", "params", "ratio", "cache_key",
+                 "error", "cost", "_remaining", "_lock")
+
+    def __init__(self, pipeline, generation, out, params, ratio, cache_key=None):
+        self.pipeline = pipeline
+        self.generation = generation  # 제출 시점의 파이프라인 세대 (다르면 버림)
+        self.out = out
+        self.params = params          # 결과를 만든 (방식, 강도/블록 크기)
+        self.ratio = ratio
+        self.cache_key = cache_key    # 결과를 보관할 블러 결과 캐시 키 (None이면 보관하지 않음)
+        self.error = None
+        self.cost = 0.0               # 띠 작업들이 작업 스레드에서 쓴 CPU 시간의 합 (초)
+        self._remaining = 0
+        self._lock = threading.Lock()
+
+
+class BlurWorkerPool(QObject):
+    """블러 띠 작업을 실행하고 완료된 작업을 GUI 스레드로 돌려주는 스레드 풀"""
+
+    # 작업 스레드에서 발생하므로 GUI 스레드의 _deliver로 큐 연결됨
+    _job_finished = Signal(object)
+
+    def __init__(self, workers=0):
+        """
+        Args:
+            workers (int): 작업 스레드 수. 0이면 default_worker_count().
+        """
+        super().__init__()
+        self.workers = workers or default_worker_count()
+        self._executor = None
+        self._job_finished.connect(self._deliver)
+
+        # --- 통계 ---
+        self.jobs_submitted = 0
+        self.jobs_completed = 0
+        self.jobs_discarded = 0  # 가리개가 이동/닫힘 등으로 결과가 버려진 작업
+
+    def set_workers(self, workers):
+        """작업 스레드 수를 바꿉니다. 진행 중인 작업은 이전 풀에서 끝까지 실행됩니다."""
+        workers = workers or default_worker_count()
+        if workers == self.workers:
+            return
+        self.workers = workers
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def submit(self, job, tasks):
+        """띠 작업 목록을 실행합니다. 모두 끝나면 job.pipeline.finish_job(job)이 GUI 스레드에서 호출됩니다."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="blur")
+        job._remaining = len(tasks)
+        self.jobs_submitted += 1
+        for task in tasks:
+            self._executor.submit(self._run, job, task)
+
+    def _run(self, job, task):
+        """작업 스레드: 띠 하나를 계산하고, 마지막 띠이면 완료를 알립니다."""
+        started = time.thread_time()
+        try:
+            task()
+        except Exception as e:
+            job.error = e
+        elapsed = time.thread_time() - started
+        with job._lock:
+            job.cost += elapsed
+            job._remaining -= 1
+            last = job._remaining == 0
+        if last:
+            self._job_finished.emit(job)
+
+    def _deliver(self, job):
+        """GUI 스레드: 완료된 작업을 파이프라인에 넘깁니다."""
+        if job.pipeline.finish_job(job):
+            self.jobs_completed += 1
+        else:
+            self.jobs_discarded += 1
+
+    def shutdown(self):
+        """작업 스레드를 정리합니다 (진행 중인 작업은 기다림)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "jobs_submitted": self.jobs_submitted,
+            "jobs_completed": self.jobs_completed,
+            "jobs_discarded": self.jobs_discarded,
+            "in_flight": self.jobs_submitted - self.jobs_completed - self.jobs_discarded,
+        }
+
+
+_default_pool = None
+
+
+def default_blur_pool():
+    """애플리케이션 전체가 공유하는 블러 스레드 풀을 반환합니다."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BlurWorkerPool()
+    return _default_pool
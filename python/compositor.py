@@ -0,0 +1,401 @@
+# compositor.py
+
+"""
+단일 오버레이(컴포지터) 모드
+
+개별 창 모드에서는 가리개 하나마다 Viewport와 InteractionHandler, 두 개의 최상위 창이 필요합니다.
+가리개가 많을 때는 창 관리자 부담과 메모리가 그만큼 늘어나므로, 이 모드에서는 화면마다
+하나의 프레임 없는 항상 위 창(CompositorOverlay)이 모든 가리개를 직접 그리고 입력을 처리합니다.
+
+- 그리기: 바뀐 가리개의 영역만 update(rect)로 다시 그림 (dirty rect)
+- 입력: 창 마스크를 가리개 영역의 합집합으로 설정해 나머지는 클릭이 통과하며,
+        눌린 위치의 맨 위 가리개로 이벤트를 전달
+- 블러: 창 하나에 가리개별 아크릴 효과를 줄 수 없으므로 항상 소프트웨어 블러 사용
+        (오버레이는 숨기지 않고 가리개 아래만 캡처, screen_capture 참고)
+"""
+
+import time
+from functools import partial
+from itertools import count
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QObject, QRect, Signal
+from PySide6.QtGui import QPainter, QRegion, QColor, QGuiApplication
+
+from .cover_shape import shape_path
+from .blur_pipeline import BlurPipeline, RENDER_MODES, MAX_DOWNSCALE
+from .screen_capture import BelowCapture
+from .refresh_scheduler import default_scheduler
+from .blur_workers import default_blur_pool
+from .viewport_registry import SpatialGrid
+from .interaction_handler import build_cover_menu
+from .instrumentation import timed
+
+# 블러 결과가 아직 없을 때 가리개 자리에 칠하는 색
+_PLACEHOLDER_COLOR = QColor(128, 128, 128, 230)
+
+
+class CompositorCover(QObject):
+    """오버레이 창 안에 그려지는 가리개 하나
+
+    Viewport와 같은 인터페이스(closing/geometry_changed 시그널, set_lock, close 등)를
+    제공하므로 레지스트리와 컨트롤러는 두 모드를 구분하지 않고 다룰 수 있습니다.
+    """
+
+    closing = Signal()
+    geometry_changed = Signal(QRect)
+
+    _stack_order = count()
+
+    def __init__(self, rect, manager, scheduler=None, blur_pool=None):
+        super().__init__()
+        self._rect = QRect(rect)
+        self.manager = manager
+        self.overlay = None
+        self.is_locked = False
+        self.order = next(self._stack_order)  # 클수록 위에 그려짐
+
+        self.blur_pipeline = BlurPipeline()
+        self.blur_pipeline.on_frame = self._frame_ready
+        self.blur_pool = blur_pool or default_blur_pool()
+        self.scheduler = scheduler or default_scheduler()
+        self.refresh_class = "interactive"
+        # 작업 스레드가 쓴 블러 계산 시간도 스케줄러의 CPU 예산에 포함
+        self.blur_pipeline.on_job_cost = partial(self.scheduler.report_cost, self)
+        self._closed = False
+        # 오버레이 창에 붙을 때 그 창을 기준으로 가리개 아래를 캡처
+        self.below = BelowCapture(None)
+
+    # --- Viewport 호환 인터페이스 ---
+    def geometry(self):
+        return QRect(self._rect)
+
+    def pos(self):
+        return self._rect.topLeft()
+
+    def setGeometry(self, rect):
+        self._set_rect(QRect(rect))
+
+    def move(self, point):
+        self._set_rect(QRect(point, self._rect.size()))
+
+    def _set_rect(self, rect):
+        if rect == self._rect:
+            return
+        if self.isVisible():
+            # 오버레이는 나중에 다시 그려지므로 지금 화면에는 아직 옛 위치에 그려져 있음
+            self.below.before_move(rect)
+        old = self._rect
+        self._rect = rect
+        self._geometry_updated(old)
+
+    def set_lock(self, checked):
+        self.is_locked = checked
+
+    def set_blur_strength(self, strength):
+        self.blur_pipeline.strength = max(0, int(strength))
+        self.scheduler.wake(self)
+
+    @property
+    def blur_strength(self):
+        return self.blur_pipeline.strength
+
+    def set_render_mode(self, mode):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"알 수 없는 표시 방식: {mode}")
+        self.blur_pipeline.mode = mode
+        self.scheduler.wake(self)
+
+    @property
+    def render_mode(self):
+        return self.blur_pipeline.mode
+
+    def set_block_size(self, block_size):
+        self.blur_pipeline.block_size = max(2, int(block_size))
+        self.scheduler.wake(self)
+
+    @property
+    def block_size(self):
+        return self.blur_pipeline.block_size
+
+    def set_downscale(self, downscale):
+        self.blur_pipeline.downscale = max(0, min(MAX_DOWNSCALE, int(downscale)))
+        self.scheduler.wake(self)
+
+    @property
+    def downscale(self):
+        return self.blur_pipeline.downscale
+
+    def set_shape(self, shape):
+        if shape == self.blur_pipeline.shape:
+            return
+        self.blur_pipeline.shape = shape
+        if self.overlay is not None:
+            self.overlay.update_cover_area(self._rect)
+        self.scheduler.wake(self)
+
+    @property
+    def shape(self):
+        return self.blur_pipeline.shape
+
+    def set_refresh_class(self, fps_class):
+        self.refresh_class = fps_class
+        self.scheduler.set_fps_class(self, fps_class)
+
+    @property
+    def uses_software_blur(self):
+        return True
+
+    def isVisible(self):
+        return self.overlay is not None and not self._closed
+
+    def show(self):
+        """가리개를 화면에 맞는 오버레이에 붙이고 갱신을 시작합니다."""
+        if self.overlay is None:
+            self.manager.attach(self)
+            # 오버레이는 이벤트 루프로 돌아간 뒤에 다시 그려지므로 아직 가리개가 없는 화면을 얻음
+            self.below.before_show(self._rect)
+        self.scheduler.register(self, self.refresh_class)
+
+    def close(self):
+        """가리개를 닫습니다. closing 시그널 후 오버레이에서 제거됩니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self.closing.emit()
+        self.scheduler.unregister(self)
+        if self.overlay is not None:
+            self.overlay.remove_cover(self)
+        self.blur_pipeline.release()
+
+    # --- 블러 ---
+    def refresh_blur(self):
+        """뒤 화면을 다시 캡처해 블러 작업을 제출합니다. 결과는 _frame_ready에서 그려집니다."""
+        if not self.isVisible():
+            return False
+        source = self.below.capture(self._rect)
+        if source is None:
+            return False
+        return self.blur_pipeline.submit(source, self.blur_pool)
+
+    def _frame_ready(self):
+        """작업 스레드의 블러 결과가 반영되면 해당 영역만 다시 그립니다."""
+        if self.isVisible():
+            self.overlay.update_cover_area(self._rect)
+
+    def _geometry_updated(self, old):
+        self.blur_pipeline.invalidate()
+        if self.overlay is not None:
+            self.overlay.cover_moved(self, old)
+        self.scheduler.wake(self)
+        self.geometry_changed.emit(QRect(self._rect))
+
+
+class CompositorOverlay(QWidget):
+    """한 화면의 모든 가리개를 그리고 입력을 전달하는 단일 오버레이 창"""
+
+    def __init__(self, screen, controller):
+        super().__init__()
+        self.controller = controller
+        self._screen = screen
+        self._covers = {}              # cover.order -> CompositorCover
+        self.index = SpatialGrid(128)  # 전역 좌표 기준 가리개 공간 인덱스
+        self._drag = None              # (가리개, 마지막 전역 마우스 위치, 맞춤 전 위치, 맞춤 인덱스)
+        self._mask = QRegion()         # 가리개 영역의 합집합 (창 좌표, 가리개가 바뀔 때마다 부분 갱신)
+
+        # --- 통계 ---
+        self.repaints = 0
+        self.repaint_pixels = 0
+        self.paint_seconds = 0.0
+
+        self.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.WindowStaysOnTopHint |
+            Qt.Tool
+        )
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setGeometry(screen.geometry())
+
+    # --- 가리개 관리 ---
+    @property
+    def covers(self):
+        return list(self._covers.values())
+
+    def add_cover(self, cover):
+        cover.overlay = self
+        cover.below.window = self
+        self._covers[cover.order] = cover
+        self.index.insert(cover.order, cover.geometry())
+        self._add_to_mask(cover.geometry())
+        if not self.isVisible():
+            self.show()
+        self.update_cover_area(cover.geometry())
+
+    def remove_cover(self, cover):
+        if self._covers.pop(cover.order, None) is None:
+            return
+        self.index.remove(cover.order)
+        cover.overlay = None
+        self.update_cover_area(cover.geometry())
+        self._remove_from_mask(cover.geometry())
+        if not self._covers:
+            # 빈 마스크는 "마스크 없음"(창 전체가 입력을 받음)을 뜻하므로 창을 숨김
+            self.hide()
+
+    def cover_moved(self, cover, old_rect):
+        self.index.insert(cover.order, cover.geometry())
+        self._remove_from_mask(old_rect, apply=False)
+        self._add_to_mask(cover.geometry())
+        self.update_cover_area(old_rect)
+        self.update_cover_area(cover.geometry())
+
+    # --- 창 마스크 ---
+    # 창 마스크를 가리개 영역들의 합집합으로 설정해 나머지 영역은 클릭이 통과하게 합니다.
+    # 가리개 하나가 바뀔 때 전체를 다시 합치지 않고 바뀐 사각형 주변만 갱신합니다.
+    def _add_to_mask(self, global_rect, apply=True):
+        self._mask = self._mask.united(global_rect.translated(-self.geometry().topLeft()))
+        if apply:
+            self._apply_mask()
+
+    def _remove_from_mask(self, global_rect, apply=True):
+        """사각형을 빼고, 그 사각형과 겹치는 다른 가리개들만 다시 더합니다."""
+        offset = self.geometry().topLeft()
+        self._mask = self._mask.subtracted(QRegion(global_rect.translated(-offset)))
+        for order in self.index.query_rect(global_rect):
+            overlap = self._covers[order].geometry().intersected(global_rect)
+            self._mask = self._mask.united(overlap.translated(-offset))
+        if apply:
+            self._apply_mask()
+
+    def _apply_mask(self):
+        # 빈 마스크는 "마스크 없음"(창 전체가 입력을 받음)을 뜻하므로 설정하지 않음
+        if not self._mask.isEmpty():
+            self.setMask(self._mask)
+
+    def update_cover_area(self, global_rect):
+        """전역 좌표 영역만 다시 그리도록 예약합니다."""
+        self.update(global_rect.translated(-self.geometry().topLeft()))
+
+    def cover_at(self, global_point):
+        """전역 좌표의 맨 위 가리개를 반환합니다 (없으면 None)."""
+        orders = self.index.query_point(global_point)
+        return self._covers[max(orders)] if orders else None
+
+    # --- 이벤트 핸들러 ---
+    @timed("compositor.paint")
+    def paintEvent(self, event):
+        """다시 그릴 영역과 겹치는 가리개들만 아래에서 위 순서로 그립니다."""
+        started = time.perf_counter()
+        painter = QPainter(self)
+        offset = self.geometry().topLeft()
+        dirty = event.rect()
+
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(dirty, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+        for order in sorted(self.index.query_rect(dirty.translated(offset))):
+            cover = self._covers[order]
+            target = cover.geometry().translated(-offset)
+            frame = cover.blur_pipeline.frame
+            if cover.shape is not None:
+                painter.save()
+                painter.setClipPath(shape_path(cover.shape, target.width(), target.height())
+                                    .translated(target.x(), target.y()))
+            if frame is None:
+                painter.fillRect(target, _PLACEHOLDER_COLOR)
+            else:
+                painter.setRenderHint(QPainter.SmoothPixmapTransform,
+                                      cover.blur_pipeline.smooth_scaling)
+                painter.drawImage(target, frame)
+            if cover.shape is not None:
+                painter.restore()
+        painter.end()
+
+        self.repaints += 1
+        self.repaint_pixels += dirty.width() * dirty.height()
+        self.paint_seconds += time.perf_counter() - started
+
+    def mousePressEvent(self, event):
+        """눌린 위치의 맨 위 가리개를 드래그 대상으로 잡습니다."""
+        if event.button() != Qt.LeftButton:
+            return
+        global_pos = event.globalPosition().toPoint()
+        cover = self.cover_at(global_pos)
+        if cover is None or cover.is_locked:
+            return
+        self._drag = (cover, global_pos, cover.pos(), self.controller.build_snap_index(cover))
+
+    @timed("compositor.mouse_move")
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return
+        cover, last_pos, origin, snap_index = self._drag
+        global_pos = event.globalPosition().toPoint()
+        origin = origin + (global_pos - last_pos)
+        if snap_index is not None:
+            cover.move(snap_index.snap(QRect(origin, cover.geometry().size())))
+        else:
+            cover.move(origin)
+        self._drag = (cover, global_pos, origin, snap_index)
+
+    def mouseReleaseEvent(self, event):
+        if self._drag is None:
+            return
+        cover = self._drag[0]
+        self._drag = None
+        # 다른 화면으로 옮겨졌다면 그 화면의 오버레이로 넘김
+        self.controller.compositor.reassign(cover)
+
+    def contextMenuEvent(self, event):
+        cover = self.cover_at(event.globalPos())
+        if cover is None:
+            return
+        build_cover_menu(self, cover, self.controller).exec(event.globalPos())
+
+
+class CompositorManager:
+    """화면별 오버레이 창을 만들고 가리개를 알맞은 오버레이에 배치하는 관리자"""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self._overlays = {}  # QScreen.name() -> CompositorOverlay
+
+    def create_cover(self, rect):
+        """가리개를 만듭니다. show()를 호출해야 오버레이에 붙어 화면에 나타납니다."""
+        return CompositorCover(rect, self)
+
+    def overlay_for(self, rect):
+        """사각형 중심이 속한 화면의 오버레이를 반환합니다 (필요하면 생성)."""
+        screen = QGuiApplication.screenAt(rect.center()) or QGuiApplication.primaryScreen()
+        overlay = self._overlays.get(screen.name())
+        if overlay is None:
+            overlay = CompositorOverlay(screen, self.controller)
+            self._overlays[screen.name()] = overlay
+        return overlay
+
+    def attach(self, cover):
+        self.overlay_for(cover.geometry()).add_cover(cover)
+
+    def reassign(self, cover):
+        """가리개 중심이 다른 화면으로 넘어갔으면 해당 화면의 오버레이로 옮깁니다."""
+        target = self.overlay_for(cover.geometry())
+        if cover.overlay is not target and cover.overlay is not None:
+            cover.overlay.remove_cover(cover)
+            target.add_cover(cover)
+
+    def stats(self):
+        """오버레이 모드의 창 수, 백킹 스토어 크기, 다시 그리기 비용을 반환합니다."""
+        overlays = list(self._overlays.values())
+        backing_bytes = 0
+        for overlay in overlays:
+            if overlay.isVisible():
+                ratio = overlay.devicePixelRatioF()
+                backing_bytes += int(overlay.width() * overlay.height() * ratio * ratio * 4)
+        return {
+            "native_windows": sum(1 for o in overlays if o.isVisible()),
+            "covers": sum(len(o.covers) for o in overlays),
+            "backing_store_bytes": backing_bytes,
+            "repaints": sum(o.repaints for o in overlays),
+            "repaint_pixels": sum(o.repaint_pixels for o in overlays),
+            "paint_ms": sum(o.paint_seconds for o in overlays) * 1000.0,
+        }
@@ -0,0 +1,389 @@
+# cover_controller.py
+
+"""
+가리개 컨트롤러 (화면 없는 공개 API)
+
+가리개의 생성/변경/삭제/조회를 담당하며, 컨트롤러 창(MainWindow)이나 트레이 아이콘 없이도
+동작합니다. 다른 PySide6 프로그램에 ScreenBlur를 넣어 코드로 가리개를 다룰 때 사용합니다.
+
+    from python import CoverController
+
+    controller = CoverController()
+    cover_id = controller.create_cover(QRect(100, 100, 400, 300), strength=16)
+    controller.update_cover(cover_id, rect=QRect(200, 100, 400, 300), locked=True)
+    controller.remove_cover(cover_id)
+
+QApplication만 있으면 되며, 설정 파일이나 트레이 아이콘을 만들지 않습니다.
+Viewport, 컴포지터, 선택 오버레이(및 NumPy)는 처음 사용할 때 import 합니다.
+"""
+
+from collections import namedtuple
+from functools import partial
+from PySide6.QtCore import QObject, QRect, Signal
+from PySide6.QtGui import QGuiApplication
+
+from .viewport_registry import ViewportRegistry
+from .cover_pool import CoverPool
+from .snapping import build_edge_index, DEFAULT_SNAP_DISTANCE
+from .input_mask import INPUT_FULL, INPUT_MODES
+from .cover_shape import SHAPE_RECT
+
+# 가리개 하나의 현재 상태 (list_covers / cover_info의 반환값)
+CoverInfo = namedtuple("CoverInfo", ["cover_id", "rect", "locked", "compositor", "strength",
+                                     "mode", "block_size", "downscale", "shape"])
+
+
+class CoverController(QObject):
+    """가리개를 만들고 관리하는 컨트롤러"""
+
+    # 가리개가 만들어져 화면에 표시됨 (가리개 ID)
+    cover_created = Signal(int)
+    # 가리개의 위치나 크기가 바뀜 (가리개 ID, 새 전역 geometry). 드래그 중에도 발생
+    cover_changed = Signal(int, QRect)
+    # 가리개가 닫힘 (가리개 ID)
+    cover_removed = Signal(int)
+    # 영역 선택 오버레이가 표시됨 / 닫힘 (선택/취소 모두)
+    selection_started = Signal()
+    selection_finished = Signal()
+    # 가리개 메뉴에서 "프로그램 종료"를 고름 (quit_enabled일 때만 메뉴에 표시)
+    quit_requested = Signal()
+    # 가리개 입력 영역 방식이 바뀜 (input_mask.INPUT_MODES 중 하나)
+    input_mode_changed = Signal(str)
+
+    def __init__(self, pool_size=4, compositor_mode=False, parent=None):
+        """
+        Args:
+            pool_size (int): 닫힌 가리개 창을 숨겨 두었다가 재사용할 최대 수 (0이면 재사용 안 함).
+            compositor_mode (bool): True이면 새 가리개를 단일 오버레이 모드로 만듭니다.
+        """
+        super().__init__(parent)
+        # 현재 떠 있는 모든 가리개 (Viewport + InteractionHandler 쌍)
+        self.viewports = ViewportRegistry()
+        # 닫힌 가리개 창을 숨겨 두었다가 재사용하는 풀
+        self.cover_pool = CoverPool(self, pool_size)
+        # 단일 오버레이 모드에서 사용할 화면별 오버레이 관리자 (처음 사용할 때 생성)
+        self._compositor = None
+        self.compositor_mode = compositor_mode
+        # 새로 만드는 가리개에 적용할 고정 상태
+        self.lock_new_covers = False
+        # 가리개 메뉴에 "프로그램 종료"를 표시할지 여부 (내장해서 쓸 때는 보통 False)
+        self.quit_enabled = False
+        # 드래그 중 가장자리에 붙는 거리 (픽셀, 0이면 맞춤 안 함)
+        self.snap_distance = DEFAULT_SNAP_DISTANCE
+        # 개별 창 가리개에서 클릭/드래그를 받는 영역 (전체 / 테두리 / 위쪽 띠)
+        self.input_mode = INPUT_FULL
+
+        self._geometry_slots = {}  # 가리개 ID -> geometry_changed에 연결된 슬롯
+        # 모니터별 영역 선택 오버레이 (처음 선택할 때 생성하고 이후 재사용)
+        self.selection_overlays = None
+        self._selection_callback = None
+
+    @property
+    def compositor(self):
+        """단일 오버레이 모드 관리자 (처음 접근할 때 생성)"""
+        if self._compositor is None:
+            from .compositor import CompositorManager
+            self._compositor = CompositorManager(self)
+        return self._compositor
+
+    # --- 생성 / 변경 / 삭제 / 조회 ---
+    def create_cover(self, rect: QRect, locked=None, compositor=None, strength=None,
+                     pixelate=False, block_size=None, downscale=None, shape=None):
+        """가리개를 만들어 화면에 표시합니다.
+
+        Args:
+            rect (QRect): 전역 논리 좌표 영역.
+            locked (bool, optional): 고정 상태. 생략하면 lock_new_covers.
+            compositor (bool, optional): 단일 오버레이 모드로 만들지 여부. 생략하면 compositor_mode.
+            strength (int, optional): 블러 강도.
+            pixelate (bool): 모자이크로 표시할지 여부.
+            block_size (int, optional): 모자이크 블록 크기.
+            downscale (int, optional): 소프트웨어 블러 축소 배율 (0이면 자동).
+            shape (CoverShape, optional): rect 안에 맞출 모양 (cover_shape.make_shape). 생략하면 사각형.
+
+        Returns:
+            int: 가리개 ID. 만들 수 없는 영역이면 None.
+        """
+        if not self.is_valid_cover_rect(rect):
+            return None
+        cover, handler = self._build_cover(rect, locked, compositor, strength,
+                                           pixelate, block_size, downscale, shape)
+        self._show_cover(cover, handler)
+        cover_id = self.viewports.id_of(cover)
+        self._connect_geometry(cover, cover_id)
+        self.cover_created.emit(cover_id)
+        return cover_id
+
+    def create_covers(self, specs):
+        """layouts.CoverSpec 목록의 가리개를 모두 숨긴 상태로 만든 뒤 한꺼번에 표시합니다.
+
+        Returns:
+            list: 만든 가리개 ID 목록 (만들 수 없는 영역은 건너뜀).
+        """
+        created = []
+        for spec in specs:
+            if not self.is_valid_cover_rect(spec.rect):
+                continue
+            created.append(self._build_cover(spec.rect, spec.locked, spec.compositor, spec.strength,
+                                             spec.pixelate, spec.block_size, spec.downscale,
+                                             spec.shape))
+
+        cover_ids = []
+        for cover, handler in created:
+            self._show_cover(cover, handler)
+            cover_id = self.viewports.id_of(cover)
+            self._connect_geometry(cover, cover_id)
+            cover_ids.append(cover_id)
+        for cover_id in cover_ids:
+            self.cover_created.emit(cover_id)
+        return cover_ids
+
+    def update_cover(self, cover_id, rect=None, locked=None, strength=None, mode=None,
+                     block_size=None, downscale=None, shape=None):
+        """가리개의 위치/크기와 표시 설정을 바꿉니다. None인 항목은 그대로 둡니다.
+
+        모양을 사각형으로 되돌리려면 shape에 cover_shape.SHAPE_RECT를 넘깁니다.
+
+        Raises:
+            KeyError: 해당 ID의 가리개가 없는 경우.
+            ValueError: 알 수 없는 표시 방식인 경우.
+        """
+        entry = self._entry(cover_id)
+        cover = entry.viewport
+        if mode is not None:
+            cover.set_render_mode(mode)
+        if locked is not None:
+            cover.set_lock(locked)
+        if strength is not None:
+            cover.set_blur_strength(strength)
+        if block_size is not None:
+            cover.set_block_size(block_size)
+        if downscale is not None:
+            cover.set_downscale(downscale)
+        if shape is not None:
+            self._apply_shape(cover, entry.handler, None if shape == SHAPE_RECT else shape)
+        if rect is not None:
+            cover.setGeometry(rect)
+            if entry.handler is not None:
+                entry.handler.setGeometry(rect)
+
+    def remove_cover(self, cover_id):
+        """가리개를 닫습니다. cover_removed는 가리개가 정리된 뒤 발생합니다.
+
+        Raises:
+            KeyError: 해당 ID의 가리개가 없는 경우.
+        """
+        self._entry(cover_id).viewport.close()
+
+    def close_all(self):
+        """모든 가리개를 닫습니다."""
+        self.viewports.close_all()
+
+    def cover_info(self, cover_id):
+        """가리개의 현재 상태를 반환합니다.
+
+        Raises:
+            KeyError: 해당 ID의 가리개가 없는 경우.
+        """
+        entry = self._entry(cover_id)
+        cover = entry.viewport
+        return CoverInfo(entry.cover_id, cover.geometry(), cover.is_locked, entry.handler is None,
+                         cover.blur_strength, cover.render_mode, cover.block_size, cover.downscale,
+                         cover.shape)
+
+    def list_covers(self):
+        """모든 가리개의 상태를 아래에서 위로 쌓인 순서대로 반환합니다."""
+        return [self.cover_info(entry.cover_id) for entry in self.viewports]
+
+    def cover_object(self, cover_id):
+        """가리개 객체(Viewport 또는 CompositorCover)를 반환합니다 (없으면 None)."""
+        entry = self.viewports.get(cover_id)
+        return entry.viewport if entry is not None else None
+
+    def set_lock_all(self, locked):
+        """모든 가리개(와 새로 만들 가리개)의 고정 상태를 설정합니다."""
+        self.lock_new_covers = locked
+        for entry in self.viewports:
+            entry.viewport.set_lock(locked)
+
+    def set_input_mode(self, mode):
+        """모든 개별 창 가리개(와 새로 만들 가리개)의 입력 영역 방식을 설정합니다.
+
+        Raises:
+            ValueError: 알 수 없는 방식인 경우.
+        """
+        if mode not in INPUT_MODES:
+            raise ValueError(f"알 수 없는 입력 영역 방식: {mode}")
+        if mode == self.input_mode:
+            return
+        self.input_mode = mode
+        for entry in self.viewports:
+            if entry.handler is not None:
+                entry.handler.set_input_mode(mode)
+        self.input_mode_changed.emit(mode)
+
+    def build_snap_index(self, cover):
+        """cover를 드래그하기 시작할 때 맞춤 후보 인덱스를 만듭니다.
+
+        Returns:
+            EdgeIndex: 화면 경계, 작업 영역, 다른 가리개의 가장자리 인덱스. 맞춤을 끈 경우 None.
+        """
+        if self.snap_distance <= 0:
+            return None
+        rects = (entry.viewport.geometry() for entry in self.viewports if entry.viewport is not cover)
+        return build_edge_index(QGuiApplication.screens(), rects, self.snap_distance)
+
+    def __len__(self):
+        return len(self.viewports)
+
+    def _entry(self, cover_id):
+        entry = self.viewports.get(cover_id)
+        if entry is None:
+            raise KeyError(f"가리개가 없습니다: {cover_id}")
+        return entry
+
+    # --- 영역 선택 ---
+    def start_viewport_selection(self):
+        """모든 모니터에 선택 오버레이를 띄우고, 고른 영역과 모양으로 가리개를 만듭니다."""
+        self.select_region(
+            lambda rect: self.create_cover(rect, shape=self.selection_overlays.selected_shape))
+
+    def select_region(self, on_selected):
+        """모든 모니터에 영역 선택 오버레이를 띄우고, 선택된 전역 영역(QRect)을 on_selected로 전달합니다."""
+        if self.selection_overlays is None:
+            from .selection_overlay import SelectionOverlayManager
+
+            self.selection_overlays = SelectionOverlayManager(self)
+            self.selection_overlays.region_selected.connect(self._on_region_selected)
+            self.selection_overlays.finished.connect(self.selection_finished)
+
+        self._selection_callback = on_selected
+        self.selection_started.emit()
+        self.selection_overlays.start()
+
+    def _on_region_selected(self, rect: QRect):
+        callback, self._selection_callback = self._selection_callback, None
+        if callback is not None:
+            callback(rect)
+
+    def quit_application(self):
+        """가리개 메뉴의 "프로그램 종료" 항목에서 호출됩니다."""
+        self.quit_requested.emit()
+
+    # --- 내부 ---
+    def is_valid_cover_rect(self, rect: QRect):
+        """가리개를 만들 수 있는 영역인지 검증합니다."""
+        # 좌표 유효성 검증
+        if rect.width() <= 0 or rect.height() <= 0:
+            print(f"경고: 유효하지 않은 가리개 크기 - width: {rect.width()}, height: {rect.height()}")
+            return False
+
+        # 연결된 모니터 중 하나와 겹쳐야 함 (모니터가 빠진 뒤 복원한 레이아웃 등)
+        if not any(screen.geometry().intersects(rect) for screen in QGuiApplication.screens()):
+            print(f"경고: 어느 모니터에도 걸치지 않는 영역 - x: {rect.x()}, y: {rect.y()}, "
+                  f"width: {rect.width()}, height: {rect.height()}")
+            return False
+        return True
+
+    def _build_cover(self, rect: QRect, locked=None, compositor=None, strength=None,
+                     pixelate=False, block_size=None, downscale=None, shape=None):
+        """가리개를 만들어 레지스트리에 등록합니다. 화면에 표시하거나 cover_changed를 연결하지는 않습니다.
+
+        Returns:
+            tuple: (가리개, InteractionHandler). 단일 오버레이 모드이면 handler는 None.
+        """
+        if compositor is None:
+            compositor = self.compositor_mode
+        if compositor:
+            # 단일 오버레이 모드: 별도 창을 만들지 않음
+            cover = self.compositor.create_cover(rect)
+            interaction_handler = None
+            cover.closing.connect(partial(self.on_viewport_closed, cover))
+        else:
+            # 풀에서 숨겨 둔 가리개 창을 꺼내거나 새로 만듦
+            # (closing 시그널 연결은 풀이 쌍을 만들 때 한 번만 함)
+            cover, interaction_handler = self.cover_pool.acquire(rect)
+            interaction_handler.set_input_mode(self.input_mode)
+
+        # 고정 상태, 블러 강도, 표시 방식을 가리개에 적용
+        cover.set_lock(self.lock_new_covers if locked is None else locked)
+        if strength is not None:
+            cover.set_blur_strength(strength)
+        if block_size is not None:
+            cover.set_block_size(block_size)
+        if downscale is not None:
+            cover.set_downscale(downscale)
+        if pixelate:
+            cover.set_render_mode("pixelate")
+        if shape is not None:
+            self._apply_shape(cover, interaction_handler, shape)
+
+        self.viewports.add(cover, interaction_handler)
+        return cover, interaction_handler
+
+    def _connect_geometry(self, cover, cover_id):
+        """가리개의 위치/크기 변경을 cover_changed로 알리도록 연결합니다.
+
+        표시한 뒤에 연결해야 표시 중에 생기는 geometry 변경이 cover_created보다 먼저 알려지지 않습니다.
+        """
+        slot = partial(self._on_geometry_changed, cover_id)
+        cover.geometry_changed.connect(slot)
+        self._geometry_slots[cover_id] = slot
+
+    def _on_geometry_changed(self, cover_id, rect):
+        # emit()을 슬롯으로 직접 연결하지 않음: 슬롯의 반환값(bool)이 PySide6로 넘어가지 않도록 None을 반환
+        self.cover_changed.emit(cover_id, rect)
+
+    def _apply_shape(self, cover, interaction_handler, shape):
+        cover.set_shape(shape)
+        if interaction_handler is not None:
+            # 모양 밖은 클릭이 통과하도록 입력 마스크도 다시 계산
+            interaction_handler.update_input_mask()
+
+    def _show_cover(self, cover, interaction_handler):
+        cover.show()
+        if interaction_handler is not None:
+            interaction_handler.show()
+
+    def on_viewport_closed(self, viewport):
+        """가리개가 닫혔을 때 호출되는 콜백. 레지스트리에서 제거하고 창을 정리합니다.
+
+        개별 창 가리개는 삭제하지 않고 창 풀로 되돌립니다.
+        """
+        entry = self.viewports.remove_viewport(viewport)
+        if entry is None:
+            return
+        slot = self._geometry_slots.pop(entry.cover_id, None)
+        if slot is not None:
+            try:
+                viewport.geometry_changed.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
+        if entry.handler is not None:
+            self.cover_pool.release(entry.viewport, entry.handler)
+        else:
+            entry.viewport.deleteLater()
+        self.cover_removed.emit(entry.cover_id)
+
+    def render_stats(self):
+        """현재 렌더링 비용(네이티브 창 수, 백킹 스토어 크기 등)을 모드별로 반환합니다."""
+        window_covers = [e for e in self.viewports if e.handler is not None]
+        backing_bytes = 0
+        for entry in window_covers:
+            ratio = entry.viewport.devicePixelRatioF()
+            area = entry.viewport.width() * entry.viewport.height() * ratio * ratio
+            # Viewport와 InteractionHandler가 각각 같은 크기의 백킹 스토어를 가짐
+            backing_bytes += int(area * 4 * 2)
+        return {
+            "windows": {
+                "native_windows": len(window_covers) * 2,
+                "covers": len(window_covers),
+                "backing_store_bytes": backing_bytes,
+            },
+            "compositor": self._compositor.stats() if self._compositor else {},
+        }
+
+    def shutdown(self):
+        """모든 가리개를 닫고 풀에 보관 중인 창을 삭제합니다."""
+        self.close_all()
+        self.cover_pool.clear()
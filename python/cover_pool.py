@@ -0,0 +1,129 @@
+# cover_pool.py
+
+"""
+가리개 창 풀
+
+가리개 하나는 Viewport와 InteractionHandler 두 개의 네이티브 창으로 이루어지며,
+네이티브 창 생성과 블러 적용이 가리개 생성 비용의 대부분을 차지합니다.
+닫힌 가리개를 바로 삭제하지 않고 숨긴 채로 보관했다가, 다음 가리개를 만들 때
+상태만 초기화하고 위치/크기를 바꿔 다시 사용합니다.
+"""
+
+from functools import partial
+from PySide6.QtCore import QObject, QTimer
+
+
+class CoverPool(QObject):
+    """미리 만들어 둔 (Viewport, InteractionHandler) 쌍을 재사용하는 풀"""
+
+    def __init__(self, controller, max_size=4):
+        """
+        Args:
+            controller (CoverController): 가리개 컨트롤러. InteractionHandler에 전달되며,
+                                          가리개가 닫히면 on_viewport_closed(viewport)가 호출됩니다.
+            max_size (int): 숨긴 채로 보관할 최대 쌍 수. 0이면 풀을 사용하지 않습니다.
+        """
+        super().__init__(controller)
+        self.controller = controller
+        self.max_size = max(0, int(max_size))
+        self._idle = []  # 재사용 대기 중인 (viewport, handler)
+        self._warm_up_remaining = 0
+
+        self.hits = 0       # 풀에서 꺼내 재사용한 횟수
+        self.misses = 0     # 풀이 비어 새로 만든 횟수
+        self.recycled = 0   # 닫힌 가리개를 풀로 되돌린 횟수
+        self.discarded = 0  # 풀이 가득 차 삭제한 횟수
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _create_pair(self):
+        """새 가리개 쌍을 만들고 네이티브 창과 블러를 준비합니다 (표시하지 않음)."""
+        from .viewport import Viewport
+        from .interaction_handler import InteractionHandler
+
+        viewport = Viewport()
+        handler = InteractionHandler(viewport, self.controller)
+
+        # destroyed 시그널 대신 커스텀 closing 시그널 사용 (타이밍 이슈 방지)
+        # 쌍은 재사용되어도 항상 함께 다니므로 연결은 한 번만 합니다.
+        viewport.closing.connect(handler.close)
+        viewport.closing.connect(partial(self.controller.on_viewport_closed, viewport))
+
+        viewport.prepare()
+        handler.winId()  # 네이티브 창 생성
+        return viewport, handler
+
+    def acquire(self, rect):
+        """rect 위치에 놓인 숨겨진 가리개 쌍을 반환합니다.
+
+        Returns:
+            tuple: (Viewport, InteractionHandler)
+        """
+        if self._idle:
+            viewport, handler = self._idle.pop()
+            self.hits += 1
+        else:
+            viewport, handler = self._create_pair()
+            self.misses += 1
+
+        viewport.setGeometry(rect)
+        handler.setGeometry(rect)
+        return viewport, handler
+
+    def release(self, viewport, handler):
+        """닫힌 가리개 쌍을 풀로 되돌립니다. 풀이 가득 찼으면 삭제합니다."""
+        if len(self._idle) >= self.max_size:
+            viewport.deleteLater()
+            handler.deleteLater()
+            self.discarded += 1
+            return
+
+        viewport.reset()
+        handler.reset()
+        self._idle.append((viewport, handler))
+        self.recycled += 1
+
+    def warm_up(self, count):
+        """이벤트 루프가 한 번 돌 때마다 한 쌍씩, 최대 count쌍을 미리 만들어 둡니다."""
+        self._warm_up_remaining = min(int(count), self.max_size)
+        if self._warm_up_remaining > 0:
+            QTimer.singleShot(0, self._warm_up_step)
+
+    def _warm_up_step(self):
+        if self._warm_up_remaining <= 0 or len(self._idle) >= self.max_size:
+            self._warm_up_remaining = 0
+            return
+        self._idle.append(self._create_pair())
+        self._warm_up_remaining -= 1
+        if self._warm_up_remaining > 0:
+            QTimer.singleShot(0, self._warm_up_step)
+
+    def set_max_size(self, max_size):
+        """풀 크기를 바꿉니다. 줄어든 만큼 보관 중인 쌍을 삭제합니다."""
+        self.max_size = max(0, int(max_size))
+        while len(self._idle) > self.max_size:
+            viewport, handler = self._idle.pop()
+            viewport.deleteLater()
+            handler.deleteLater()
+
+    def clear(self):
+        """보관 중인 모든 쌍을 삭제합니다."""
+        self._warm_up_remaining = 0
+        for viewport, handler in self._idle:
+            viewport.deleteLater()
+            handler.deleteLater()
+        self._idle.clear()
+
+    def stats(self):
+        """풀 적중/실패 횟수와 현재 보관 수를 반환합니다."""
+        requests = self.hits + self.misses
+        return {
+            "max_size": self.max_size,
+            "idle": len(self._idle),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "recycled": self.recycled,
+            "discarded": self.discarded,
+        }
@@ -0,0 +1,106 @@
+# cover_shape.py
+
+"""
+사각형이 아닌 가리개 모양 (타원, 둥근 사각형, 자유 다각형)
+
+모양은 가리개 사각형에 대한 비율 좌표(0~1)로 저장하므로 가리개를 옮기거나 크기를 바꿔도
+그대로 늘어납니다. 모양은 가리개 사각형 안에 꼭 맞게 그려지므로 가리개 사각형이 곧
+블러할 범위(bounding box)입니다.
+
+QPainterPath, 창 마스크(QRegion), 타일 판별용 래스터 마스크는 (모양, 가로, 세로)마다
+한 번만 만들어 캐시하고, 그리기와 입력 마스크가 함께 사용합니다.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPainterPath, QPolygonF, QRegion, QImage, QPainter
+
+# 모양 종류 (사각형 가리개는 모양 없음(None)으로 표현)
+SHAPE_RECT = "rect"
+SHAPE_ELLIPSE = "ellipse"
+SHAPE_ROUNDED = "rounded"
+SHAPE_POLYGON = "polygon"
+SHAPES = (SHAPE_RECT, SHAPE_ELLIPSE, SHAPE_ROUNDED, SHAPE_POLYGON)
+
+# 둥근 사각형의 모서리 반지름 (짧은 변에 대한 비율, 크기가 달라도 같은 모양이 되도록)
+ROUNDED_RADIUS_RATIO = 0.2
+
+# 가리개 모양 (kind: SHAPES 중 하나, points: 다각형 꼭짓점의 비율 좌표 튜플)
+CoverShape = namedtuple("CoverShape", ["kind", "points"])
+
+
+def make_shape(kind, points=()):
+    """모양을 만듭니다. 사각형이면 None을 반환합니다.
+
+    Args:
+        kind (str): SHAPES 중 하나.
+        points (iterable): 다각형 꼭짓점 (x, y) 비율 좌표 (다각형일 때만 사용).
+
+    Raises:
+        ValueError: 알 수 없는 종류이거나 꼭짓점이 3개 미만인 다각형인 경우.
+    """
+    if kind not in SHAPES:
+        raise ValueError(f"알 수 없는 가리개 모양: {kind}")
+    if kind == SHAPE_RECT:
+        return None
+    if kind != SHAPE_POLYGON:
+        return CoverShape(kind, ())
+    points = tuple((round(float(x), 4), round(float(y), 4)) for x, y in points)
+    if len(points) < 3:
+        raise ValueError("다각형 가리개에는 꼭짓점이 3개 이상 필요합니다")
+    return CoverShape(kind, points)
+
+
+def shape_to_data(shape):
+    """레이아웃 저장용 목록으로 변환합니다: [종류, x0, y0, x1, y1, ...] (사각형이면 None)"""
+    if shape is None:
+        return None
+    return [shape.kind] + [v for point in shape.points for v in point]
+
+
+def shape_from_data(data):
+    """shape_to_data()의 결과를 모양으로 되돌립니다.
+
+    Raises:
+        ValueError: 형식이 잘못된 경우.
+    """
+    if data is None:
+        return None
+    if not isinstance(data, (list, tuple)) or not data:
+        raise ValueError(f"잘못된 가리개 모양: {data!r}")
+    values = data[1:]
+    return make_shape(data[0], zip(values[0::2], values[1::2]))
+
+
+@lru_cache(maxsize=64)
+def shape_path(shape, width, height):
+    """width x height 사각형에 맞춘 모양의 QPainterPath (캐시된 객체이므로 수정하지 말 것)"""
+    path = QPainterPath()
+    if shape.kind == SHAPE_ELLIPSE:
+        path.addEllipse(QRectF(0, 0, width, height))
+    elif shape.kind == SHAPE_ROUNDED:
+        radius = min(width, height) * ROUNDED_RADIUS_RATIO
+        path.addRoundedRect(QRectF(0, 0, width, height), radius, radius)
+    else:
+        path.addPolygon(QPolygonF([QPointF(x * width, y * height) for x, y in shape.points]))
+        path.closeSubpath()
+    return path
+
+
+@lru_cache(maxsize=64)
+def shape_region(shape, width, height):
+    """창 마스크용 QRegion (모양 안쪽 픽셀)"""
+    return QRegion(shape_path(shape, width, height).toFillPolygon().toPolygon(), Qt.WindingFill)
+
+
+@lru_cache(maxsize=16)
+def shape_mask(shape, width, height):
+    """모양 안쪽을 255, 바깥을 0으로 칠한 width x height 명도 이미지"""
+    image = QImage(width, height, QImage.Format_Grayscale8)
+    image.fill(0)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.fillPath(shape_path(shape, width, height), Qt.white)
+    painter.end()
+    return image
@@ -0,0 +1,74 @@
+# drag_coalescer.py
+
+"""
+드래그 이동 병합기
+
+고성능 마우스는 초당 500~1000개의 이동 이벤트를 보내는데, 이벤트마다 창을 옮기면
+가리개 한 개당 두 번(Viewport + InteractionHandler)의 네이티브 창 이동이 발생합니다.
+이 클래스는 이동량을 누적했다가 디스플레이 프레임마다 한 번만 반영합니다.
+"""
+
+from PySide6.QtCore import QObject, QTimer, QPoint, Qt
+
+
+class DragCoalescer(QObject):
+    """드래그 이동량을 모아 프레임당 한 번 commit 콜백으로 전달하는 클래스"""
+
+    DEFAULT_REFRESH_RATE = 60.0
+
+    def __init__(self, commit, parent=None):
+        """
+        Args:
+            commit (callable): 누적된 이동량(QPoint)을 받아 실제로 창을 옮기는 함수.
+        """
+        super().__init__(parent)
+        self._commit = commit
+        self._pending = QPoint(0, 0)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+        self.set_refresh_rate(self.DEFAULT_REFRESH_RATE)
+
+        # --- 통계 ---
+        self.events_received = 0
+        self.moves_committed = 0
+
+    def set_refresh_rate(self, hz):
+        """반영 주기를 디스플레이 주사율에 맞춥니다."""
+        hz = hz if hz and hz > 0 else self.DEFAULT_REFRESH_RATE
+        self._timer.setInterval(max(1, int(1000.0 / hz)))
+
+    def add(self, delta):
+        """이동량을 누적하고, 아직 예약되지 않았다면 다음 프레임에 반영을 예약합니다."""
+        self.events_received += 1
+        self._pending += delta
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """누적된 이동량을 즉시 반영합니다 (드래그 종료 시에도 호출)."""
+        self._timer.stop()
+        if self._pending.isNull():
+            return
+        delta = self._pending
+        self._pending = QPoint(0, 0)
+        self.moves_committed += 1
+        self._commit(delta)
+
+    def discard(self):
+        """누적된 이동량을 반영하지 않고 버립니다."""
+        self._timer.stop()
+        self._pending = QPoint(0, 0)
+
+    def reset_stats(self):
+        self.events_received = 0
+        self.moves_committed = 0
+
+    def stats(self):
+        """받은 이벤트 수와 실제 반영한 이동 수를 반환합니다."""
+        return {
+            "events_received": self.events_received,
+            "moves_committed": self.moves_committed,
+        }
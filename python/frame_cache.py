@@ -0,0 +1,124 @@
+# frame_cache.py
+
+"""
+블러 결과 캐시
+
+가리개 뒤 화면이 몇 가지 상태를 오가는 경우(깜빡이는 커서, 일시 정지와 재생을 반복하는 영상,
+창 전환 후 되돌아오기)나, 가리개를 옮겼다가 제자리에 두거나 닫았다 다시 연 경우에는
+이전에 계산한 것과 똑같은 블러 결과를 다시 계산하게 됩니다.
+
+블러 결과 배열을 (축소된 캡처 크기, 블러 설정, 캡처 내용 서명) 키로 보관해 두고,
+키가 같으면 블러를 계산하지 않고 보관된 결과를 그대로 사용합니다.
+내용 서명은 캡처 전체를 다시 해시하지 않고, 바뀐 타일을 찾을 때 이미 계산한
+타일별 시그니처(tiling.TileTracker)를 해시해 만듭니다.
+캐시에는 전체를 다시 계산한 결과만 넣습니다. 바뀐 타일만 덮어쓴 결과는 이전 결과에 의존하므로
+내용 서명만으로 같은 결과라고 보장할 수 없습니다.
+보관 용량은 바이트 단위로 제한하며, 넘치면 가장 오래 사용하지 않은 결과부터 버립니다(LRU).
+
+캐시는 GUI 스레드에서만 사용합니다 (작업 스레드의 결과는 finish_job()에서 넣음).
+보관된 배열은 읽기 전용으로 바꿔 여러 가리개가 공유해도 덮어쓰지 않게 합니다.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+# 기본 캐시 용량 (바이트)
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def content_signature(tile_signature):
+    """타일별 시그니처 배열로 캡처 전체의 내용 서명(16바이트)을 만듭니다.
+
+    타일 시그니처는 모든 픽셀을 반영하므로, 서명이 같으면 내용이 같다고 봅니다.
+    타일 수만큼의 작은 배열만 해시하므로 캡처 크기와 관계없이 GUI 스레드에서 바로 계산합니다.
+    """
+    return hashlib.blake2b(tile_signature.tobytes(), digest_size=16).digest()
+
+
+class FrameCache:
+    """바이트 용량이 제한된 블러 결과 LRU 캐시"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        """
+        Args:
+            max_bytes (int): 보관할 결과 배열의 최대 총 크기. 0이면 캐시를 사용하지 않습니다.
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # 키 -> 결과 배열 (뒤쪽이 최근 사용)
+        self._bytes = 0
+
+        # --- 통계 ---
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(pixels, params, tile_signature):
+        """캡처 배열의 크기, 블러 설정(방식, 강도/블록 크기, 축소 배율, 모양)과
+        그 캡처의 타일별 시그니처로 캐시 키를 만듭니다."""
+        return pixels.shape, params, content_signature(tile_signature)
+
+    def get(self, key):
+        """키에 해당하는 결과 배열(읽기 전용)을 반환합니다. 없으면 None."""
+        pixels = self._entries.get(key)
+        if pixels is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pixels
+
+    def put(self, key, pixels):
+        """결과 배열을 보관합니다. 배열은 읽기 전용이 되므로 이후 수정하지 않아야 합니다."""
+        if pixels.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        pixels.flags.writeable = False
+        self._entries[key] = pixels
+        self._bytes += pixels.nbytes
+        self._trim()
+
+    def set_max_bytes(self, max_bytes):
+        """용량을 바꿉니다. 줄이면 넘치는 만큼 바로 버립니다."""
+        self.max_bytes = max(0, max_bytes)
+        self._trim()
+
+    def _trim(self):
+        """용량 안으로 들어올 때까지 가장 오래 사용하지 않은 결과를 버립니다."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, pixels = self._entries.popitem(last=False)
+            self._bytes -= pixels.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        """보관 중인 결과를 모두 버립니다 (통계는 유지)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_default_cache = None
+
+
+def default_frame_cache():
+    """애플리케이션 전체가 공유하는 블러 결과 캐시를 반환합니다."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FrameCache()
+    return _default_cache
@@ -0,0 +1,98 @@
+# hud.py
+
+"""
+성능 HUD
+
+화면 오른쪽 위에 가리개 그리기 FPS, 가장 느린 핸들러의 p99 실행 시간, 이벤트 루프 지연,
+가리개 수를 0.5초마다 갱신해 보여 주는 작은 창입니다.
+HUD가 떠 있는 동안에는 계측(instrumentation.metrics)과 이벤트 루프 지연 측정이 켜집니다.
+"""
+
+from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout
+from PySide6.QtCore import Qt, QTimer
+
+from .instrumentation import metrics, EventLoopMonitor
+
+
+class PerformanceHud(QWidget):
+    """화면 구석에 FPS, 핸들러 p99 시간, 가리개 수를 보여주는 작은 창"""
+
+    # 가리개 그리기 핸들러 이름 (FPS 계산에 사용)
+    PAINT_HANDLERS = ("viewport.paint", "compositor.paint")
+
+    def __init__(self, cover_count):
+        """
+        Args:
+            cover_count (callable): 현재 가리개 수를 반환하는 함수.
+        """
+        super().__init__()
+        self._cover_count = cover_count
+
+        self.setWindowFlags(
+            Qt.FramelessWindowHint |
+            Qt.WindowStaysOnTopHint |
+            Qt.Tool
+        )
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_ShowWithoutActivating, True)
+        self.setStyleSheet("""
+            QWidget {
+                background-color: rgba(0, 0, 0, 180);
+                color: #9fef00;
+                font-family: monospace;
+            }
+        """)
+
+        self._label = QLabel(self)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 6)
+        layout.addWidget(self._label)
+
+        self.monitor = EventLoopMonitor(parent=self)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(500)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        """표시 내용을 최신 기록으로 갱신합니다."""
+        fps = 0.0
+        for name in self.PAINT_HANDLERS:
+            stats = metrics.stats(name)
+            if stats is not None:
+                fps += stats.rate()
+
+        worst_name, worst_p99 = "-", 0.0
+        for name in metrics.handler_names():
+            if name == EventLoopMonitor.HANDLER_NAME:
+                continue
+            p99 = metrics.stats(name).summary()["p99_ms"]
+            if p99 > worst_p99:
+                worst_name, worst_p99 = name, p99
+
+        lag = metrics.stats(EventLoopMonitor.HANDLER_NAME)
+        lag_p99 = lag.summary()["p99_ms"] if lag is not None else 0.0
+
+        self._label.setText(
+            f"FPS        {fps:6.1f}\n"
+            f"p99 핸들러 {worst_p99:6.2f} ms ({worst_name})\n"
+            f"루프 지연  {lag_p99:6.2f} ms (p99)\n"
+            f"가리개     {self._cover_count():6d}"
+        )
+        self.adjustSize()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        metrics.enabled = True
+        self.monitor.start()
+        self._refresh_timer.start()
+        self.refresh()
+        screen = self.screen()
+        if screen is not None:
+            available = screen.availableGeometry()
+            self.move(available.right() - self.width() - 16, available.top() + 16)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+        self.monitor.stop()
@@ -0,0 +1,45 @@
+# input_mask.py
+
+"""
+가리개 입력 영역 마스크
+
+InteractionHandler는 가리개 위에 겹쳐 클릭과 드래그를 받는 창입니다.
+기본(full)은 가리개 전체가 입력을 받아 가리개 안쪽을 클릭할 수 없으므로,
+테두리(border)나 위쪽 띠(title)만 입력을 받고 나머지는 클릭이 통과하도록
+창 마스크(QRegion)를 설정할 수 있습니다.
+
+마스크는 (방식, 가로, 세로)마다 한 번만 계산해 캐시하므로, 같은 크기의 가리개가 많거나
+크기를 바꿨다가 되돌려도 다시 계산하지 않습니다.
+"""
+
+from functools import lru_cache
+from PySide6.QtGui import QRegion
+
+# 입력 영역 방식
+INPUT_FULL = "full"      # 가리개 전체 (마스크 없음)
+INPUT_BORDER = "border"  # 테두리만
+INPUT_TITLE = "title"    # 위쪽 띠만
+INPUT_MODES = (INPUT_FULL, INPUT_BORDER, INPUT_TITLE)
+
+# 테두리 두께와 위쪽 띠 높이 (논리 픽셀)
+BORDER_THICKNESS = 8
+TITLE_HEIGHT = 16
+
+
+@lru_cache(maxsize=128)
+def input_mask(mode, width, height):
+    """입력 영역 방식과 창 크기에 맞는 마스크를 반환합니다.
+
+    Returns:
+        QRegion: 입력을 받을 영역 (창 좌표). 전체가 입력을 받으면 None.
+    """
+    if mode == INPUT_BORDER:
+        thickness = min(BORDER_THICKNESS, width // 2, height // 2)
+        if thickness <= 0:
+            return None
+        # 바깥 사각형에서 안쪽 사각형을 빼서 테두리 고리를 만듦
+        return QRegion(0, 0, width, height).subtracted(
+            QRegion(thickness, thickness, width - 2 * thickness, height - 2 * thickness))
+    if mode == INPUT_TITLE:
+        return QRegion(0, 0, width, min(height, TITLE_HEIGHT))
+    return None
@@ -0,0 +1,176 @@
+# instrumentation.py
+
+"""
+성능 계측
+
+- 이벤트 핸들러(그리기, 마우스, geometry 변경)별 실행 시간을 크기가 고정된 링 버퍼에 기록
+- 하트비트 타이머로 GUI 이벤트 루프 지연(lag)을 측정
+- 기록을 히스토그램/백분위수로 요약해 JSON으로 내보내기
+
+계측은 기본적으로 꺼져 있으며(enabled=False), 꺼져 있을 때 timed 데코레이터는
+플래그 확인 한 번만 하고 원래 핸들러를 호출합니다.
+"""
+
+import json
+import time
+from collections import deque
+from functools import wraps
+from PySide6.QtCore import QObject, QTimer, Qt
+
+# 히스토그램 구간 상한 (ms). 마지막 구간은 그 이상 전부
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 100)
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class HandlerStats:
+    """핸들러 하나의 최근 실행 시간 기록 (링 버퍼)"""
+
+    __slots__ = ("samples", "count", "total_ms")
+
+    def __init__(self, capacity):
+        self.samples = deque(maxlen=capacity)  # (기록 시각, 소요 시간 ms)
+        self.count = 0        # 누적 호출 수 (링 버퍼에서 밀려난 것 포함)
+        self.total_ms = 0.0
+
+    def add(self, duration_ms):
+        self.samples.append((time.monotonic(), duration_ms))
+        self.count += 1
+        self.total_ms += duration_ms
+
+    def rate(self, window=1.0):
+        """최근 window초 동안의 초당 호출 수"""
+        cutoff = time.monotonic() - window
+        return sum(1 for stamp, _ in self.samples if stamp >= cutoff) / window
+
+    def summary(self):
+        durations = sorted(duration for _, duration in self.samples)
+        histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for duration in durations:
+            for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+                if duration <= bound:
+                    histogram[index] += 1
+                    break
+            else:
+                histogram[-1] += 1
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": _percentile(durations, 0.50),
+            "p99_ms": _percentile(durations, 0.99),
+            "max_ms": durations[-1] if durations else 0.0,
+            "histogram": histogram,
+        }
+
+
+class Instrumentation:
+    """핸들러 실행 시간과 진단 정보를 모으는 수집기"""
+
+    def __init__(self, capacity=2048):
+        self.enabled = False
+        self.capacity = capacity
+        self._handlers = {}   # 이름 -> HandlerStats
+        self._providers = {}  # 이름 -> 진단 정보를 반환하는 함수
+
+    def record(self, name, duration_ms):
+        """이름별 실행 시간을 기록합니다 (enabled일 때만)."""
+        if not self.enabled:
+            return
+        stats = self._handlers.get(name)
+        if stats is None:
+            stats = self._handlers[name] = HandlerStats(self.capacity)
+        stats.add(duration_ms)
+
+    def stats(self, name):
+        return self._handlers.get(name)
+
+    def handler_names(self):
+        return list(self._handlers)
+
+    def reset(self):
+        self._handlers.clear()
+
+    def register_provider(self, name, provider):
+        """내보내기에 포함할 진단 정보 함수(인자 없음, dict 반환)를 등록합니다."""
+        self._providers[name] = provider
+
+    def unregister_provider(self, name):
+        self._providers.pop(name, None)
+
+    def snapshot(self):
+        """모든 기록과 진단 정보를 dict로 반환합니다."""
+        diagnostics = {}
+        for name, provider in list(self._providers.items()):
+            try:
+                diagnostics[name] = provider()
+            except Exception as e:
+                diagnostics[name] = {"error": f"{type(e).__name__}: {e}"}
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "histogram_bounds_ms": list(HISTOGRAM_BOUNDS_MS),
+            "handlers": {name: stats.summary() for name, stats in self._handlers.items()},
+            "diagnostics": diagnostics,
+        }
+
+    def export_json(self, path=None):
+        """기록을 JSON 문자열로 반환하고, path가 주어지면 파일로도 저장합니다."""
+        text = json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+
+# 애플리케이션 전체가 공유하는 수집기
+metrics = Instrumentation()
+
+
+def timed(name):
+    """이벤트 핸들러의 실행 시간을 metrics에 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(name, (time.perf_counter() - started) * 1000.0)
+        return wrapper
+    return decorator
+
+
+class EventLoopMonitor(QObject):
+    """하트비트 타이머가 예정보다 늦게 실행된 시간으로 이벤트 루프 지연을 측정하는 클래스"""
+
+    HANDLER_NAME = "event_loop.lag"
+
+    def __init__(self, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.interval = interval_ms / 1000.0
+        self._expected = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def _beat(self):
+        now = time.perf_counter()
+        metrics.record(self.HANDLER_NAME, max(0.0, now - self._expected) * 1000.0)
+        self._expected = now + self.interval
@@ -1,15 +1,132 @@
 # interaction_handler.py
 
-from PySide6.QtWidgets import QWidget, QMenu
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QWidget, QMenu, QRubberBand
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QAction, QActionGroup, QPainter, QColor
+
+from .drag_coalescer import DragCoalescer
+from .instrumentation import timed
+from .blur_pipeline import MODE_BLUR, MODE_PIXELATE
+from .input_mask import input_mask, INPUT_FULL, INPUT_BORDER, INPUT_TITLE, BORDER_THICKNESS
+from .cover_shape import shape_region
+
+# 컨텍스트 메뉴에서 고를 수 있는 모자이크 블록 크기 (픽셀)
+BLOCK_SIZE_CHOICES = (8, 16, 24, 32, 48, 64)
+
+# 컨텍스트 메뉴에서 고를 수 있는 소프트웨어 블러 계산 해상도 (0은 자동)
+DOWNSCALE_CHOICES = ((0, "자동"), (1, "원본"), (2, "1/2"), (4, "1/4"))
+
+# 가장자리 크기 조절 영역의 두께 (논리 픽셀)
+RESIZE_MARGIN = 8
+# 컨텍스트 메뉴에서 고를 수 있는 입력 영역 (모든 가리개에 적용)
+INPUT_MODE_CHOICES = ((INPUT_FULL, "가리개 전체"), (INPUT_BORDER, "테두리만"), (INPUT_TITLE, "위쪽 띠만"))
+
+# 입력 영역을 테두리/띠로 제한했을 때 그 부분을 칠하는 색 (잡을 곳이 보이도록)
+_HANDLE_COLOR = QColor(64, 64, 64)
+
+# 크기 조절로 줄일 수 있는 가리개의 최소 가로/세로 (논리 픽셀)
+MIN_COVER_SIZE = 20
+
+# 잡은 가장자리 (가로, 세로: -1 왼쪽/위, 1 오른쪽/아래, 0 없음) -> 마우스 커서
+_RESIZE_CURSORS = {
+    (-1, 0): Qt.SizeHorCursor, (1, 0): Qt.SizeHorCursor,
+    (0, -1): Qt.SizeVerCursor, (0, 1): Qt.SizeVerCursor,
+    (-1, -1): Qt.SizeFDiagCursor, (1, 1): Qt.SizeFDiagCursor,
+    (1, -1): Qt.SizeBDiagCursor, (-1, 1): Qt.SizeBDiagCursor,
+}
+
+def build_cover_menu(parent, cover, controller):
+    """가리개 우클릭 컨텍스트 메뉴를 만듭니다.
+
+    개별 창 모드의 InteractionHandler와 단일 오버레이 모드가 같은 메뉴를 사용합니다.
+
+    Args:
+        parent (QWidget): 메뉴와 액션의 부모 위젯.
+        cover: 메뉴 대상 가리개 (is_locked, set_lock, render_mode, set_render_mode,
+               block_size, set_block_size, downscale, set_downscale, close를 제공).
+        controller (CoverController): 가리개 컨트롤러 (start_viewport_selection, input_mode,
+                                      set_input_mode, quit_enabled, quit_application 제공).
+    """
+    context_menu = QMenu(parent)
+
+    # 새 가리개 생성
+    new_viewport_action = QAction("새 가리개 생성", parent)
+    new_viewport_action.triggered.connect(controller.start_viewport_selection)
+
+    # 고정 (위치 + 크기)
+    lock_action = QAction("고정", parent, checkable=True)
+    lock_action.setChecked(cover.is_locked)
+    lock_action.triggered.connect(cover.set_lock)
+
+    # 표시 방식 (흐림 / 모자이크)
+    mode_menu = QMenu("표시 방식", parent)
+    mode_group = QActionGroup(parent)
+    for mode, label in ((MODE_BLUR, "흐림"), (MODE_PIXELATE, "모자이크")):
+        action = QAction(label, parent, checkable=True)
+        action.setChecked(cover.render_mode == mode)
+        action.triggered.connect(lambda checked, mode=mode: cover.set_render_mode(mode))
+        mode_group.addAction(action)
+        mode_menu.addAction(action)
+
+    # 모자이크 블록 크기
+    block_menu = QMenu("모자이크 크기", parent)
+    block_menu.setEnabled(cover.render_mode == MODE_PIXELATE)
+    block_group = QActionGroup(parent)
+    for size in BLOCK_SIZE_CHOICES:
+        action = QAction(f"{size} px", parent, checkable=True)
+        action.setChecked(cover.block_size == size)
+        action.triggered.connect(lambda checked, size=size: cover.set_block_size(size))
+        block_group.addAction(action)
+        block_menu.addAction(action)
+
+    # 소프트웨어 블러 계산 해상도 (아크릴 블러를 쓰는 가리개에는 해당 없음)
+    downscale_menu = QMenu("계산 해상도", parent)
+    downscale_menu.setEnabled(cover.uses_software_blur)
+    downscale_group = QActionGroup(parent)
+    for downscale, label in DOWNSCALE_CHOICES:
+        action = QAction(label, parent, checkable=True)
+        action.setChecked(cover.downscale == downscale)
+        action.triggered.connect(lambda checked, downscale=downscale: cover.set_downscale(downscale))
+        downscale_group.addAction(action)
+        downscale_menu.addAction(action)
+
+    # 입력 영역 (모든 가리개에 적용)
+    input_menu = QMenu("잡는 영역", parent)
+    input_group = QActionGroup(parent)
+    for mode, label in INPUT_MODE_CHOICES:
+        action = QAction(label, parent, checkable=True)
+        action.setChecked(controller.input_mode == mode)
+        action.triggered.connect(lambda checked, mode=mode: controller.set_input_mode(mode))
+        input_group.addAction(action)
+        input_menu.addAction(action)
+
+    # 이 가리개 닫기
+    close_action = QAction("이 가리개 닫기", parent)
+    close_action.triggered.connect(cover.close)
+
+    # 프로그램 종료 (다른 프로그램에 내장된 경우에는 표시하지 않음)
+    quit_action = QAction("프로그램 종료", parent)
+    quit_action.setVisible(controller.quit_enabled)
+    quit_action.triggered.connect(controller.quit_application)
+
+    context_menu.addAction(new_viewport_action)
+    context_menu.addSeparator()
+    context_menu.addAction(lock_action)
+    context_menu.addMenu(mode_menu)
+    context_menu.addMenu(block_menu)
+    context_menu.addMenu(downscale_menu)
+    context_menu.addMenu(input_menu)
+    context_menu.addSeparator()
+    context_menu.addAction(close_action)
+    context_menu.addAction(quit_action)
+    return context_menu
 
 class InteractionHandler(QWidget):
     """마우스 입력을 받아 가리개를 제어하는 투명한 창"""
-    def __init__(self, blur_window, main_window):
+    def __init__(self, blur_window, controller):
         super().__init__()
         self.blur_window = blur_window
-        self.main_window = main_window  # 메인 윈도우 참조 저장
+        self.controller = controller  # 가리개 컨트롤러 참조 저장
 
         # --- 창 설정: 보이지 않지만 마우스 이벤트를 받을 수 있도록 ---
         self.setWindowFlags(
@@ -25,56 +142,214 @@ class InteractionHandler(QWidget):
         # 0.0은 OS가 창을 무시할 수 있으므로 0에 가까운 값을 사용
         self.setWindowOpacity(0.01)
 
+        # 입력을 받는 영역 (input_mask.INPUT_MODES)
+        self.input_mode = INPUT_FULL
+
+        # 드래그 이동을 프레임당 한 번으로 모아서 반영
+        self.drag_coalescer = DragCoalescer(self._commit_move, self)
+        # 맞춤 없이 마우스를 따라간 위치와 드래그 시작 시 만든 맞춤 인덱스
+        self._drag_origin = None
+        self._snap_index = None
+
+        # --- 크기 조절 상태 ---
+        # 가장자리에 마우스를 올렸을 때 커서를 바꾸기 위해 버튼 없이도 이동 이벤트를 받음
+        self.setMouseTracking(True)
+        self._hover_edges = (0, 0)
+        self._resize_edges = None     # 크기 조절 중 잡은 가장자리 (없으면 None)
+        self._resize_geometry = None  # 크기 조절을 시작할 때의 전역 geometry
+        self._resize_press = None     # 크기 조절을 시작한 전역 마우스 위치
+        self._rubber_band = None      # 크기 조절 미리보기 (처음 크기를 조절할 때 생성)
+
+    def reset(self):
+        """진행 중이던 드래그/크기 조절 상태를 버립니다 (창 풀에서 재사용하기 전)."""
+        self.drag_coalescer.discard()
+        self._end_drag()
+        self._end_resize()
+        self._set_hover_edges((0, 0))
+        self.update_input_mask()
+
+    def _end_drag(self):
+        if hasattr(self, '_drag_start_position'):
+            del self._drag_start_position
+        self._drag_origin = None
+        self._snap_index = None
+
+    # --- 입력 영역 ---
+    def set_input_mode(self, mode):
+        """입력을 받는 영역을 가리개 전체/테두리/위쪽 띠 중 하나로 설정합니다.
+
+        테두리나 띠로 제한하면 나머지 부분은 클릭이 아래 창으로 통과합니다.
+        이때는 창 전체를 거의 투명하게 겹칠 필요가 없으므로 불투명하게 두고 잡을 곳만 칠합니다.
+        """
+        if mode == self.input_mode:
+            return
+        self.input_mode = mode
+        self.setWindowOpacity(0.01 if mode == INPUT_FULL else 1.0)
+        self.update_input_mask()
+        self.update()
+
+    def update_input_mask(self):
+        """현재 크기에 맞는 입력 마스크를 적용합니다 (크기별로 캐시된 QRegion 사용).
+
+        가리개에 모양이 있으면 모양 밖은 항상 클릭이 통과합니다.
+        """
+        width, height = self.width(), self.height()
+        mask = input_mask(self.input_mode, width, height)
+        shape = self.blur_window.shape
+        if shape is not None:
+            region = shape_region(shape, width, height)
+            mask = region if mask is None else mask.intersected(region)
+        if mask is None:
+            self.clearMask()
+        else:
+            self.setMask(mask)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.input_mode != INPUT_FULL or self.blur_window.shape is not None:
+            self.update_input_mask()
+
+    def paintEvent(self, event):
+        """입력 영역을 제한한 경우 잡을 수 있는 부분을 칠합니다 (마스크 밖은 그려지지 않음)."""
+        if self.input_mode == INPUT_FULL:
+            return
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), _HANDLE_COLOR)
+
     # --- 이벤트 핸들러 ---
     def contextMenuEvent(self, event):
         """우클릭 시 컨텍스트 메뉴를 표시합니다."""
-        context_menu = QMenu(self)
+        context_menu = build_cover_menu(self, self.blur_window, self.controller)
+        context_menu.exec(event.globalPos())
+        
+    # --- 크기 조절 ---
+    def _edges_at(self, pos):
+        """창 안의 위치가 걸친 가장자리 (가로, 세로)를 반환합니다."""
+        # 작은 가리개에서도 이동할 수 있는 가운데 영역을 남겨 둠
+        # (테두리만 입력을 받을 때는 테두리 바깥쪽 절반만 크기 조절에 씀)
+        limit = BORDER_THICKNESS // 2 if self.input_mode == INPUT_BORDER else RESIZE_MARGIN
+        margin = min(limit, max(1, min(self.width(), self.height()) // 4))
+        x, y = pos.x(), pos.y()
+        horizontal = -1 if x < margin else 1 if x >= self.width() - margin else 0
+        vertical = -1 if y < margin else 1 if y >= self.height() - margin else 0
+        return horizontal, vertical
 
-        # 새 가리개 생성
-        new_viewport_action = QAction("새 가리개 생성", self)
-        new_viewport_action.triggered.connect(self.main_window.start_viewport_selection)
+    def _set_hover_edges(self, edges):
+        """마우스가 올라간 가장자리에 맞춰 커서를 바꿉니다 (바뀔 때만)."""
+        if edges == self._hover_edges:
+            return
+        self._hover_edges = edges
+        cursor = _RESIZE_CURSORS.get(edges)
+        if cursor is None:
+            self.unsetCursor()
+        else:
+            self.setCursor(cursor)
 
-        # 고정 (위치 + 크기)
-        lock_action = QAction("고정", self, checkable=True)
-        lock_action.setChecked(self.blur_window.is_locked)
-        lock_action.triggered.connect(self.blur_window.set_lock)
+    def _resized_rect(self, global_pos):
+        """크기 조절 시작 geometry에서 잡은 가장자리만 마우스 이동량만큼 옮긴 사각형"""
+        rect = QRect(self._resize_geometry)
+        delta = global_pos - self._resize_press
+        horizontal, vertical = self._resize_edges
+        if horizontal < 0:
+            rect.setLeft(min(rect.left() + delta.x(), rect.right() - MIN_COVER_SIZE + 1))
+        elif horizontal > 0:
+            rect.setRight(max(rect.right() + delta.x(), rect.left() + MIN_COVER_SIZE - 1))
+        if vertical < 0:
+            rect.setTop(min(rect.top() + delta.y(), rect.bottom() - MIN_COVER_SIZE + 1))
+        elif vertical > 0:
+            rect.setBottom(max(rect.bottom() + delta.y(), rect.top() + MIN_COVER_SIZE - 1))
+        return rect
 
-        # 이 가리개 닫기
-        close_action = QAction("이 가리개 닫기", self)
-        close_action.triggered.connect(self.blur_window.close)
+    def _start_resize(self, edges, global_pos):
+        """크기 조절을 시작합니다. 놓을 때까지는 윤곽선 미리보기만 움직입니다."""
+        self._resize_edges = edges
+        self._resize_geometry = self.blur_window.geometry()
+        self._resize_press = global_pos
+        if self._rubber_band is None:
+            self._rubber_band = QRubberBand(QRubberBand.Rectangle)
+        self._rubber_band.setGeometry(self._resize_geometry)
+        self._rubber_band.show()
 
-        # 프로그램 종료
-        quit_action = QAction("프로그램 종료", self)
-        quit_action.triggered.connect(self.main_window.quit_application)
+    def _end_resize(self):
+        self._resize_edges = None
+        self._resize_geometry = None
+        self._resize_press = None
+        if self._rubber_band is not None:
+            self._rubber_band.hide()
 
-        context_menu.addAction(new_viewport_action)
-        context_menu.addSeparator()
-        context_menu.addAction(lock_action)
-        context_menu.addSeparator()
-        context_menu.addAction(close_action)
-        context_menu.addAction(quit_action)
+    @timed("handler.commit_resize")
+    def _commit_resize(self, rect):
+        """최종 크기를 블러 창과 자신에 한 번만 반영합니다.
 
-        context_menu.exec(event.globalPos())
-        
+        중간 크기마다 반영하면 블러 버퍼를 크기마다 새로 만들고 다시 계산하게 됩니다.
+        """
+        self.blur_window.setGeometry(rect)
+        self.setGeometry(rect)
+
+    @timed("handler.mouse_press")
     def mousePressEvent(self, event):
-        """마우스 드래그 시작 위치를 기록합니다."""
+        """가장자리를 누르면 크기 조절을, 안쪽을 누르면 드래그 이동을 시작합니다."""
         if self.blur_window.is_locked or event.button() != Qt.LeftButton:
             return
+        edges = self._edges_at(event.position().toPoint())
+        if edges != (0, 0):
+            self._start_resize(edges, event.globalPosition().toPoint())
+            return
         self._drag_start_position = event.globalPosition().toPoint()
+        self._drag_origin = self.blur_window.pos()
+        # 다른 가리개는 드래그 중에 움직이지 않으므로 가장자리 인덱스는 한 번만 만듦
+        self._snap_index = self.controller.build_snap_index(self.blur_window)
+        screen = self.screen()
+        if screen is not None:
+            self.drag_coalescer.set_refresh_rate(screen.refreshRate())
 
+    @timed("handler.mouse_move")
     def mouseMoveEvent(self, event):
-        """자신과 블러 창을 함께 움직입니다."""
-        if self.blur_window.is_locked or not hasattr(self, '_drag_start_position'):
+        """이동량을 누적합니다. 실제 이동은 프레임마다 _commit_move에서 한 번 반영됩니다.
+
+        크기 조절 중에는 미리보기 윤곽선만 옮기고, 버튼을 누르지 않았으면 커서만 바꿉니다.
+        """
+        if self._resize_edges is not None:
+            self._rubber_band.setGeometry(self._resized_rect(event.globalPosition().toPoint()))
+            return
+        if not hasattr(self, '_drag_start_position'):
+            self._set_hover_edges((0, 0) if self.blur_window.is_locked
+                                  else self._edges_at(event.position().toPoint()))
+            return
+        if self.blur_window.is_locked:
             return
 
         delta = event.globalPosition().toPoint() - self._drag_start_position
-
-        self.move(self.pos() + delta)
-        self.blur_window.move(self.blur_window.pos() + delta)
+        self.drag_coalescer.add(delta)
 
         self._drag_start_position = event.globalPosition().toPoint()
 
+    @timed("handler.mouse_release")
     def mouseReleaseEvent(self, event):
-        """드래그 상태를 초기화합니다."""
+        """남은 이동량이나 최종 크기를 반영하고 드래그 상태를 초기화합니다."""
+        if self._resize_edges is not None:
+            rect = self._resized_rect(event.globalPosition().toPoint())
+            self._end_resize()
+            if rect != self.blur_window.geometry():
+                self._commit_resize(rect)
+            return
         if hasattr(self, '_drag_start_position'):
-            del self._drag_start_position
\ No newline at end of file
+            self.drag_coalescer.flush()
+            self._end_drag()
+
+    @timed("handler.commit_move")
+    def _commit_move(self, delta):
+        """누적된 이동량만큼 블러 창과 자신을 같은 위치로 함께 옮깁니다.
+
+        맞춤은 마우스를 그대로 따라간 위치에 매번 새로 적용하므로, 임계값보다 멀리
+        끌면 가장자리에서 다시 떨어집니다.
+        """
+        if self._drag_origin is None:
+            self._drag_origin = self.blur_window.pos()
+        self._drag_origin += delta
+        target = self._drag_origin
+        if self._snap_index is not None:
+            target = self._snap_index.snap(QRect(target, self.blur_window.size()))
+        # 두 창을 같은 기준 위치에서 계산해 서로 어긋나지 않게 유지
+        self.blur_window.move(target)
+        self.move(target)
@@ -0,0 +1,343 @@
+# ipc.py
+
+"""
+로컬 IPC 제어 채널
+
+처음 실행된 인스턴스가 로컬 소켓 서버(QLocalServer)를 열고, 이후 실행되는 인스턴스는
+명령을 전달한 뒤 바로 종료합니다. 자동화 스크립트가 명령마다 Qt GUI를 새로 띄우지 않고도
+가리개를 만들거나 닫을 수 있습니다.
+
+프로토콜: 한 줄에 JSON 객체 하나 (UTF-8, '\\n' 구분)
+  요청: {"cmd": "create", "rect": [x, y, w, h]}
+  응답: {"ok": true, ...} 또는 {"ok": false, "error": "..."}
+
+클라이언트 쪽(send_commands)은 표준 라이브러리만 사용하므로 PySide6를 import하지 않습니다.
+Windows에서는 QLocalServer가 만드는 named pipe를, 그 외에서는 Unix 도메인 소켓을 직접 엽니다.
+
+소켓과 인스턴스 잠금 파일은 현재 사용자만 접근할 수 있는 디렉터리(runtime_dir)에 둡니다.
+서버를 열 인스턴스는 잠금 파일을 먼저 잡아야 하므로, 두 인스턴스가 동시에 시작해도
+나중 인스턴스가 먼저 인스턴스의 소켓을 지우고 함께 실행되는 일이 없습니다.
+"""
+
+import os
+import sys
+import json
+import stat
+import socket
+import getpass
+import tempfile
+import threading
+
+# 클라이언트 연결 대기 시간 (초)
+CLIENT_TIMEOUT = 0.5
+# 명령 하나의 응답 대기 시간 (초). 레이아웃 복원처럼 오래 걸리는 명령도 기다릴 수 있게 넉넉히 잡음
+REPLY_TIMEOUT = 10.0
+
+# 다른 인스턴스가 서버를 여는 중일 때 연결을 다시 시도할 시간 (초)
+SERVER_STARTUP_TIMEOUT = 5.0
+
+
+class IpcError(Exception):
+    """실행 중인 인스턴스에 연결했지만 응답을 받지 못한 경우
+
+    명령이 이미 전달되어 처리 중일 수 있으므로, 이 오류가 나면 같은 명령을 다시 보내면 안 됩니다.
+    """
+
+
+def runtime_dir():
+    """IPC 소켓과 인스턴스 잠금 파일을 둘 현재 사용자 전용 디렉터리를 반환합니다.
+
+    Raises:
+        OSError: 디렉터리를 만들 수 없거나 다른 사용자도 접근할 수 있는 경우.
+    """
+    if sys.platform == 'win32':
+        base = os.getenv('LOCALAPPDATA') or tempfile.gettempdir()
+        path = os.path.join(base, "ScreenBlur")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    # XDG_RUNTIME_DIR은 로그인한 사용자 전용(0700)으로 만들어지는 디렉터리
+    base = os.getenv('XDG_RUNTIME_DIR')
+    if base and os.path.isdir(base):
+        return base
+
+    # 없으면 임시 폴더 안에 사용자 전용 디렉터리를 만들고, 다른 사용자가 미리 만들어 둔
+    # 디렉터리(또는 심볼릭 링크)를 쓰지 않도록 소유자와 권한을 확인
+    path = os.path.join(tempfile.gettempdir(), f"screenblur-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(f"IPC 디렉터리를 안전하게 사용할 수 없습니다: {path}")
+    return path
+
+
+def server_name():
+    """현재 사용자의 IPC 서버 이름(Windows pipe 이름 또는 Unix 소켓 경로)을 반환합니다."""
+    if sys.platform == 'win32':
+        # named pipe는 파일 시스템에 없으므로 사용자 이름으로 구분 (접근은 UserAccessOption으로 제한)
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "default"
+        return f"screenblur-ipc-{user}"
+    # Unix에서는 전체 경로를 지정해 클라이언트가 같은 경로로 직접 접속할 수 있게 함
+    return os.path.join(runtime_dir(), "screenblur-ipc.sock")
+
+
+class InstanceLock:
+    """서버를 여는 인스턴스를 하나로 제한하는 잠금 파일
+
+    운영체제의 파일 잠금을 사용하므로 프로세스가 비정상 종료되어도 잠금이 남지 않습니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(runtime_dir(), "screenblur.lock")
+        self._file = None
+
+    def acquire(self):
+        """기다리지 않고 잠금을 시도합니다.
+
+        Returns:
+            bool: 잠금을 잡았으면 True, 다른 인스턴스가 잡고 있으면 False.
+        """
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, 'a+b')
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            # 파일을 닫으면 잠금도 풀림
+            self._file.close()
+            self._file = None
+
+
+def _exchange_unix(lines):
+    """Unix 소켓으로 명령을 주고받습니다. 서버가 없으면 None을 반환합니다."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        try:
+            sock.connect(server_name())
+        except OSError:
+            # 소켓 파일이 없거나 비정상 종료 후 남은 소켓 (연결 거부)
+            return None
+
+        sock.settimeout(REPLY_TIMEOUT)
+        try:
+            stream = sock.makefile('rwb')
+            replies = []
+            for line in lines:
+                stream.write(line)
+                stream.flush()
+                replies.append(stream.readline())
+            return replies
+        except socket.timeout:
+            raise IpcError(f"실행 중인 인스턴스가 {REPLY_TIMEOUT:g}초 안에 응답하지 않았습니다") from None
+        except OSError as e:
+            raise IpcError(f"실행 중인 인스턴스와의 연결이 끊어졌습니다: {e}") from None
+
+
+def _exchange_pipe_blocking(pipe, lines):
+    replies = []
+    for line in lines:
+        pipe.write(line)
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = pipe.read(4096)
+            if not chunk:
+                break
+            reply += chunk
+        replies.append(reply)
+    return replies
+
+
+def _exchange_pipe(lines):
+    """named pipe로 명령을 주고받습니다. 서버가 없으면 None을 반환합니다.
+
+    named pipe는 읽기 시간 제한이 없으므로 데몬 스레드에서 주고받고 제한 시간까지만 기다립니다.
+    서버가 멈춰 있어도 클라이언트는 제한 시간 뒤 종료하며, 남은 스레드는 프로세스와 함께 끝납니다.
+    """
+    try:
+        pipe = open(r'\\.\pipe\{}'.format(server_name()), 'r+b', buffering=0)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        # 파이프는 있지만 모든 인스턴스가 사용 중인 경우 등: 서버는 실행 중임
+        raise IpcError(f"실행 중인 인스턴스에 연결할 수 없습니다: {e}") from None
+
+    result = {}
+
+    def run():
+        try:
+            with pipe:
+                result["replies"] = _exchange_pipe_blocking(pipe, lines)
+        except OSError as e:
+            result["error"] = e
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(REPLY_TIMEOUT * len(lines))
+    if worker.is_alive():
+        raise IpcError(f"실행 중인 인스턴스가 {REPLY_TIMEOUT:g}초 안에 응답하지 않았습니다")
+    if "error" in result:
+        raise IpcError(f"실행 중인 인스턴스와의 연결이 끊어졌습니다: {result['error']}")
+    return result["replies"]
+
+
+def send_commands(commands):
+    """실행 중인 인스턴스에 명령들을 보내고 응답 목록을 반환합니다.
+
+    Args:
+        commands (list[dict]): 보낼 명령 목록.
+
+    Returns:
+        list[dict] | None: 명령별 응답. 실행 중인 인스턴스가 없으면(연결 실패) None.
+
+    Raises:
+        IpcError: 연결한 뒤 응답을 받지 못한 경우. 명령이 이미 처리 중일 수 있으므로 다시 보내지 않습니다.
+    """
+    lines = [(json.dumps(command, ensure_ascii=False) + "\n").encode('utf-8') for command in commands]
+    try:
+        if sys.platform == 'win32':
+            raw_replies = _exchange_pipe(lines)
+        else:
+            raw_replies = _exchange_unix(lines)
+    except OSError:
+        # 사용자 전용 디렉터리를 쓸 수 없는 경우 등: 연결 전에 실패했으므로 서버 없음으로 봄
+        return None
+    if raw_replies is None:
+        return None
+
+    replies = []
+    for raw in raw_replies:
+        try:
+            replies.append(json.loads(raw.decode('utf-8')))
+        except ValueError:
+            replies.append({"ok": False, "error": "잘못된 응답"})
+    return replies
+
+
+def wait_for_server(commands, timeout=SERVER_STARTUP_TIMEOUT, interval=0.05):
+    """다른 인스턴스가 서버를 여는 중일 때, 열릴 때까지 명령 전달을 다시 시도합니다.
+
+    연결에 성공한 뒤의 실패(IpcError)는 명령이 전달되었을 수 있으므로 다시 시도하지 않고 그대로 올립니다.
+
+    Returns:
+        list[dict] | None: 명령별 응답. 제한 시간 안에 서버가 열리지 않으면 None.
+    """
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        replies = send_commands(commands)
+        if replies is not None or time.monotonic() >= deadline:
+            return replies
+        time.sleep(interval)
+
+
+class IpcServer:
+    """첫 번째 인스턴스에서 명령을 받아 handler로 전달하는 로컬 소켓 서버"""
+
+    def __init__(self, handler):
+        """
+        Args:
+            handler (callable): 명령 dict를 받아 응답 dict를 반환하는 함수.
+        """
+        from PySide6.QtNetwork import QLocalServer
+
+        self.handler = handler
+        self._server = QLocalServer()
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}  # 소켓 -> 아직 줄바꿈이 오지 않은 수신 데이터
+        self._lock = None
+        self.already_running = False  # listen()이 다른 인스턴스 때문에 실패했는지 여부
+
+    def listen(self):
+        """인스턴스 잠금을 잡고 서버를 시작합니다.
+
+        잠금을 잡은 인스턴스만 서버를 열 수 있으므로, 그 상태에서 남아 있는 소켓은
+        비정상 종료한 이전 실행의 잔재이며 지워도 안전합니다.
+
+        Returns:
+            bool: 서버를 시작했으면 True. 다른 인스턴스가 이미 실행 중이면 False이고
+                  already_running이 True가 됩니다.
+        """
+        from PySide6.QtNetwork import QLocalServer
+
+        try:
+            name = server_name()
+            self._lock = InstanceLock()
+            if not self._lock.acquire():
+                self.already_running = True
+                return False
+        except OSError as e:
+            print(f"IPC 서버 시작 실패: {e}")
+            return False
+
+        QLocalServer.removeServer(name)
+        if not self._server.listen(name):
+            print(f"IPC 서버 시작 실패: {self._server.errorString()}")
+            self._lock.release()
+            return False
+        return True
+
+    def close(self):
+        # 서버와 함께 소멸되는 클라이언트 소켓이 소멸 중에 disconnected를 보내지 않도록 먼저 정리
+        for client in list(self._buffers):
+            client.readyRead.disconnect()
+            client.disconnected.disconnect()
+            client.abort()
+            client.deleteLater()
+        self._buffers.clear()
+        self._server.close()
+        if self._lock is not None:
+            self._lock.release()
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            client = self._server.nextPendingConnection()
+            self._buffers[client] = b""
+            client.readyRead.connect(lambda c=client: self._on_ready_read(c))
+            client.disconnected.connect(lambda c=client: self._on_disconnected(c))
+
+    def _on_disconnected(self, client):
+        self._buffers.pop(client, None)
+        client.deleteLater()
+
+    def _on_ready_read(self, client):
+        buffer = self._buffers.get(client, b"") + bytes(client.readAll())
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            reply = self._dispatch(line)
+            client.write((json.dumps(reply, ensure_ascii=False) + "\n").encode('utf-8'))
+            client.flush()
+        self._buffers[client] = buffer
+
+    def _dispatch(self, line):
+        try:
+            command = json.loads(line.decode('utf-8'))
+            if not isinstance(command, dict) or "cmd" not in command:
+                raise ValueError("cmd 필드가 없습니다")
+        except ValueError as e:
+            return {"ok": False, "error": f"잘못된 명령: {e}"}
+
+        try:
+            return self.handler(command)
+        except Exception as e:
+            print(f"IPC 명령 처리 실패 ({command.get('cmd')}): {type(e).__name__}: {e}")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
@@ -0,0 +1,84 @@
+# layouts.py
+
+"""
+가리개 레이아웃 저장 형식
+
+레이아웃은 SettingsManager의 "layouts" 키에 이름별로 저장됩니다.
+가리개 수백 개를 저장해도 설정 파일이 커지지 않도록 가리개 하나를 숫자 배열 하나로 표현합니다.
+
+    {"v": 1, "covers": [[x, y, w, h, flags, strength, block_size, downscale, shape], ...]}
+
+flags 비트:
+    bit 0 (1): 고정 상태
+    bit 1 (2): 단일 오버레이 모드로 생성
+    bit 2 (4): 모자이크 모드
+
+block_size(모자이크 블록 크기), downscale(소프트웨어 블러 축소 배율, 0은 자동),
+shape(가리개 모양, cover_shape.shape_to_data 형식, 사각형이면 null)는
+나중에 추가된 항목이라 없을 수 있으며, 없으면 None으로 복원됩니다.
+
+이 모듈은 트레이 우선 시작 경로에서 import되므로 NumPy를 쓰는 모듈에 의존하지 않습니다.
+"""
+
+from collections import namedtuple
+from PySide6.QtCore import QRect
+
+from .cover_shape import shape_to_data, shape_from_data
+
+LAYOUT_VERSION = 1
+
+FLAG_LOCKED = 1
+FLAG_COMPOSITOR = 2
+FLAG_PIXELATE = 4
+
+# 레이아웃에서 복원할 가리개 하나의 정보
+CoverSpec = namedtuple("CoverSpec", ["rect", "locked", "compositor", "strength",
+                                     "pixelate", "block_size", "downscale", "shape"])
+
+
+def serialize_covers(entries):
+    """레지스트리의 CoverEntry 목록을 레이아웃 데이터로 변환합니다."""
+    covers = []
+    for entry in entries:
+        rect = entry.viewport.geometry()
+        flags = 0
+        if entry.viewport.is_locked:
+            flags |= FLAG_LOCKED
+        if entry.handler is None:
+            flags |= FLAG_COMPOSITOR
+        if entry.viewport.render_mode == "pixelate":
+            flags |= FLAG_PIXELATE
+        covers.append([rect.x(), rect.y(), rect.width(), rect.height(),
+                       flags, entry.viewport.blur_strength, entry.viewport.block_size,
+                       entry.viewport.downscale, shape_to_data(entry.viewport.shape)])
+    return {"v": LAYOUT_VERSION, "covers": covers}
+
+
+def parse_layout(data):
+    """레이아웃 데이터를 CoverSpec 목록으로 변환합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 버전이거나 형식이 잘못된 경우.
+    """
+    if not isinstance(data, dict) or data.get("v") != LAYOUT_VERSION:
+        raise ValueError(f"지원하지 않는 레이아웃 버전: {data.get('v') if isinstance(data, dict) else data!r}")
+
+    specs = []
+    for item in data.get("covers", ()):
+        if len(item) < 6:
+            raise ValueError(f"잘못된 가리개 항목: {item!r}")
+        x, y, width, height, flags, strength = item[:6]
+        block_size = item[6] if len(item) > 6 else None
+        downscale = item[7] if len(item) > 7 else None
+        shape = shape_from_data(item[8]) if len(item) > 8 else None
+        specs.append(CoverSpec(
+            rect=QRect(int(x), int(y), int(width), int(height)),
+            locked=bool(flags & FLAG_LOCKED),
+            compositor=bool(flags & FLAG_COMPOSITOR),
+            strength=int(strength),
+            pixelate=bool(flags & FLAG_PIXELATE),
+            block_size=int(block_size) if block_size is not None else None,
+            downscale=int(downscale) if downscale is not None else None,
+            shape=shape,
+        ))
+    return specs
@@ -2,16 +2,22 @@
 
 import os
 import sys
+import time
+from functools import partial
 from PySide6.QtWidgets import (QWidget, QPushButton, QVBoxLayout, QGroupBox,
-                               QCheckBox, QFormLayout, QApplication, QHBoxLayout, QLabel)
-from PySide6.QtCore import QRect, Qt
+                               QCheckBox, QFormLayout, QApplication, QHBoxLayout, QLabel,
+                               QInputDialog, QMessageBox)
+from PySide6.QtCore import QRect, Qt, QTimer
 from PySide6.QtGui import QCloseEvent, QIcon, QPalette
 
-from .viewport import Viewport
-from .selection_overlay import SelectionOverlay
 from .system_tray import SystemTrayIcon
-from .interaction_handler import InteractionHandler
 from .settings import SettingsManager
+from .cover_controller import CoverController
+from .layouts import serialize_covers, parse_layout
+from .instrumentation import metrics
+
+# Viewport, SelectionOverlay, InteractionHandler, 컴포지터, 블러 작업 풀/결과 캐시 모듈(및 NumPy)은
+# 트레이 우선 시작 시간을 줄이기 위해 처음 사용할 때 import 합니다.
 
 def resource_path(relative_path):
     """PyInstaller 환경에서 올바른 리소스 경로를 반환합니다.
@@ -27,11 +33,17 @@ def resource_path(relative_path):
 
 class MainWindow(QWidget):
     """메인 애플리케이션 창 클래스"""
-    def __init__(self):
-        """생성자: UI 초기화 및 시그널-슬롯 연결"""
+    def __init__(self, lazy_ui=False):
+        """생성자: UI 초기화 및 시그널-슬롯 연결
+
+        Args:
+            lazy_ui (bool): True이면 트레이 아이콘과 설정만 먼저 만들고,
+                            컨트롤러 레이아웃은 창을 처음 표시할 때 구성합니다.
+        """
         super().__init__()
 
         self._is_quitting = False
+        self._ui_built = False
 
         # 설정 관리자 초기화
         self.settings = SettingsManager()
@@ -43,15 +55,86 @@ class MainWindow(QWidget):
 
         self.setWindowTitle("Screen Blur")
 
-        self.selection_overlay = None
-        self.viewport = None
-        self.interaction_handler = None
+        # 가리개 생성/관리는 컨트롤러가 담당 (이 창은 컨트롤러의 UI일 뿐)
+        self.covers = CoverController(self.settings.get("cover_pool_size", 4),
+                                      self.settings.get("compositor_mode", False), self)
+        self.covers.quit_enabled = True
+        # 드래그 중 가장자리 맞춤 거리 (0이면 끔, 변경 즉시 적용)
+        self.covers.snap_distance = self.settings.get("snap_distance", self.covers.snap_distance)
+        self.settings.subscribe("snap_distance", lambda key, value: setattr(self.covers, "snap_distance", value))
+        # 가리개의 클릭/드래그 영역 (가리개 메뉴에서 바꾸면 설정에 저장)
+        try:
+            self.covers.set_input_mode(self.settings.get("input_mode", self.covers.input_mode))
+        except ValueError as e:
+            print(f"경고: {e}")
+        self.covers.input_mode_changed.connect(partial(self.settings.set, "input_mode"))
+        self.covers.quit_requested.connect(self.quit_application)
+        self.covers.cover_removed.connect(self._forget_auto_cover)
+        # 선택하는 동안 메인 창을 숨겨서 선택 영역에 집중하도록 하고, 끝나면 다시 표시
+        self.covers.selection_started.connect(self.hide)
+        self.covers.selection_finished.connect(self.show)
+        # 소프트웨어 블러 작업 스레드 수 (0이면 코어 수에 맞춤)와 블러 결과 캐시 용량 (MB, 0이면 끔)
+        # 변경은 즉시 적용하고, 시작할 때의 값은 트레이 표시 뒤(이벤트 루프 시작 후)에 적용
+        self.settings.subscribe("blur_workers", lambda key, value: self._set_blur_workers(value))
+        self.settings.subscribe("frame_cache_mb", lambda key, value: self._set_frame_cache_mb(value))
+        QTimer.singleShot(0, lambda: self._set_blur_workers(self.settings.get("blur_workers", 0)))
+        QTimer.singleShot(0, lambda: self._set_frame_cache_mb(self.settings.get("frame_cache_mb", 64)))
+        # 템플릿 자동 감지 (처음 사용할 때 생성)와 감지로 만든 가리개 (템플릿 이름 -> 가리개 ID 목록)
+        self._detector = None
+        self._auto_covers = {}
 
         # 트레이 아이콘에 메인 윈도우의 아이콘을 전달
         self.tray_icon = SystemTrayIcon(app_icon, self)
         self.tray_icon.show_window_requested.connect(self.show_from_tray)
+        self.tray_icon.hud_toggled.connect(self.set_hud_visible)
+        self.tray_icon.export_diagnostics_requested.connect(self.export_diagnostics)
+        self.tray_icon.detection_toggled.connect(self.set_detection_enabled)
+        self.tray_icon.template_capture_requested.connect(self.start_template_selection)
         self.tray_icon.show()
 
+        # --- 성능 계측 ---
+        self.hud = None  # 성능 HUD (처음 표시할 때 생성)
+        metrics.enabled = self.settings.get("instrumentation", False)
+        metrics.register_provider("covers", lambda: {"count": len(self.covers)})
+        metrics.register_provider("render", self.covers.render_stats)
+        metrics.register_provider("scheduler", self._scheduler_stats)
+        metrics.register_provider("cover_pool", self.cover_pool.stats)
+        metrics.register_provider("blur_pool", self._blur_pool_stats)
+        metrics.register_provider("frame_cache", self._frame_cache_stats)
+        metrics.register_provider("detector", lambda: self._detector.stats() if self._detector else {})
+
+        # 개별 창 모드이면 이벤트 루프가 시작된 뒤 가리개 창을 미리 만들어 둠
+        if not self.settings.get("compositor_mode", False):
+            self.cover_pool.warm_up(self.settings.get("cover_pool_warmup", 2))
+
+        # 자동 감지가 켜져 있으면 이벤트 루프가 시작된 뒤 켬 (NumPy import를 트레이 표시 뒤로 미룸)
+        if self._detector_config()["enabled"]:
+            QTimer.singleShot(0, partial(self.tray_icon.detect_action.setChecked, True))
+
+        if not lazy_ui:
+            self._build_ui()
+
+    @property
+    def viewports(self):
+        """현재 떠 있는 모든 가리개의 레지스트리"""
+        return self.covers.viewports
+
+    @property
+    def cover_pool(self):
+        return self.covers.cover_pool
+
+    def setVisible(self, visible):
+        """창을 처음 표시할 때 아직 구성하지 않은 레이아웃을 만듭니다."""
+        if visible:
+            self._build_ui()
+        super().setVisible(visible)
+
+    def _build_ui(self):
+        """컨트롤러 레이아웃과 스타일시트를 구성합니다 (한 번만 실행)."""
+        if self._ui_built:
+            return
+        self._ui_built = True
+
         # --- UI 구성 ---
         main_layout = QVBoxLayout(self)
         main_layout.setSpacing(10)
@@ -110,13 +193,25 @@ class MainWindow(QWidget):
         button_layout.addWidget(self.create_viewport_button)
         button_layout.addWidget(self.close_all_button)
 
+        # 레이아웃 버튼 (현재 가리개 배치 저장 / 불러오기)
+        layout_button_layout = QHBoxLayout()
+        layout_button_layout.setSpacing(10)
+        self.save_layout_button = QPushButton("레이아웃 저장")
+        self.load_layout_button = QPushButton("레이아웃 불러오기")
+        layout_button_layout.addWidget(self.save_layout_button)
+        layout_button_layout.addWidget(self.load_layout_button)
+
         # 체크박스 옵션들 (그룹 없이 심플하게)
         self.check_lock = QCheckBox("가리개 위치 고정")
-        self.check_lock.setChecked(False)
+        self.check_lock.setChecked(self.covers.lock_new_covers)
 
         self.check_minimize_to_tray = QCheckBox("닫기 시 트레이로 최소화")
         self.check_minimize_to_tray.setChecked(self.settings.get("minimize_to_tray", True))
 
+        self.check_compositor_mode = QCheckBox("단일 오버레이 모드 (가리개가 많을 때)")
+        self.check_compositor_mode.setToolTip("모든 가리개를 화면당 창 하나에 그립니다. 새로 만드는 가리개부터 적용됩니다.")
+        self.check_compositor_mode.setChecked(self.settings.get("compositor_mode", False))
+
         # 프로그램 종료 버튼 (주황색 배경, bold)
         self.quit_button = QPushButton("프로그램 종료")
         self.quit_button.setMinimumHeight(40)
@@ -141,17 +236,22 @@ class MainWindow(QWidget):
         # 레이아웃에 위젯 추가
         main_layout.addWidget(title_label)
         main_layout.addLayout(button_layout)
+        main_layout.addLayout(layout_button_layout)
         main_layout.addSpacing(10)
         main_layout.addWidget(self.check_lock)
         main_layout.addWidget(self.check_minimize_to_tray)
+        main_layout.addWidget(self.check_compositor_mode)
         main_layout.addStretch()
         main_layout.addWidget(self.quit_button)
 
         # --- 시그널-슬롯 연결 ---
         self.create_viewport_button.clicked.connect(self.start_viewport_selection)
         self.check_lock.toggled.connect(self.handle_lock_toggled)
-        self.close_all_button.clicked.connect(self.close_viewport)
+        self.close_all_button.clicked.connect(self.close_all_viewports)
+        self.save_layout_button.clicked.connect(self.prompt_save_layout)
+        self.load_layout_button.clicked.connect(self.prompt_load_layout)
         self.check_minimize_to_tray.toggled.connect(self.handle_minimize_to_tray_toggled)
+        self.check_compositor_mode.toggled.connect(self.handle_compositor_mode_toggled)
         self.quit_button.clicked.connect(self.quit_application)
 
         # --- UI 레이아웃 기반 최적 크기 자동 계산 및 고정 ---
@@ -168,78 +268,332 @@ class MainWindow(QWidget):
     def quit_application(self):
         """애플리케이션을 종료합니다."""
         self._is_quitting = True
-        self.close_viewport()
+        if self._detector is not None:
+            self._detector.shutdown()
+        self.covers.shutdown()
+        from .blur_workers import default_blur_pool
+        default_blur_pool().shutdown()
+        # 쓰기 지연 중인 설정을 종료 전에 저장
+        self.settings.flush()
         QApplication.instance().quit()
 
     def handle_lock_toggled(self, checked):
-        """고정 체크박스 상태 변경 핸들러."""
-        if self.viewport:
-            self.viewport.set_lock(checked)
+        """고정 체크박스 상태 변경 핸들러. 모든 가리개에 적용합니다."""
+        self.covers.set_lock_all(checked)
+
+    def set_lock_all(self, checked):
+        """모든 가리개(와 새로 만들 가리개)의 고정 상태를 설정합니다."""
+        if self._ui_built:
+            # 체크박스를 바꾸면 toggled 시그널을 통해 handle_lock_toggled가 호출됨
+            self.check_lock.setChecked(checked)
+        self.handle_lock_toggled(checked)
+
+    def handle_command(self, command):
+        """IPC 등으로 전달된 명령을 처리하고 응답을 반환합니다.
+
+        Args:
+            command (dict): {"cmd": 이름, ...인자} 형태의 명령.
+
+        Returns:
+            dict: {"ok": bool, ...} 형태의 응답.
+        """
+        name = command.get("cmd")
+        if name == "show":
+            self.show_from_tray()
+        elif name == "create":
+            x, y, width, height = (int(v) for v in command["rect"])
+            if self.covers.create_cover(QRect(x, y, width, height)) is None:
+                return {"ok": False, "error": "가리개를 만들 수 없는 영역입니다"}
+        elif name == "close_all":
+            self.close_all_viewports()
+        elif name == "lock":
+            self.set_lock_all(bool(command.get("locked", True)))
+        elif name == "detect":
+            self.set_detection_enabled(bool(command.get("enabled", True)))
+        elif name == "add_template":
+            try:
+                self.add_detection_template(str(command["name"]), str(command["path"]),
+                                            int(command.get("max_covers", 1)))
+            except ValueError as e:
+                return {"ok": False, "error": str(e)}
+        elif name == "diagnostics":
+            return {"ok": True, "diagnostics": metrics.snapshot()}
+        elif name == "save_layout":
+            self.save_layout(str(command["name"]))
+        elif name == "load_layout":
+            try:
+                self.load_layout(str(command["name"]), replace=bool(command.get("replace", True)))
+            except (KeyError, ValueError) as e:
+                return {"ok": False, "error": e.args[0] if e.args else str(e)}
+        else:
+            return {"ok": False, "error": f"알 수 없는 명령: {name}"}
+        return {"ok": True, "covers": len(self.covers)}
+
+    # --- 성능 계측 ---
+    def set_hud_visible(self, visible):
+        """성능 HUD를 표시하거나 숨깁니다. HUD가 떠 있는 동안은 계측이 켜집니다."""
+        if visible:
+            if self.hud is None:
+                from .hud import PerformanceHud
+                self.hud = PerformanceHud(lambda: len(self.covers))
+            self.hud.show()
+        elif self.hud is not None:
+            self.hud.hide()
+            metrics.enabled = self.settings.get("instrumentation", False)
+
+    def export_diagnostics(self):
+        """계측 기록과 진단 정보를 설정 폴더의 JSON 파일로 저장합니다."""
+        path = self.settings.settings_dir / f"diagnostics-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        try:
+            metrics.export_json(path)
+        except OSError as e:
+            print(f"성능 데이터 저장 실패: {e}")
+            return None
+        self.tray_icon.showMessage("성능 데이터 저장", str(path))
+        return path
+
+    # --- 템플릿 자동 감지 ---
+    def _detector_config(self):
+        """자동 감지 설정 (저장된 값이 없는 항목은 기본값)"""
+        config = {"enabled": False, "scan_interval_ms": 500, "threshold": 0.85, "templates": {}}
+        config.update(self.settings.get("detector", {}))
+        return config
+
+    def _update_detector_config(self, **changes):
+        config = self._detector_config()
+        config.update(changes)
+        self.settings.set("detector", config)
+
+    @property
+    def detector(self):
+        """템플릿 감지기 (처음 접근할 때 생성하고 저장된 템플릿을 불러옴)"""
+        if self._detector is None:
+            from .region_detector import RegionDetector, load_template_image
+
+            config = self._detector_config()
+            self._detector = RegionDetector(config["scan_interval_ms"], config["threshold"], self)
+            self._detector.regions_detected.connect(self.apply_detected_regions)
+            for name, template in config["templates"].items():
+                try:
+                    self._detector.add_template(name, load_template_image(template["path"]))
+                except ValueError as e:
+                    print(f"경고: {e}")
+        return self._detector
+
+    def set_detection_enabled(self, enabled):
+        """템플릿 자동 감지를 켜거나 끕니다 (설정에 저장)."""
+        if self.tray_icon.detect_action.isChecked() != enabled:
+            # 트레이 메뉴 체크 상태를 바꾸면 toggled 시그널로 다시 호출됨
+            self.tray_icon.detect_action.setChecked(enabled)
+            return
+        if enabled:
+            self.detector.start()
+        elif self._detector is not None:
+            self._detector.stop()
+        self._update_detector_config(enabled=enabled)
+
+    def start_template_selection(self):
+        """화면에서 영역을 골라 감지 템플릿으로 등록합니다."""
+        # 오버레이가 완전히 사라진 뒤에 캡처하도록 잠시 기다림
+        self.covers.select_region(
+            lambda rect: QTimer.singleShot(200, partial(self.capture_template, rect))
+        )
+
+    def capture_template(self, rect: QRect, name=None):
+        """화면 영역을 캡처해 PNG로 저장하고 감지 템플릿으로 등록합니다.
+
+        Returns:
+            str: 등록된 템플릿 이름 (취소하거나 실패하면 None).
+        """
+        from .screen_capture import grab_screen_region
+
+        image = grab_screen_region(rect)
+        if image is None:
+            print(f"경고: 템플릿 영역을 캡처할 수 없습니다 - {rect}")
+            return None
+
+        if name is None:
+            name, ok = QInputDialog.getText(self, "감지 템플릿 등록", "템플릿 이름:")
+            name = name.strip()
+            if not ok or not name:
+                return None
+
+        template_dir = self.settings.settings_dir / "templates"
+        template_dir.mkdir(parents=True, exist_ok=True)
+        path = template_dir / f"{name}.png"
+        if not image.save(str(path)):
+            print(f"경고: 템플릿을 저장할 수 없습니다 - {path}")
+            return None
+
+        try:
+            self.add_detection_template(name, str(path))
+        except ValueError as e:
+            print(f"경고: {e}")
+            return None
+        return name
+
+    def add_detection_template(self, name, path, max_covers=1):
+        """이미지 파일을 감지 템플릿으로 등록합니다.
+
+        Args:
+            name (str): 템플릿 이름.
+            path (str): 템플릿 이미지 경로.
+            max_covers (int): 이 템플릿으로 만들 최대 가리개 수. 가리개가 모두 쓰이고 있으면
+                              새로 찾은 위치로 가장 오래된 가리개를 옮깁니다.
+
+        Raises:
+            ValueError: 이미지를 읽을 수 없는 경우.
+        """
+        from .region_detector import load_template_image
+
+        self.detector.add_template(name, load_template_image(path))
+        templates = dict(self._detector_config()["templates"])
+        templates[name] = {"path": path, "max_covers": max(1, int(max_covers))}
+        self._update_detector_config(templates=templates)
+
+    def remove_detection_template(self, name):
+        """감지 템플릿을 삭제합니다. 이미 만든 가리개는 그대로 둡니다."""
+        if self._detector is not None:
+            self._detector.remove_template(name)
+        templates = dict(self._detector_config()["templates"])
+        if templates.pop(name, None) is not None:
+            self._update_detector_config(templates=templates)
+        self._auto_covers.pop(name, None)
+
+    def apply_detected_regions(self, regions):
+        """감지된 영역에 가리개를 만들거나 기존 자동 가리개를 옮깁니다.
+
+        가리개가 덮은 부분은 흐려져 다시 감지되지 않으므로, 감지된 영역은 항상
+        아직 가려지지 않은 곳입니다. 템플릿별 가리개 수가 한도에 이르면
+        가장 오래된 가리개를 새 위치로 옮깁니다 (창이 이동한 경우).
+        """
+        templates = self._detector_config()["templates"]
+        for region in regions:
+            template = templates.get(region.name)
+            if template is None or not self.covers.is_valid_cover_rect(region.rect):
+                continue
+
+            cover_ids = self._auto_covers.setdefault(region.name, [])
+            if any(self.covers.cover_info(cover_id).rect.intersects(region.rect)
+                   for cover_id in cover_ids):
+                continue
+
+            if len(cover_ids) < template.get("max_covers", 1):
+                cover_id = self.covers.create_cover(region.rect)
+            else:
+                cover_id = cover_ids.pop(0)
+                self.covers.update_cover(cover_id, rect=region.rect)
+            cover_ids.append(cover_id)
+
+    def _forget_auto_cover(self, cover_id):
+        """닫힌 가리개를 자동 가리개 목록에서 뺍니다."""
+        for cover_ids in self._auto_covers.values():
+            if cover_id in cover_ids:
+                cover_ids.remove(cover_id)
+
+    def _scheduler_stats(self):
+        from .refresh_scheduler import default_scheduler
+        return default_scheduler().stats()
+
+    def _blur_pool_stats(self):
+        from .blur_workers import default_blur_pool
+        return default_blur_pool().stats()
+
+    def _frame_cache_stats(self):
+        from .frame_cache import default_frame_cache
+        return default_frame_cache().stats()
+
+    def _set_blur_workers(self, count):
+        from .blur_workers import default_blur_pool
+        default_blur_pool().set_workers(count)
+
+    def _set_frame_cache_mb(self, megabytes):
+        from .frame_cache import default_frame_cache
+        default_frame_cache().set_max_bytes(megabytes * 1024 * 1024)
 
     def handle_minimize_to_tray_toggled(self, checked):
         """트레이 최소화 옵션 변경 핸들러 - 설정 저장."""
         self.settings.set("minimize_to_tray", checked)
 
+    def handle_compositor_mode_toggled(self, checked):
+        """단일 오버레이 모드 옵션 변경 핸들러 - 설정 저장 (새 가리개부터 적용)."""
+        self.settings.set("compositor_mode", checked)
+        self.covers.compositor_mode = checked
+
     def start_viewport_selection(self):
         """가리개 선택 모드를 시작합니다. 메인 창을 숨기고 오버레이를 표시합니다."""
-        # 메인 창을 숨겨서 선택 영역에 집중하도록 함
-        self.hide()
-
-        self.selection_overlay = SelectionOverlay()
-        self.selection_overlay.region_selected.connect(self.create_viewport)
-        # 선택 작업 완료 시 메인 GUI를 항상 다시 표시
-        self.selection_overlay.finished.connect(self.show)
-        self.selection_overlay.show()
+        self.covers.start_viewport_selection()
 
     def create_viewport(self, rect: QRect):
         """선택된 영역에 블러 가리개를 생성합니다."""
-        # 좌표 유효성 검증
-        if rect.width() <= 0 or rect.height() <= 0:
-            print(f"경고: 유효하지 않은 가리개 크기 - width: {rect.width()}, height: {rect.height()}")
+        self.covers.create_cover(rect)
+
+    # --- 레이아웃 ---
+    def layout_names(self):
+        """저장된 레이아웃 이름 목록을 반환합니다."""
+        return sorted(self.settings.get("layouts", {}))
+
+    def save_layout(self, name):
+        """현재 모든 가리개의 위치, 고정 상태, 블러 설정을 이름을 붙여 저장합니다."""
+        layouts = dict(self.settings.get("layouts", {}))
+        layouts[name] = serialize_covers(self.viewports)
+        self.settings.set("layouts", layouts)
+
+    def load_layout(self, name, replace=True):
+        """저장된 레이아웃의 가리개들을 한 번에 복원합니다.
+
+        모든 가리개를 숨긴 상태로 먼저 만들고 마지막에 한꺼번에 표시합니다.
+
+        Args:
+            name (str): 레이아웃 이름.
+            replace (bool): True이면 현재 가리개를 모두 닫고 복원합니다.
+
+        Returns:
+            int: 복원된 가리개 수.
+
+        Raises:
+            KeyError: 해당 이름의 레이아웃이 없는 경우.
+            ValueError: 레이아웃 형식이 잘못된 경우.
+        """
+        data = self.settings.get("layouts", {}).get(name)
+        if data is None:
+            raise KeyError(f"레이아웃이 없습니다: {name}")
+        specs = parse_layout(data)
+
+        if replace:
+            self.close_all_viewports()
+        return len(self.covers.create_covers(specs))
+
+    def prompt_save_layout(self):
+        """이름을 입력받아 현재 가리개 배치를 레이아웃으로 저장합니다."""
+        name, ok = QInputDialog.getText(self, "레이아웃 저장", "레이아웃 이름:")
+        name = name.strip()
+        if ok and name:
+            self.save_layout(name)
+
+    def prompt_load_layout(self):
+        """저장된 레이아웃 중 하나를 골라 복원합니다."""
+        names = self.layout_names()
+        if not names:
+            QMessageBox.information(self, "레이아웃 불러오기", "저장된 레이아웃이 없습니다.")
             return
-
-        # 극단적인 좌표 검증 (오류 방지)
-        if rect.x() < -10000 or rect.y() < -10000 or rect.x() > 10000 or rect.y() > 10000:
-            print(f"경고: 유효하지 않은 좌표 범위 - x: {rect.x()}, y: {rect.y()}")
+        name, ok = QInputDialog.getItem(self, "레이아웃 불러오기", "레이아웃:", names, 0, False)
+        if not ok:
             return
+        try:
+            self.load_layout(name)
+        except (KeyError, ValueError) as e:
+            QMessageBox.warning(self, "레이아웃 불러오기", f"레이아웃을 불러올 수 없습니다.\n{e}")
 
-        # 이전 가리개가 있다면 명시적으로 삭제
-        if self.viewport:
-            self.viewport.close()
-            self.viewport.deleteLater()
-            self.viewport = None
-        if self.interaction_handler:
-            self.interaction_handler.close()
-            self.interaction_handler.deleteLater()
-            self.interaction_handler = None
-
-        # 가리개 생성 (항상 위에 표시는 기본 활성화)
-        self.viewport = Viewport()
-        # InteractionHandler 생성 시 main_window 참조 전달
-        self.interaction_handler = InteractionHandler(self.viewport, self)
-
-        self.viewport.setGeometry(rect)
-        self.interaction_handler.setGeometry(rect)
-
-        # destroyed 시그널 대신 커스텀 closing 시그널 사용 (타이밍 이슈 방지)
-        self.viewport.closing.connect(self.interaction_handler.close)
-        self.viewport.closing.connect(self.on_viewport_closed)
-
-        # 현재 고정 상태를 가리개에 적용
-        self.viewport.set_lock(self.check_lock.isChecked())
-
-        self.viewport.show()
-        self.interaction_handler.show()
-
-    def close_viewport(self):
-        """현재 가리개를 닫습니다."""
-        if self.viewport:
-            self.viewport.close()
+    def delete_layout(self, name):
+        """저장된 레이아웃을 삭제합니다."""
+        layouts = dict(self.settings.get("layouts", {}))
+        if layouts.pop(name, None) is not None:
+            self.settings.set("layouts", layouts)
 
-    def on_viewport_closed(self):
-        """가리개가 닫혔을 때 호출되는 콜백."""
-        self.viewport = None
-        self.interaction_handler = None
+    def close_all_viewports(self):
+        """모든 가리개를 닫습니다."""
+        self.covers.close_all()
 
     def show_from_tray(self):
         """트레이 아이콘에서 메인 창을 표시합니다."""
@@ -250,17 +604,18 @@ class MainWindow(QWidget):
         """메인 창 닫기 이벤트 핸들러."""
         if self._is_quitting:
             # 프로그램 종료 시
-            self.close_viewport()
+            self.close_all_viewports()
             event.accept()
         else:
             # 일반 닫기 시
-            if self.check_minimize_to_tray.isChecked():
+            if self.settings.get("minimize_to_tray", True):
                 # 트레이로 최소화 옵션이 활성화되어 있으면 숨김
                 event.ignore()
                 self.hide()
             else:
                 # 옵션이 비활성화되어 있으면 완전히 종료
                 self._is_quitting = True
-                self.close_viewport()
+                self.close_all_viewports()
+                self.settings.flush()
                 event.accept()
                 QApplication.instance().quit()
\ No newline at end of file
@@ -0,0 +1,209 @@
+# refresh_scheduler.py
+
+"""
+소프트웨어 블러 가리개들의 갱신 시점을 한 곳에서 결정하는 스케줄러
+
+모든 가리개가 하나의 QTimer를 공유하며, 가리개마다 목표 FPS 등급(video/interactive/static)을
+가집니다. 내용이 바뀌지 않으면 갱신 간격을 지수적으로 늘리고(back-off), 최대 간격에서도
+계속 바뀌지 않으면 등급과 관계없이 wake() 전까지 완전히 쉽니다(park). 한 번의 타이머 틱에서
+사용할 수 있는 CPU 시간(frame budget)을 제한해 가리개가 많아도 전경 앱을 굶기지 않습니다.
+블러 계산은 작업 스레드에서 끝나므로, 가리개가 report_cost()로 알려 준 작업 스레드 CPU 시간도
+다음 틱의 예산에서 먼저 뺍니다. 예산은 video 등급의 한 프레임마다 쓸 수 있는 시간이므로,
+한 틱에서 쓴 시간에 비례해 다음 틱을 늦춰 전체 CPU 점유율도 같은 비율로 제한합니다.
+갱신할 가리개가 없으면 타이머를 완전히 멈춥니다.
+"""
+
+import time
+from PySide6.QtCore import QObject, QTimer, Qt
+
+
+class _Entry:
+    """스케줄러에 등록된 가리개 하나의 갱신 상태"""
+
+    __slots__ = ("target", "fps_class", "base_interval", "interval", "next_due", "parked", "idle_at_max", "last_cost",
+                 "worker_cost")
+
+    def __init__(self, target, fps_class, base_interval):
+        self.target = target
+        self.fps_class = fps_class
+        self.base_interval = base_interval  # 등급 기본 간격 (초)
+        self.interval = base_interval       # back-off가 반영된 현재 간격 (초)
+        self.next_due = 0.0                 # 다음 갱신 예정 시각 (monotonic)
+        self.parked = False                 # 완전히 잠든 상태 (wake() 전까지 갱신 안 함)
+        self.idle_at_max = 0                # 최대 간격에서 연속으로 내용이 바뀌지 않은 횟수
+        self.last_cost = 0.0                # 마지막 갱신에 걸린 시간 (GUI 스레드 + 작업 스레드, 초)
+        self.worker_cost = 0.0              # 마지막 블러 작업이 작업 스레드에서 쓴 CPU 시간 (초)
+
+
+class RefreshScheduler(QObject):
+    """가리개들의 refresh_blur() 호출 시점을 관리하는 중앙 스케줄러"""
+
+    # 등급별 목표 FPS
+    FPS_CLASSES = {
+        "video": 30,
+        "interactive": 15,
+        "static": 2,
+    }
+    # 같은 틱에서 여러 가리개가 대기 중일 때의 처리 순서
+    PRIORITY = {"video": 0, "interactive": 1, "static": 2}
+
+    # 내용이 바뀌지 않을 때 늘어나는 최대 간격 (초)
+    MAX_INTERVAL = 2.0
+    # 최대 간격에서 이 횟수만큼 연속으로 내용이 바뀌지 않으면 wake() 전까지 쉼
+    PARK_AFTER = 3
+
+    def __init__(self, frame_budget_ms=8.0, parent=None):
+        """
+        Args:
+            frame_budget_ms (float): video 등급 한 프레임 동안 갱신에 쓸 수 있는 최대 CPU 시간 (ms).
+                                     예산을 넘으면 남은 가리개는 다음 틱으로 미룹니다.
+        """
+        super().__init__(parent)
+        self.frame_budget = frame_budget_ms / 1000.0
+        self._entries = {}  # id(target) -> _Entry
+        self._background = 0.0  # 지난 틱 이후 작업 스레드에서 쓴 CPU 시간 (초)
+        self._resume_at = 0.0   # 쓴 CPU 시간만큼 쉬도록 다음 틱을 이 시각 전에는 실행하지 않음 (monotonic)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._run_due)
+
+        # --- 통계 ---
+        self.ticks = 0
+        self.refreshes = 0
+        self.deferred = 0  # 예산 초과로 다음 틱으로 미뤄진 횟수
+        self.background_time = 0.0  # 작업 스레드에서 쓴 블러 계산 시간 합계 (초)
+
+    # --- 등록/해제 ---
+    def register(self, target, fps_class="interactive"):
+        """가리개를 등록합니다. target은 refresh_blur() -> bool 메서드를 가져야 합니다."""
+        if fps_class not in self.FPS_CLASSES:
+            raise ValueError(f"알 수 없는 FPS 등급: {fps_class}")
+        entry = _Entry(target, fps_class, 1.0 / self.FPS_CLASSES[fps_class])
+        entry.next_due = time.monotonic()
+        self._entries[id(target)] = entry
+        self._reschedule()
+
+    def unregister(self, target):
+        """가리개 등록을 해제합니다."""
+        self._entries.pop(id(target), None)
+        self._reschedule()
+
+    def is_registered(self, target):
+        return id(target) in self._entries
+
+    def set_fps_class(self, target, fps_class):
+        """등록된 가리개의 FPS 등급을 변경합니다."""
+        entry = self._entries.get(id(target))
+        if entry is None:
+            return
+        if fps_class not in self.FPS_CLASSES:
+            raise ValueError(f"알 수 없는 FPS 등급: {fps_class}")
+        entry.fps_class = fps_class
+        entry.base_interval = 1.0 / self.FPS_CLASSES[fps_class]
+        self.wake(target)
+
+    def wake(self, target):
+        """back-off를 초기화하고 가능한 빨리 갱신하도록 예약합니다 (이동, 크기 변경 등)."""
+        entry = self._entries.get(id(target))
+        if entry is None:
+            return
+        entry.interval = entry.base_interval
+        entry.parked = False
+        entry.idle_at_max = 0
+        entry.next_due = time.monotonic()
+        self._reschedule()
+
+    def report_cost(self, target, seconds):
+        """가리개의 블러 작업이 작업 스레드에서 쓴 CPU 시간을 알립니다 (GUI 스레드에서 호출)."""
+        entry = self._entries.get(id(target))
+        if entry is not None:
+            entry.worker_cost = seconds
+        # 등록 해제된 가리개의 작업이라도 CPU는 이미 쓰였으므로 예산에 반영
+        self._background += seconds
+        self.background_time += seconds
+
+    # --- 스케줄링 ---
+    def _run_due(self):
+        """예정 시각이 지난 가리개들을 우선순위 순서로 예산 안에서 갱신합니다."""
+        self.ticks += 1
+        now = time.monotonic()
+
+        due = [e for e in self._entries.values() if not e.parked and e.next_due <= now]
+        due.sort(key=lambda e: (self.PRIORITY[e.fps_class], e.next_due))
+
+        # 지난 틱 이후 작업 스레드가 쓴 블러 계산 시간을 먼저 예산에서 뺌
+        background = self._background
+        self._background = 0.0
+        spent = background
+        for index, entry in enumerate(due):
+            # 작업 스레드가 예산을 쓰지 않았다면 최소 한 개는 갱신해야 예산보다 비싼 가리개도 굶지 않음
+            if (index > 0 or background > 0.0) and spent + entry.last_cost > self.frame_budget:
+                self.deferred += len(due) - index
+                break
+
+            started = time.perf_counter()
+            changed = entry.target.refresh_blur()
+            elapsed = time.perf_counter() - started
+            # 다음 틱의 예산 판단에는 이전 블러 작업의 작업 스레드 시간까지 포함
+            entry.last_cost = elapsed + entry.worker_cost
+            spent += elapsed
+            self.refreshes += 1
+
+            if id(entry.target) not in self._entries:
+                # 갱신 중 등록 해제된 경우 (가리개가 닫힘 등)
+                continue
+            self._apply_backoff(entry, changed)
+            entry.next_due = time.monotonic() + entry.interval
+
+        # 한 프레임에 frame_budget만 쓰도록, 쓴 시간에 비례해 쉼 (최대 간격보다 오래 쉬지는 않음)
+        frame = 1.0 / max(self.FPS_CLASSES.values())
+        self._resume_at = now + min(spent * frame / self.frame_budget, self.MAX_INTERVAL)
+        self._reschedule()
+
+    def _apply_backoff(self, entry, changed):
+        """내용 변경 여부에 따라 다음 갱신 간격을 조정합니다."""
+        if changed:
+            entry.interval = entry.base_interval
+            entry.idle_at_max = 0
+            return
+
+        if entry.interval >= self.MAX_INTERVAL:
+            # 최대 간격에서도 계속 그대로면 등급과 관계없이 wake() 전까지 완전히 쉼
+            entry.idle_at_max += 1
+            if entry.idle_at_max >= self.PARK_AFTER:
+                entry.parked = True
+            return
+        entry.interval = min(entry.interval * 2.0, self.MAX_INTERVAL)
+
+    def _reschedule(self):
+        """가장 빠른 예정 시각에 맞춰 타이머를 다시 설정합니다. 할 일이 없으면 멈춥니다."""
+        active = [e.next_due for e in self._entries.values() if not e.parked]
+        if not active:
+            self._timer.stop()
+            return
+        now = time.monotonic()
+        delay = max(0.0, min(active) - now, self._resume_at - now)
+        self._timer.start(int(delay * 1000))
+
+    def stats(self):
+        """스케줄러 통계를 반환합니다."""
+        return {
+            "registered": len(self._entries),
+            "parked": sum(1 for e in self._entries.values() if e.parked),
+            "ticks": self.ticks,
+            "refreshes": self.refreshes,
+            "deferred": self.deferred,
+            "background_ms": round(self.background_time * 1000.0, 1),
+        }
+
+
+_default_scheduler = None
+
+def default_scheduler():
+    """애플리케이션 전체가 공유하는 기본 스케줄러를 반환합니다 (최초 호출 시 생성)."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = RefreshScheduler()
+    return _default_scheduler
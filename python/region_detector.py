@@ -0,0 +1,195 @@
+# region_detector.py
+
+"""
+민감 영역 자동 감지
+
+주기적으로 화면을 캡처해 등록된 템플릿(채팅창, 토큰 입력란 등)의 위치를 찾습니다.
+
+- 화면 캡처는 GUI 스레드에서만 할 수 있으므로 캡처와 배열 복사만 GUI 스레드에서 수행
+- 명도 변환과 템플릿 매칭은 작업 스레드(QThread)에서 수행
+- 이전 검사가 끝나지 않았으면 이번 주기는 건너뛰므로 GUI 스레드가 기다리는 일이 없음
+"""
+
+import time
+from collections import namedtuple
+
+from PySide6.QtCore import QObject, QThread, QTimer, QRect, Signal, Slot
+from PySide6.QtGui import QGuiApplication, QImage
+
+from .soft_blur import qimage_to_array
+from .template_matcher import TemplateMatcher, to_gray
+
+# 감지된 영역 하나 (전역 논리 좌표)
+DetectedRegion = namedtuple("DetectedRegion", ["name", "rect", "score"])
+
+
+def load_template_image(path):
+    """템플릿 이미지 파일을 읽어 명도 배열로 반환합니다.
+
+    Raises:
+        ValueError: 파일을 읽을 수 없는 경우.
+    """
+    image = QImage(str(path))
+    if image.isNull():
+        raise ValueError(f"템플릿 이미지를 읽을 수 없습니다: {path}")
+    return to_gray(qimage_to_array(image))
+
+
+class _ScanWorker(QObject):
+    """작업 스레드에서 템플릿 매칭을 수행하는 객체"""
+
+    finished = Signal(object, float)  # DetectedRegion 목록, 검사 시간(ms)
+
+    def __init__(self, threshold):
+        super().__init__()
+        self.matcher = TemplateMatcher(threshold=threshold)
+
+    @Slot(object)
+    def set_templates(self, templates):
+        """(이름, 명도 배열) 목록으로 템플릿을 모두 바꿉니다."""
+        self.matcher.templates = []
+        for name, gray in templates:
+            self.matcher.add_template(name, gray)
+
+    @Slot(float)
+    def set_threshold(self, threshold):
+        self.matcher.threshold = threshold
+
+    @Slot(object)
+    def scan(self, frames):
+        """화면별 캡처에서 템플릿을 찾습니다.
+
+        Args:
+            frames (list): (화면 왼쪽 위 QPoint, devicePixelRatio, BGRA 배열) 목록.
+        """
+        started = time.perf_counter()
+        regions = []
+        for origin, ratio, pixels in frames:
+            for match in self.matcher.match(to_gray(pixels)):
+                # 캡처는 물리 픽셀 단위이므로 전역 논리 좌표로 변환
+                rect = QRect(
+                    origin.x() + round(match.x / ratio),
+                    origin.y() + round(match.y / ratio),
+                    max(1, round(match.width / ratio)),
+                    max(1, round(match.height / ratio)),
+                )
+                regions.append(DetectedRegion(match.name, rect, match.score))
+        self.finished.emit(regions, (time.perf_counter() - started) * 1000.0)
+
+
+class RegionDetector(QObject):
+    """주기적으로 화면을 캡처해 템플릿 위치를 찾아 알려주는 클래스"""
+
+    # 검사 한 번이 끝날 때마다 찾은 영역 목록(DetectedRegion)을 전달
+    regions_detected = Signal(object)
+
+    # 작업 스레드로 보내는 요청 (QueuedConnection으로 전달됨)
+    _scan_requested = Signal(object)
+    _templates_changed = Signal(object)
+    _threshold_changed = Signal(float)
+
+    def __init__(self, scan_interval_ms=500, threshold=0.85, parent=None):
+        """
+        Args:
+            scan_interval_ms (int): 검사 주기 (밀리초).
+            threshold (float): 일치로 판단할 최소 NCC 점수.
+        """
+        super().__init__(parent)
+        self._templates = {}  # 이름 -> 명도 배열
+        self._busy = False
+
+        self._thread = QThread(self)
+        self._worker = _ScanWorker(threshold)
+        self._worker.moveToThread(self._thread)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._scan_requested.connect(self._worker.scan)
+        self._templates_changed.connect(self._worker.set_templates)
+        self._threshold_changed.connect(self._worker.set_threshold)
+        self._worker.finished.connect(self._on_scan_finished)
+        self._thread.start()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(50, int(scan_interval_ms)))
+        self._timer.timeout.connect(self._capture)
+
+        # --- 통계 ---
+        self.scans = 0          # 완료된 검사 수
+        self.skipped = 0        # 이전 검사가 끝나지 않아 건너뛴 주기 수
+        self.last_scan_ms = 0.0  # 마지막 검사의 작업 스레드 소요 시간
+        self.last_capture_ms = 0.0  # 마지막 캡처의 GUI 스레드 소요 시간
+
+    # --- 설정 ---
+    def add_template(self, name, gray):
+        """템플릿(명도 배열)을 추가합니다. 같은 이름이 있으면 바꿉니다."""
+        self._templates[name] = gray
+        self._templates_changed.emit(list(self._templates.items()))
+
+    def remove_template(self, name):
+        if self._templates.pop(name, None) is not None:
+            self._templates_changed.emit(list(self._templates.items()))
+
+    def template_names(self):
+        return list(self._templates)
+
+    def set_threshold(self, threshold):
+        self._threshold_changed.emit(float(threshold))
+
+    def set_scan_interval(self, interval_ms):
+        self._timer.setInterval(max(50, int(interval_ms)))
+
+    # --- 실행 ---
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def shutdown(self):
+        """검사를 멈추고 작업 스레드를 종료합니다 (진행 중인 검사는 끝까지 기다림)."""
+        self._timer.stop()
+        self._thread.quit()
+        self._thread.wait()
+
+    def _capture(self):
+        """GUI 스레드: 모든 화면을 캡처해 작업 스레드로 보냅니다."""
+        if self._busy:
+            self.skipped += 1
+            return
+        if not self._templates:
+            return
+
+        started = time.perf_counter()
+        frames = []
+        for screen in QGuiApplication.screens():
+            pixmap = screen.grabWindow(0)
+            if pixmap.isNull():
+                continue
+            frames.append((screen.geometry().topLeft(), pixmap.devicePixelRatio(),
+                           qimage_to_array(pixmap.toImage())))
+        self.last_capture_ms = (time.perf_counter() - started) * 1000.0
+
+        if frames:
+            self._busy = True
+            self._scan_requested.emit(frames)
+
+    def _on_scan_finished(self, regions, elapsed_ms):
+        """GUI 스레드: 작업 스레드의 검사 결과를 받습니다."""
+        self._busy = False
+        self.scans += 1
+        self.last_scan_ms = elapsed_ms
+        if self._timer.isActive():
+            self.regions_detected.emit(regions)
+
+    def stats(self):
+        return {
+            "running": self.is_running(),
+            "templates": len(self._templates),
+            "scan_interval_ms": self._timer.interval(),
+            "scans": self.scans,
+            "skipped": self.skipped,
+            "last_scan_ms": self.last_scan_ms,
+            "last_capture_ms": self.last_capture_ms,
+        }
@@ -0,0 +1,152 @@
+# screen_capture.py
+
+"""
+가리개 아래 화면 캡처
+
+소프트웨어 블러는 가리개 뒤의 화면을 캡처해 흐리게 그립니다. 가리개 자신이 캡처에
+포함되면 이미 흐려진 결과를 다시 흐리게 만드는 피드백이 생기지만, 이를 피하려고
+가리개를 화면 캡처에서 제외하면 화상 회의/방송 프로그램에서도 가리개가 사라져 가린 내용이
+그대로 송출되고, 캡처하는 순간 가리개를 투명하게 하면 가린 내용이 화면에 잠깐 비칩니다.
+
+그래서 가리개는 항상 보이는 채로 두고 다음 방법으로 "가리개 아래"만 얻습니다.
+
+- Windows: 계층(layered) 창을 뺀 화면을 GDI로 캡처합니다 (utils.grab_screen_below_layered).
+  가리개 창과 오버레이 창은 반투명 배경의 계층 창이므로 캡처에 포함되지 않습니다.
+- 그 밖의 플랫폼: 가리개 아래를 직접 얻을 수 없으므로, 가리개가 나타나기 직전과
+  옮겨지기 직전에만 화면을 캡처하고, 그때 가리개가 덮고 있는 부분은 마지막으로 알던 원본으로
+  채웁니다. 가리개가 제자리에 있는 동안에는 처음 가린 순간의 내용을 계속 보여 줍니다.
+"""
+
+import sys
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+
+from .utils import is_layered_window, window_origin, grab_screen_below_layered
+
+
+def grab_screen_region(rect):
+    """전역 좌표 사각형 영역의 화면을 캡처해 QImage로 반환합니다 (실패 시 None)."""
+    screen = QGuiApplication.screenAt(rect.center())
+    if screen is None:
+        return None
+
+    origin = screen.geometry().topLeft()
+    pixmap = screen.grabWindow(
+        0,
+        rect.x() - origin.x(),
+        rect.y() - origin.y(),
+        rect.width(),
+        rect.height()
+    )
+    if pixmap.isNull():
+        return None
+    return pixmap.toImage()
+
+
+def grab_below_window(window, rect):
+    """계층 창인 window를 포함한 모든 계층 창을 뺀 rect(전역 논리 좌표) 영역을 캡처합니다.
+
+    Windows에서 window가 계층 창일 때만 가능하며, 그렇지 않으면 None을 반환합니다.
+    """
+    if sys.platform != 'win32':
+        return None
+    hwnd = int(window.winId())
+    if not is_layered_window(hwnd):
+        return None
+    origin = window_origin(hwnd)
+    if origin is None:
+        return None
+
+    # 창 왼쪽 위의 물리 좌표를 기준으로 논리 좌표 차이만 배율을 곱해 옮김
+    # (배율이 다른 모니터가 섞여 있어도 창이 있는 모니터의 배율만 쓰면 됨)
+    ratio = window.devicePixelRatioF()
+    offset = rect.topLeft() - window.geometry().topLeft()
+    width = max(1, round(rect.width() * ratio))
+    height = max(1, round(rect.height() * ratio))
+    data = grab_screen_below_layered(origin[0] + round(offset.x() * ratio),
+                                     origin[1] + round(offset.y() * ratio), width, height)
+    if data is None:
+        return None
+    image = QImage(data, width, height, width * 4, QImage.Format_RGB32).copy()
+    image.setDevicePixelRatio(ratio)
+    return image
+
+
+class BelowCapture:
+    """가리개 하나가 자신을 빼고 아래 화면을 캡처하는 도구
+
+    가리개를 그리는 창(window)은 캡처하는 동안에도 숨기거나 투명하게 만들지 않습니다.
+    """
+
+    def __init__(self, window):
+        """
+        Args:
+            window (QWidget): 가리개를 그리는 최상위 창 (Viewport 또는 CompositorOverlay).
+        """
+        self.window = window
+        self._source = None       # 직접 캡처할 수 없을 때 마지막으로 알던 원본 (QImage)
+        self._source_rect = None  # _source가 담은 전역 논리 영역
+
+    def capture(self, rect):
+        """가리개가 덮고 있는 rect(전역 논리 좌표) 아래의 화면을 반환합니다 (실패 시 None)."""
+        image = grab_below_window(self.window, rect)
+        if image is not None:
+            return image
+        if self._source is None:
+            return None
+        if self._source_rect != rect:
+            # 옮기기 전에 알리지 않은 경로로 바뀐 경우: 알던 부분만 옮겨 담음
+            self._source = self._compose(rect)
+            self._source_rect = QRect(rect)
+        return self._source
+
+    def before_show(self, rect):
+        """가리개가 rect에 나타나기 직전에 호출합니다. 아직 가리개가 없으므로 그대로 캡처합니다."""
+        if self._direct():
+            return
+        self._source = grab_screen_region(rect)
+        self._source_rect = QRect(rect) if self._source is not None else None
+
+    def before_move(self, rect):
+        """가리개가 rect로 옮겨지거나 크기가 바뀌기 직전에 호출합니다.
+
+        새 영역 중 지금 가리개가 덮고 있지 않은 부분은 화면에서, 덮고 있는 부분은
+        이전 원본에서 가져옵니다.
+        """
+        if self._source is None or self._direct():
+            return
+        self._source = self._compose(rect, grab_screen_region(rect))
+        self._source_rect = QRect(rect)
+
+    def reset(self):
+        """가리개가 숨겨지면 원본을 버립니다 (다시 나타날 때 before_show에서 새로 캡처)."""
+        self._source = None
+        self._source_rect = None
+
+    def _direct(self):
+        """가리개 아래를 직접 캡처할 수 있는 환경인지 여부"""
+        return sys.platform == 'win32' and is_layered_window(int(self.window.winId()))
+
+    def _compose(self, rect, image=None):
+        """rect 영역의 원본을 만듭니다: image 위에 이전 원본과 겹치는 부분을 덮어씀.
+
+        image가 없으면 이전 원본과 겹치지 않는 부분은 검게 채웁니다.
+        """
+        ratio = self._source.devicePixelRatio()
+        if image is None or image.isNull():
+            image = QImage(max(1, round(rect.width() * ratio)), max(1, round(rect.height() * ratio)),
+                           QImage.Format_RGB32)
+            image.setDevicePixelRatio(ratio)
+            image.fill(0)
+        else:
+            image = image.convertToFormat(QImage.Format_RGB32)
+
+        overlap = rect.intersected(self._source_rect)
+        if not overlap.isEmpty():
+            # 이전 원본의 물리 픽셀 영역을 새 이미지의 논리 좌표에 그림 (배율이 달라도 맞춰 늘림)
+            source_rect = QRect((overlap.topLeft() - self._source_rect.topLeft()) * ratio,
+                                overlap.size() * ratio)
+            painter = QPainter(image)
+            painter.drawImage(overlap.translated(-rect.topLeft()), self._source, source_rect)
+            painter.end()
+        return image
@@ -1,27 +1,53 @@
 # selection_overlay.py
 
 from PySide6.QtWidgets import QWidget, QApplication
-from PySide6.QtCore import Qt, QRect, Signal, QTimer
-from PySide6.QtGui import QPainter, QBrush, QColor, QPen
+from PySide6.QtCore import Qt, QObject, QRect, Signal, QTimer
+from PySide6.QtGui import (QPainter, QColor, QPen, QPixmap, QRegion, QGuiApplication, QCursor,
+                           QPainterPath, QPolygonF)
+
+from .instrumentation import timed
+from .cover_shape import (make_shape, shape_path, SHAPE_RECT, SHAPE_ELLIPSE, SHAPE_ROUNDED,
+                          SHAPE_POLYGON)
+
+# 선택 중 숫자 키로 고르는 모양
+SHAPE_KEYS = {
+    Qt.Key_1: SHAPE_RECT,
+    Qt.Key_2: SHAPE_ELLIPSE,
+    Qt.Key_3: SHAPE_ROUNDED,
+    Qt.Key_4: SHAPE_POLYGON,
+}
+
+# 자유 다각형에서 꼭짓점을 추가할 최소 마우스 이동 거리 (논리 픽셀)
+POLYGON_MIN_STEP = 6
 
 class SelectionOverlay(QWidget):
-    """화면 전체를 덮어 사용자로부터 특정 영역을 선택받기 위한 투명 오버레이 위젯"""
+    """모니터 하나를 덮어 사용자로부터 특정 영역을 선택받기 위한 투명 오버레이 위젯
 
-    # 시그널 정의: 사용자가 영역 선택을 완료했을 때 선택된 영역(QRect) 정보를 전달
-    region_selected = Signal(QRect)
+    여러 모니터에서 선택하려면 SelectionOverlayManager가 화면마다 하나씩 만들어 사용합니다.
+    """
+
+    # 시그널 정의: 사용자가 영역 선택을 완료했을 때 선택된 영역(QRect)과
+    # 그 안에 맞춘 모양(cover_shape.CoverShape, 사각형이면 None)을 전달
+    region_selected = Signal(QRect, object)
+    # 시그널 정의: 선택 중 숫자 키로 다른 모양을 골랐을 때
+    shape_kind_requested = Signal(str)
     # 시그널 정의: 선택 작업이 완료되었을 때 (성공/취소 모두 포함)
     finished = Signal()
 
-    def __init__(self):
-        """생성자: 오버레이 창의 기본 속성을 설정합니다."""
+    # 화면 전체를 덮는 반투명 검은색 (약 47% 투명도)
+    OVERLAY_COLOR = QColor(0, 0, 0, 120)
+    # 선택 영역 테두리 두께 (다시 그릴 영역 계산에도 사용)
+    BORDER_WIDTH = 1
+
+    def __init__(self, screen=None):
+        """생성자: 오버레이 창의 기본 속성을 설정합니다.
+
+        Args:
+            screen (QScreen, optional): 덮을 모니터. 생략하면 메인 모니터.
+        """
         super().__init__()
+        self._screen = screen or QApplication.instance().primaryScreen()
 
-        # --- 창 설정 ---
-        # 메인 모니터 영역만 덮도록 설정 (멀티 모니터 환경에서 가리개 생성 제한)
-        # geometry()는 메인 모니터만, virtualGeometry()는 모든 모니터 포함
-        screen_geometry = QApplication.instance().primaryScreen().geometry()
-        self.setGeometry(screen_geometry)
-        
         # 창의 테두리를 없애고, 항상 다른 창들 위에 표시되도록 설정
         # 배경을 투명하게 만들어 아래의 화면이 보이도록 함
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
@@ -36,63 +62,270 @@ class SelectionOverlay(QWidget):
         # --- 선택 영역 좌표 초기화 ---
         self.start_point = None  # 마우스 드래그 시작점
         self.end_point = None    # 마우스 드래그 끝점
+        self.shape_kind = SHAPE_RECT  # 선택할 모양 (cover_shape.SHAPES)
+        self._points = []        # 자유 다각형 꼭짓점 (창 좌표)
+
+        # 반투명 배경 레이어 캐시 (크기/DPI가 바뀔 때만 다시 생성)
+        self._overlay_layer = None
+        self._overlay_layer_key = None  # (크기, devicePixelRatio)
+
+        self.fit_to_screen()
+
+    @property
+    def target_screen(self):
+        """이 오버레이가 덮는 모니터"""
+        return self._screen
+
+    def fit_to_screen(self):
+        """모니터의 현재 geometry(전역 논리 좌표)에 맞게 창을 배치합니다."""
+        self.setScreen(self._screen)
+        self.setGeometry(self._screen.geometry())
+
+    def reset_selection(self):
+        """이전 선택 영역을 지웁니다 (캐시된 오버레이를 다시 표시하기 전)."""
+        self._invalidate_selection(self._selection_rect(), None)
+        self.start_point = None
+        self.end_point = None
+        self._points = []
 
+    def set_shape_kind(self, kind):
+        """선택할 모양을 바꿉니다. 진행 중인 선택은 새 모양으로 다시 그립니다."""
+        if kind == self.shape_kind:
+            return
+        rect = self._selection_rect()
+        self.shape_kind = kind
+        if kind != SHAPE_POLYGON:
+            self._points = []
+        self._invalidate_selection(rect, self._selection_rect())
+
+    def _selection_rect(self):
+        """현재 선택 영역을 정규화된 QRect로 반환합니다 (드래그 중이 아니면 None).
+
+        드래그가 모니터 밖으로 나가도 선택은 이 모니터 안으로 제한됩니다.
+        """
+        if self.shape_kind == SHAPE_POLYGON and self.start_point:
+            # 자유 다각형은 꼭짓점들을 감싸는 사각형
+            return QPolygonF(self._points).boundingRect().toAlignedRect().intersected(self.rect())
+        if self.start_point and self.end_point:
+            # 시작점과 끝점으로 사각형(QRect)을 정의하고, 음수 크기를 갖지 않도록 정규화
+            return QRect(self.start_point, self.end_point).normalized().intersected(self.rect())
+        return None
+
+    def _selection_shape(self, rect):
+        """선택 사각형 rect 안에 맞춘 모양을 반환합니다 (사각형이면 None).
+
+        Raises:
+            ValueError: 꼭짓점이 3개 미만인 다각형인 경우.
+        """
+        if self.shape_kind != SHAPE_POLYGON:
+            return make_shape(self.shape_kind)
+        width, height = max(1, rect.width()), max(1, rect.height())
+        return make_shape(SHAPE_POLYGON, [
+            (min(1.0, max(0.0, (p.x() - rect.x()) / width)),
+             min(1.0, max(0.0, (p.y() - rect.y()) / height)))
+            for p in self._points
+        ])
+
+    def _selection_path(self, rect):
+        """그리기용 선택 모양 경로 (창 좌표)"""
+        path = QPainterPath()
+        if self.shape_kind == SHAPE_POLYGON:
+            path.addPolygon(QPolygonF(self._points))
+            path.closeSubpath()
+        elif self.shape_kind == SHAPE_RECT:
+            path.addRect(rect)
+        else:
+            path = shape_path(make_shape(self.shape_kind), rect.width(), rect.height()) \
+                .translated(rect.x(), rect.y())
+        return path
+
+    def _invalidate_selection(self, old_rect, new_rect):
+        """이전/새 선택 영역의 합집합(테두리 두께만큼 확장)만 다시 그리도록 예약합니다."""
+        margin = self.BORDER_WIDTH + 1
+        region = QRegion()
+        for rect in (old_rect, new_rect):
+            if rect is not None:
+                region = region.united(rect.adjusted(-margin, -margin, margin, margin))
+        if not region.isEmpty():
+            self.update(region)
+
+    def _ensure_overlay_layer(self):
+        """반투명 배경을 미리 칠해 둔 픽스맵을 반환합니다."""
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio)
+        if self._overlay_layer is None or self._overlay_layer_key != key:
+            layer = QPixmap(self.size() * ratio)
+            layer.setDevicePixelRatio(ratio)
+            layer.fill(self.OVERLAY_COLOR)
+            self._overlay_layer = layer
+            self._overlay_layer_key = key
+        return self._overlay_layer
+
+    @timed("selection.paint")
     def paintEvent(self, event):
-        """위젯이 다시 그려져야 할 때 호출되는 이벤트 핸들러. 선택 영역을 시각적으로 표시합니다."""
+        """위젯이 다시 그려져야 할 때 호출되는 이벤트 핸들러. 선택 영역을 시각적으로 표시합니다.
+
+        드래그 중에는 바뀐 영역만 다시 그리도록 예약되므로, 배경도 그 영역만 복사합니다.
+        """
         painter = QPainter(self)
-        
-        # 1. 반투명 검은색 배경 그리기
+
+        # 1. 반투명 검은색 배경 그리기 (다시 그릴 영역만)
         # 화면 전체를 어둡게 하여 사용자가 선택 영역에 집중하도록 돕는다.
-        overlay_color = QColor(0, 0, 0, 120) # 검은색, 약 47% 투명도
-        painter.fillRect(self.rect(), QBrush(overlay_color))
-        
+        # 캐시된 레이어를 Source 모드로 복사해 이전에 지운 영역도 함께 덮어씀
+        layer = self._ensure_overlay_layer()
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        for rect in event.region():
+            painter.drawPixmap(rect, layer, rect)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
         # 2. 선택 영역 그리기 (드래그 중일 때)
-        if self.start_point and self.end_point:
-            # 시작점과 끝점으로 사각형(QRect)을 정의하고, 음수 크기를 갖지 않도록 정규화
-            selection_rect = QRect(self.start_point, self.end_point).normalized()
-            
+        selection_rect = self._selection_rect()
+        if selection_rect is not None:
             # 선택된 영역을 투명하게 만들어 원래 화면이 보이도록 함
             # CompositionMode_Clear: 해당 영역의 모든 픽셀을 지움
+            path = self._selection_path(selection_rect)
             painter.setCompositionMode(QPainter.CompositionMode_Clear)
-            painter.fillRect(selection_rect, Qt.transparent)
+            painter.fillPath(path, Qt.transparent)
             
             # 이후의 그리기를 위해 기본 모드로 복원
             painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
             
             # 선택 영역의 테두리를 점선으로 그려 경계를 명확히 함
-            pen = QPen(Qt.white, 1, Qt.DashLine)
+            pen = QPen(Qt.white, self.BORDER_WIDTH, Qt.DashLine)
             painter.setPen(pen)
-            painter.drawRect(selection_rect)
+            painter.drawPath(path)
 
+    @timed("selection.mouse_press")
     def mousePressEvent(self, event):
         """마우스 버튼을 눌렀을 때 호출됩니다. 드래그 시작점을 기록합니다."""
+        old_rect = self._selection_rect()
         self.start_point = event.position().toPoint()
         self.end_point = self.start_point # 초기에는 시작점과 끝점을 동일하게 설정
-        self.update() # paintEvent()를 다시 호출하여 화면을 갱신
+        self._points = [self.start_point]
+        self._invalidate_selection(old_rect, self._selection_rect()) # 바뀐 영역만 갱신
 
+    @timed("selection.mouse_move")
     def mouseMoveEvent(self, event):
         """마우스를 누른 채로 움직일 때 호출됩니다. 드래그 끝점을 갱신합니다."""
         if self.start_point: # 마우스가 눌린 상태일 때만
+            old_rect = self._selection_rect()
             self.end_point = event.position().toPoint()
-            self.update() # 화면 갱신
+            if (self.shape_kind == SHAPE_POLYGON
+                    and (self.end_point - self._points[-1]).manhattanLength() >= POLYGON_MIN_STEP):
+                self._points.append(self.end_point)
+            # 전체 화면 대신 이전/새 선택 영역의 합집합만 다시 그림
+            self._invalidate_selection(old_rect, self._selection_rect())
 
+    @timed("selection.mouse_release")
     def mouseReleaseEvent(self, event):
         """마우스 버튼에서 손을 뗐을 때 호출됩니다. 선택 완료 신호를 보냅니다."""
-        if self.start_point and self.end_point:
-            selection_rect = QRect(self.start_point, self.end_point).normalized()
+        selection_rect = self._selection_rect()
 
-            # 너비와 높이가 0보다 큰 유효한 영역이 선택되었는지 확인
-            if selection_rect.width() > 0 and selection_rect.height() > 0:
-                # 위젯 로컬 좌표를 전역 화면 좌표로 변환
-                global_top_left = self.mapToGlobal(selection_rect.topLeft())
-                global_rect = QRect(global_top_left, selection_rect.size())
+        # 너비와 높이가 0보다 큰 유효한 영역이 선택되었는지 확인
+        if selection_rect is not None and selection_rect.width() > 0 and selection_rect.height() > 0:
+            # 오버레이는 모니터 geometry와 정확히 겹치므로 모니터 왼쪽 위만 더하면 전역 논리 좌표가 됨
+            # (배율이 다른 모니터가 섞여 있을 때 mapToGlobal보다 정확함)
+            global_rect = selection_rect.translated(self._screen.geometry().topLeft())
 
+            try:
+                shape = self._selection_shape(selection_rect)
+            except ValueError as e:
+                print(f"경고: {e}")
+            else:
                 # region_selected 시그널에 선택된 영역 정보를 담아 보냄
-                self.region_selected.emit(global_rect)
+                self.region_selected.emit(global_rect, shape)
 
         # 선택 작업 완료 시그널 발생 (성공/취소 모두)
         self.finished.emit()
 
-        # close()를 이벤트 큐에 예약하여 모든 시그널 핸들러가 완료된 후 실행
-        # 이렇게 하면 시그널 처리 중 객체가 삭제되는 것을 방지
-        QTimer.singleShot(0, self.close)
+    def keyPressEvent(self, event):
+        """Esc를 누르면 선택을 취소하고, 숫자 키 1~4로 모양(사각형/타원/둥근 사각형/자유 다각형)을 고릅니다."""
+        if event.key() == Qt.Key_Escape:
+            self.finished.emit()
+        elif event.key() in SHAPE_KEYS:
+            self.shape_kind_requested.emit(SHAPE_KEYS[event.key()])
+        else:
+            super().keyPressEvent(event)
+
+
+class SelectionOverlayManager(QObject):
+    """모니터마다 SelectionOverlay를 하나씩 두고 한 번의 영역 선택을 진행하는 클래스
+
+    오버레이는 처음 필요할 때 만들고, 선택이 끝나면 닫지 않고 숨겨 두었다가 다음 선택에 재사용합니다.
+    """
+
+    # 선택된 영역 (전역 논리 좌표). 모양은 selected_shape에 남음
+    region_selected = Signal(QRect)
+    # 선택 작업 완료 (성공/취소 모두)
+    finished = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._overlays = {}  # QScreen -> SelectionOverlay
+        self._active = False
+        self.shape_kind = SHAPE_RECT  # 모든 오버레이가 함께 쓰는 선택 모양
+        self.selected_shape = None    # 마지막으로 선택된 모양 (사각형이면 None)
+        QGuiApplication.instance().screenRemoved.connect(self._screen_removed)
+
+    def overlay_for(self, screen):
+        """모니터의 오버레이를 반환합니다 (없으면 생성)."""
+        overlay = self._overlays.get(screen)
+        if overlay is None:
+            overlay = SelectionOverlay(screen)
+            overlay.set_shape_kind(self.shape_kind)
+            overlay.region_selected.connect(self._region_selected)
+            overlay.shape_kind_requested.connect(self.set_shape_kind)
+            overlay.finished.connect(self._finish)
+            self._overlays[screen] = overlay
+        return overlay
+
+    def is_active(self):
+        return self._active
+
+    def start(self):
+        """모든 모니터에 오버레이를 표시하고 선택을 시작합니다."""
+        self._active = True
+        for screen in QGuiApplication.screens():
+            overlay = self.overlay_for(screen)
+            overlay.reset_selection()
+            overlay.fit_to_screen()
+            overlay.show()
+
+        # Esc 키를 받을 수 있도록 마우스가 있는 모니터의 오버레이를 활성화
+        screen = QGuiApplication.screenAt(QCursor.pos())
+        if screen in self._overlays:
+            self._overlays[screen].activateWindow()
+
+    def cancel(self):
+        """진행 중인 선택을 취소합니다."""
+        self._finish()
+
+    def set_shape_kind(self, kind):
+        """모든 모니터의 오버레이에서 선택할 모양을 바꿉니다."""
+        self.shape_kind = kind
+        for overlay in self._overlays.values():
+            overlay.set_shape_kind(kind)
+
+    def _region_selected(self, rect, shape):
+        if self._active:
+            self.selected_shape = shape
+            self.region_selected.emit(rect)
+
+    def _finish(self):
+        if not self._active:
+            return
+        self._active = False
+        self.finished.emit()
+        # 모든 시그널 핸들러가 끝난 뒤 숨기도록 이벤트 큐에 예약
+        QTimer.singleShot(0, self._hide_all)
+
+    def _hide_all(self):
+        for overlay in self._overlays.values():
+            overlay.hide()
+
+    def _screen_removed(self, screen):
+        """연결이 끊긴 모니터의 오버레이를 정리합니다."""
+        overlay = self._overlays.pop(screen, None)
+        if overlay is not None:
+            overlay.hide()
+            overlay.deleteLater()
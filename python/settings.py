@@ -1,14 +1,39 @@
 # settings.py
 
 import os
+import copy
 import json
+import tempfile
+import threading
+from collections import defaultdict
 from pathlib import Path
 
+def _copy_value(value):
+    """목록/딕셔너리 값은 깊은 복사본을, 그 밖의 값은 그대로 반환합니다."""
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
 class SettingsManager:
-    """애플리케이션 설정을 관리하는 클래스"""
+    """애플리케이션 설정을 관리하는 클래스
+
+    설정 값은 메모리(self.settings)에 보관되며 get()은 파일을 다시 읽지 않습니다.
+    목록/딕셔너리 값은 get()과 set()에서 복사하므로, 가져온 값을 고쳐서 다시 set()하면
+    바뀐 값으로 인식되어 저장됩니다.
+    쓰기 지연(write-behind) 모드에서는 set()이 파일을 바로 쓰지 않고, debounce 시간 안의
+    변경을 모아 백그라운드 스레드에서 한 번에 저장합니다. 저장은 임시 파일에 쓴 뒤
+    이름을 바꾸는 방식이라 쓰는 도중 프로그램이 죽어도 기존 파일이 손상되지 않습니다.
+    """
 
-    def __init__(self):
-        """설정 파일 경로 초기화 및 설정 로드"""
+    def __init__(self, write_behind=True, debounce_ms=500):
+        """설정 파일 경로 초기화 및 설정 로드
+
+        Args:
+            write_behind (bool): True이면 변경 사항을 모아 백그라운드에서 저장합니다.
+                                 False이면 set()마다 즉시 저장합니다.
+            debounce_ms (int): 쓰기 지연 모드에서 변경을 모으는 시간 (ms).
+        """
         # APPDATA 경로에 애플리케이션 폴더 생성
         appdata = os.getenv('APPDATA')
         if appdata:
@@ -22,9 +47,21 @@ class SettingsManager:
 
         # 기본 설정
         self.default_settings = {
-            "minimize_to_tray": True
+            "minimize_to_tray": True,
+            "compositor_mode": False
         }
 
+        # --- 쓰기 지연 상태 ---
+        self.write_behind = write_behind
+        self.debounce = debounce_ms / 1000.0
+        self._lock = threading.Lock()        # settings 딕셔너리와 예약 상태 보호
+        self._write_lock = threading.Lock()  # 파일 쓰기 직렬화
+        self._save_timer = None
+        self._dirty = False
+
+        # 키별 변경 알림 콜백 (None 키는 모든 변경을 받음)
+        self._listeners = defaultdict(list)
+
         # 설정 로드
         self.settings = self.load_settings()
 
@@ -43,18 +80,106 @@ class SettingsManager:
             return self.default_settings.copy()
 
     def save_settings(self):
-        """현재 설정을 파일에 저장합니다."""
+        """현재 설정을 파일에 저장합니다 (임시 파일에 쓴 뒤 교체)."""
+        with self._write_lock:
+            self._write_file()
+
+    def _write_file(self):
+        """설정을 파일에 씁니다. _write_lock을 잡은 상태에서 호출해야 합니다."""
+        with self._lock:
+            self._dirty = False
+            data = json.dumps(self.settings, indent=2, ensure_ascii=False)
+
+        temp_path = None
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.settings_dir, prefix=".settings-", suffix=".tmp"
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            # 같은 디렉토리 안의 교체는 원자적이므로 중간 상태의 파일이 남지 않음
+            os.replace(temp_path, self.settings_file)
         except Exception as e:
             print(f"설정 저장 실패: {e}")
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _schedule_save(self):
+        """debounce 시간 뒤 백그라운드 저장을 예약합니다 (이미 예약되어 있으면 합류)."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.debounce, self._save_in_background)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _save_in_background(self):
+        """타이머 스레드에서 호출되어 모인 변경 사항을 저장합니다."""
+        with self._lock:
+            self._save_timer = None
+            if not self._dirty:
+                return
+        self.save_settings()
+
+    def flush(self):
+        """예약된 저장을 취소하고 변경 사항이 있으면 즉시 저장합니다 (종료 시 호출).
+
+        백그라운드 저장이 진행 중이면 끝날 때까지 기다립니다. 그렇지 않으면 프로세스가
+        종료되면서 데몬 스레드가 쓰는 도중에 끊겨 마지막 변경이 사라질 수 있습니다.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                dirty = self._dirty
+            if dirty:
+                self._write_file()
 
     def get(self, key, default=None):
-        """설정 값을 가져옵니다."""
-        return self.settings.get(key, default)
+        """설정 값을 가져옵니다 (메모리 캐시에서 읽음, 목록/딕셔너리는 복사본)."""
+        with self._lock:
+            return _copy_value(self.settings.get(key, default))
 
     def set(self, key, value):
-        """설정 값을 변경하고 저장합니다."""
-        self.settings[key] = value
-        self.save_settings()
+        """설정 값을 변경하고 저장합니다 (쓰기 지연 모드에서는 저장을 예약)."""
+        with self._lock:
+            if key in self.settings and self.settings[key] == value:
+                return
+            # 호출한 쪽이 나중에 값을 고쳐도 저장된 값은 바뀌지 않도록 복사해서 보관
+            self.settings[key] = _copy_value(value)
+
+        self._notify(key, value)
+
+        if self.write_behind:
+            self._schedule_save()
+        else:
+            self.save_settings()
+
+    def subscribe(self, key, callback):
+        """설정 값 변경 알림을 등록합니다.
+
+        Args:
+            key (str | None): 감시할 키. None이면 모든 키의 변경을 받습니다.
+            callback (callable): callback(key, value) 형태로 호출됩니다.
+        """
+        self._listeners[key].append(callback)
+
+    def unsubscribe(self, key, callback):
+        """등록한 변경 알림을 해제합니다."""
+        callbacks = self._listeners.get(key)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def _notify(self, key, value):
+        for callback in list(self._listeners.get(key, ())) + list(self._listeners.get(None, ())):
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"설정 변경 알림 처리 실패 ({key}): {e}")
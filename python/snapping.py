@@ -0,0 +1,101 @@
+# snapping.py
+
+"""
+드래그 중 가장자리 자석 맞춤
+
+가리개를 창 경계나 다른 가리개에 맞춰 놓을 때 1~2px 틈으로 내용이 비치지 않도록,
+가까운 가장자리(화면 경계, 작업 표시줄을 뺀 작업 영역, 다른 가리개)에 붙입니다.
+
+드래그를 시작할 때 모든 가장자리를 위치순으로 정렬한 인덱스를 한 번 만들고,
+마우스 이벤트마다 이분 탐색으로 임계값 안의 가장자리만 확인합니다.
+가리개가 수백 개여도 이벤트당 비용은 O(log n + 근처 가장자리 수)입니다.
+"""
+
+from bisect import bisect_left, bisect_right
+from PySide6.QtCore import QPoint
+
+# 기본 맞춤 거리 (논리 픽셀)
+DEFAULT_SNAP_DISTANCE = 8
+
+
+def _bounds(rect):
+    """QRect를 (x0, y0, x1, y1) 반열린 구간 튜플로 변환합니다."""
+    return rect.x(), rect.y(), rect.x() + rect.width(), rect.y() + rect.height()
+
+
+class EdgeIndex:
+    """세로/가로 가장자리를 위치순으로 정렬해 둔 맞춤 후보 인덱스"""
+
+    def __init__(self, threshold=DEFAULT_SNAP_DISTANCE):
+        """
+        Args:
+            threshold (int): 이 거리(픽셀) 안의 가장자리에만 붙습니다.
+        """
+        self.threshold = threshold
+        self._vertical = set()    # (x, y0, y1): x 위치의 세로선과 그 세로 범위
+        self._horizontal = set()  # (y, x0, x1)
+        self._built = None        # ((x 목록, 세로선 목록), (y 목록, 가로선 목록))
+
+    def __len__(self):
+        return len(self._vertical) + len(self._horizontal)
+
+    def add_rect(self, rect):
+        """사각형의 네 변을 후보로 추가합니다."""
+        x0, y0, x1, y1 = _bounds(rect)
+        self._vertical.update(((x0, y0, y1), (x1, y0, y1)))
+        self._horizontal.update(((y0, x0, x1), (y1, x0, x1)))
+        self._built = None
+
+    def _lines(self):
+        if self._built is None:
+            vertical = sorted(self._vertical)
+            horizontal = sorted(self._horizontal)
+            self._built = (([line[0] for line in vertical], vertical),
+                           ([line[0] for line in horizontal], horizontal))
+        return self._built
+
+    def _offset(self, keys, lines, edges, span_start, span_end):
+        """edges 중 하나를 가장 가까운 선에 붙이기 위한 이동량을 반환합니다 (없으면 0).
+
+        선의 범위가 움직이는 사각형의 범위와 임계값 안에서 겹칠 때만 후보로 봅니다
+        (화면 반대편에 있는 가리개의 연장선에는 붙지 않음).
+        """
+        threshold = self.threshold
+        best = None
+        for edge in edges:
+            start = bisect_left(keys, edge - threshold)
+            end = bisect_right(keys, edge + threshold)
+            for position, line_start, line_end in lines[start:end]:
+                if line_start > span_end + threshold or line_end < span_start - threshold:
+                    continue
+                offset = position - edge
+                if best is None or abs(offset) < abs(best):
+                    best = offset
+        return best or 0
+
+    def snap(self, rect):
+        """rect를 가까운 가장자리에 붙였을 때의 왼쪽 위 위치를 반환합니다."""
+        if self.threshold <= 0:
+            return rect.topLeft()
+        (xs, vertical), (ys, horizontal) = self._lines()
+        x0, y0, x1, y1 = _bounds(rect)
+        dx = self._offset(xs, vertical, (x0, x1), y0, y1)
+        dy = self._offset(ys, horizontal, (y0, y1), x0, x1)
+        return QPoint(x0 + dx, y0 + dy)
+
+
+def build_edge_index(screens, rects, threshold=DEFAULT_SNAP_DISTANCE):
+    """화면 경계, 작업 영역, 다른 가리개 사각형으로 맞춤 인덱스를 만듭니다.
+
+    Args:
+        screens (list): QScreen 목록.
+        rects (iterable): 다른 가리개들의 전역 geometry (움직이는 가리개는 제외).
+        threshold (int): 맞춤 거리 (픽셀).
+    """
+    index = EdgeIndex(threshold)
+    for screen in screens:
+        index.add_rect(screen.geometry())
+        index.add_rect(screen.availableGeometry())
+    for rect in rects:
+        index.add_rect(rect)
+    return index
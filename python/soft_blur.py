@@ -0,0 +1,278 @@
+# soft_blur.py
+
+"""
+소프트웨어 블러 엔진
+
+Windows 아크릴 API(SetWindowCompositionAttribute)를 쓸 수 없는 환경에서
+가리개(Viewport)가 직접 화면을 캡처해 흐리게 그릴 수 있도록 하는 CPU 블러 구현입니다.
+
+가우시안 블러를 여러 번의 박스 필터로 근사하며, 가로/세로를 분리해서 처리합니다.
+박스 합계는 부분합을 이어 붙여 구하므로 픽셀당 연산량은 박스 너비의 로그에 비례하고,
+uint16 버퍼를 써서 메모리 대역폭을 아낍니다. 반올림은 나눌 때마다 하므로
+평평한 영역의 밝기가 그대로 유지됩니다.
+
+모자이크(픽셀화) 모드는 합 영역 테이블(summed-area table)로 블록 평균을 구하므로
+블록 크기와 무관하게 블록당 O(1)이며, 큰 강도에서는 가우시안 근사보다 빠릅니다.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+from PySide6.QtGui import QImage
+
+# 가우시안 근사에 사용하는 박스 필터 반복 횟수 (3회면 시각적으로 가우시안과 구분 불가)
+BOX_PASSES = 3
+
+# 모자이크 블록 크기 기본값 (픽셀)
+DEFAULT_BLOCK_SIZE = 16
+
+
+
+@lru_cache(maxsize=64)
+def box_kernel(strength, passes=BOX_PASSES):
+    """블러 강도(가우시안 시그마, 픽셀 단위)에 해당하는 박스 필터 반지름들을 반환합니다.
+
+    W. Kovesi의 방법으로 n회의 박스 필터가 주어진 시그마의 가우시안과
+    같은 분산을 갖도록 각 박스의 반지름을 계산합니다.
+    강도별로 캐시되므로 매 프레임 다시 계산하지 않습니다.
+
+    Args:
+        strength (float): 블러 강도 (시그마). 0 이하이면 블러하지 않습니다.
+        passes (int): 박스 필터 반복 횟수.
+
+    Returns:
+        tuple: 박스마다의 반지름 (박스 너비는 2 * 반지름 + 1).
+    """
+    if strength <= 0:
+        return ()
+
+    sigma = float(strength)
+    w_ideal = math.sqrt(12.0 * sigma * sigma / passes + 1.0)
+    w_low = int(math.floor(w_ideal))
+    if w_low % 2 == 0:
+        w_low -= 1
+    w_up = w_low + 2
+
+    m_ideal = (12.0 * sigma * sigma - passes * w_low * w_low
+               - 4.0 * passes * w_low - 3.0 * passes) / (-4.0 * w_low - 4.0)
+    m = int(round(m_ideal))
+
+    return tuple(max(0, ((w_low if i < m else w_up) - 1) // 2) for i in range(passes))
+
+
+def blur_radius(strength, passes=BOX_PASSES):
+    """블러 결과의 한 픽셀이 참조하는 최대 거리(픽셀)를 반환합니다."""
+    return sum(box_kernel(strength, passes))
+
+
+def _axis_slice(ndim, axis, start, length):
+    index = [slice(None)] * ndim
+    index[axis] = slice(start, start + length)
+    return tuple(index)
+
+
+def _window_sum(src, size, axis):
+    """한 축 방향으로 연속한 size개 원소의 합을 구합니다 (valid 모드: 길이가 size - 1 줄어듦).
+
+    너비 1, 2, 4, ...의 부분합을 이어 붙여 만들므로 배열 전체 연산이 O(log size)번이며,
+    누적합(cumsum)보다 메모리를 적게 읽고 쓰고 넓은 합계 자료형도 필요 없습니다.
+    """
+    n = src.shape[axis] - size + 1
+    result = None
+    power, width, offset = src, 1, 0
+    while True:
+        if size & 1:
+            part = power[_axis_slice(src.ndim, axis, offset, n)]
+            result = part if result is None else result + part
+            offset += width
+        size >>= 1
+        if not size:
+            return result
+        length = power.shape[axis] - width
+        power = (power[_axis_slice(src.ndim, axis, 0, length)]
+                 + power[_axis_slice(src.ndim, axis, width, length)])
+        width *= 2
+
+
+def _normalize(acc, scale):
+    """합계를 scale로 나눠 반올림합니다 (제자리 연산, 나눗셈을 내림으로 하면 매번 어두워짐)."""
+    if scale > 1:
+        acc += acc.dtype.type(scale // 2)
+        acc //= acc.dtype.type(scale)
+    return acc
+
+
+def blur_array(pixels, strength, passes=BOX_PASSES):
+    """(H, W, C) uint8 배열을 흐리게 만든 새 배열을 반환합니다.
+
+    가장자리를 전체 블러 반경만큼 한 번만 복제해 붙인 뒤, 축마다 박스 필터를 valid 모드로
+    이어서 적용합니다. 합계는 uint16에 담고(박스가 아주 넓으면 uint32), 다음 박스의 합계가
+    넘칠 때만 나눠서 줄입니다.
+    """
+    radii = box_kernel(strength, passes)
+    if not any(radii):
+        return pixels.copy()
+
+    margin = sum(radii)
+    pad = ((margin, margin), (margin, margin)) + ((0, 0),) * (pixels.ndim - 2)
+    dtype = np.uint16 if 255 * (2 * max(radii) + 1) <= np.iinfo(np.uint16).max else np.uint32
+    limit = np.iinfo(dtype).max
+    acc = np.pad(pixels, pad, mode='edge').astype(dtype)
+    for axis in (1, 0):
+        scale = 1
+        for radius in radii:
+            size = 2 * radius + 1
+            if 255 * scale * size > limit:
+                acc = _normalize(acc, scale)
+                scale = 1
+            acc = _window_sum(acc, size, axis)
+            scale *= size
+        acc = _normalize(acc, scale)
+    return acc.astype(np.uint8)
+
+
+def summed_area_table(pixels):
+    """(H, W, C) uint8 배열의 합 영역 테이블을 반환합니다 (앞에 0 행/열이 붙은 uint32).
+
+    값이 uint32 범위를 넘으면 2^32로 나눈 나머지가 저장되지만, 네 모서리의
+    합/차로 구하는 블록 합계는 블록 합계 자체가 범위 안이면 항상 정확합니다.
+    """
+    height, width, channels = pixels.shape
+    table = np.zeros((height + 1, width + 1, channels), dtype=np.uint32)
+    np.cumsum(np.cumsum(pixels, axis=0, dtype=np.uint32), axis=1, out=table[1:, 1:])
+    return table
+
+
+def pixelate_array(pixels, block):
+    """(H, W, C) uint8 배열을 block x block 블록 평균으로 채운 새 배열을 반환합니다.
+
+    블록 격자는 배열의 (0, 0)에 맞춰지며, 오른쪽/아래 가장자리 블록은 남은 크기만큼입니다.
+    """
+    if block <= 1:
+        return pixels.copy()
+
+    height, width = pixels.shape[:2]
+    table = summed_area_table(pixels)
+
+    ys = np.append(np.arange(0, height, block), height)
+    xs = np.append(np.arange(0, width, block), width)
+    top, bottom, left, right = ys[:-1], ys[1:], xs[:-1], xs[1:]
+
+    # 모든 블록의 합계를 네 모서리 값으로 한 번에 계산 (uint32 나머지 연산)
+    sums = (table[np.ix_(bottom, right)] - table[np.ix_(top, right)]
+            - table[np.ix_(bottom, left)] + table[np.ix_(top, left)])
+    block_h, block_w = np.diff(ys), np.diff(xs)
+    counts = np.outer(block_h, block_w).astype(np.uint32)[:, :, None]
+    means = ((sums + counts // 2) // counts).astype(np.uint8)
+
+    return np.repeat(np.repeat(means, block_h, axis=0), block_w, axis=1)
+
+
+def qimage_to_array(image):
+    """QImage를 (H, W, 4) uint8 BGRA 배열로 변환합니다 (복사본)."""
+    if image.format() != QImage.Format_RGB32:
+        image = image.convertToFormat(QImage.Format_RGB32)
+
+    width, height = image.width(), image.height()
+    buffer = np.frombuffer(image.constBits(), dtype=np.uint8)
+    rows = buffer[:height * image.bytesPerLine()].reshape(height, image.bytesPerLine())
+    return rows[:, :width * 4].reshape(height, width, 4).copy()
+
+
+def array_to_qimage(pixels):
+    """(H, W, 4) uint8 BGRA 배열을 QImage로 변환합니다."""
+    pixels = np.ascontiguousarray(pixels)
+    height, width = pixels.shape[:2]
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format_RGB32)
+    # 배열 버퍼와 분리된 복사본을 반환해야 배열 해제 후에도 안전함
+    return image.copy()
+
+
+class BlurEngine:
+    """캡처된 화면 이미지를 흐리게 만드는 소프트웨어 블러 엔진"""
+
+    def __init__(self, passes=BOX_PASSES):
+        self.passes = passes
+
+    def radius(self, strength):
+        """주어진 강도에서 블러가 영향을 주는 반경(픽셀)을 반환합니다."""
+        return blur_radius(strength, self.passes)
+
+    def blur_pixels(self, pixels, strength):
+        """BGRA 배열의 색상 채널만 흐리게 만들어 새 BGRA 배열로 반환합니다."""
+        blurred = blur_array(pixels[:, :, :3], strength, self.passes)
+        out = np.empty(pixels.shape, dtype=np.uint8)
+        out[:, :, :3] = blurred
+        out[:, :, 3] = 255
+        return out
+
+    def blur_region(self, pixels, out, region, strength):
+        """pixels의 일부 영역만 다시 블러하여 out의 같은 위치에 기록합니다.
+
+        영역 밖 블러 반경만큼의 원본을 함께 잘라서 계산하므로,
+        기록되는 값은 전체 이미지를 블러한 결과와 동일합니다.
+
+        Args:
+            pixels (np.ndarray): (H, W, 4) 원본 BGRA 배열.
+            out (np.ndarray): 결과를 기록할 (H, W, 4) 배열.
+            region (tuple): 다시 계산할 사각형 (y0, y1, x0, x1).
+            strength (int): 블러 강도.
+        """
+        y0, y1, x0, x1 = region
+        height, width = pixels.shape[:2]
+        margin = self.radius(strength)
+
+        cy0, cy1 = max(0, y0 - margin), min(height, y1 + margin)
+        cx0, cx1 = max(0, x0 - margin), min(width, x1 + margin)
+
+        blurred = blur_array(pixels[cy0:cy1, cx0:cx1, :3], strength, self.passes)
+        out[y0:y1, x0:x1, :3] = blurred[y0 - cy0:y1 - cy0, x0 - cx0:x1 - cx0]
+        out[y0:y1, x0:x1, 3] = 255
+
+    def blur_image(self, image, strength):
+        """QImage를 받아 흐리게 만든 QImage를 반환합니다."""
+        if image.isNull() or strength <= 0:
+            return image
+        pixels = qimage_to_array(image)
+        return array_to_qimage(self.blur_pixels(pixels, strength))
+
+
+class PixelateEngine:
+    """캡처된 화면 이미지를 모자이크로 만드는 엔진 (BlurEngine과 같은 인터페이스)
+
+    강도(strength) 자리에 블록 크기(픽셀)를 받습니다.
+    """
+
+    def radius(self, block):
+        """한 픽셀이 바뀌었을 때 결과가 달라질 수 있는 최대 거리 (같은 블록 안)"""
+        return max(0, int(block))
+
+    def blur_pixels(self, pixels, block):
+        """BGRA 배열의 색상 채널만 모자이크로 만들어 새 BGRA 배열로 반환합니다."""
+        out = np.empty(pixels.shape, dtype=np.uint8)
+        out[:, :, :3] = pixelate_array(pixels[:, :, :3], block)
+        out[:, :, 3] = 255
+        return out
+
+    def blur_region(self, pixels, out, region, block):
+        """pixels의 일부 영역만 다시 계산하여 out의 같은 위치에 기록합니다.
+
+        영역을 블록 격자 경계까지 넓혀 계산하므로 기록되는 값은 전체를 계산한 결과와 동일합니다.
+        """
+        y0, y1, x0, x1 = region
+        height, width = pixels.shape[:2]
+        block = max(1, int(block))
+
+        cy0, cx0 = y0 // block * block, x0 // block * block
+        cy1 = min(height, -(-y1 // block) * block)
+        cx1 = min(width, -(-x1 // block) * block)
+
+        blocks = pixelate_array(pixels[cy0:cy1, cx0:cx1, :3], block)
+        out[y0:y1, x0:x1, :3] = blocks[y0 - cy0:y1 - cy0, x0 - cx0:x1 - cx0]
+        out[y0:y1, x0:x1, 3] = 255
+
+
+# 모든 가리개가 공유하는 기본 엔진 (커널 캐시도 공유됨)
+default_engine = BlurEngine()
+default_pixelate_engine = PixelateEngine()
@@ -0,0 +1,39 @@
+# startup_profile.py
+
+"""
+시작 단계별 소요 시간 측정
+
+main.py가 가장 먼저 import하므로 표준 라이브러리만 사용합니다.
+"""
+
+import time
+
+
+class StartupProfiler:
+    """시작 과정의 각 단계가 끝난 시각을 기록하고 단계별 소요 시간을 출력하는 클래스"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+        self._last = self._origin
+        self.phases = []  # (단계 이름, 소요 시간 ms)
+
+    def mark(self, phase):
+        """직전 기록 이후 지금까지를 phase 단계의 소요 시간으로 기록합니다."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000.0))
+        self._last = now
+
+    def elapsed_ms(self):
+        """측정 시작부터 지금까지의 시간 (ms)"""
+        return (time.perf_counter() - self._origin) * 1000.0
+
+    def report(self):
+        """단계별 소요 시간을 출력합니다 (enabled일 때만)."""
+        if not self.enabled:
+            return
+        print("[시작 프로파일]")
+        total = 0.0
+        for phase, ms in self.phases:
+            total += ms
+            print(f"  {phase:<16} {ms:8.1f} ms  (누적 {total:8.1f} ms)")
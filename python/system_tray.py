@@ -9,6 +9,14 @@ class SystemTrayIcon(QSystemTrayIcon):
     """시스템 트레이 아이콘 및 컨텍스트 메뉴를 관리하는 클래스"""
     
     show_window_requested = Signal()
+    # 성능 HUD 표시 여부 변경
+    hud_toggled = Signal(bool)
+    # 성능 데이터(JSON) 저장 요청
+    export_diagnostics_requested = Signal()
+    # 템플릿 자동 감지 켜기/끄기
+    detection_toggled = Signal(bool)
+    # 화면에서 영역을 골라 감지 템플릿으로 등록 요청
+    template_capture_requested = Signal()
 
     def __init__(self, icon: QIcon, parent=None):
         """생성자: 트레이 아이콘과 메뉴를 초기화합니다."""
@@ -27,6 +35,18 @@ class SystemTrayIcon(QSystemTrayIcon):
         show_action = QAction("컨트롤러 표시", self)
         show_action.triggered.connect(self.show_window_requested.emit)
         
+        self.detect_action = QAction("자동 가리기 (템플릿 감지)", self, checkable=True)
+        self.detect_action.toggled.connect(self.detection_toggled.emit)
+
+        template_action = QAction("감지 템플릿 등록...", self)
+        template_action.triggered.connect(self.template_capture_requested.emit)
+
+        self.hud_action = QAction("성능 HUD 표시", self, checkable=True)
+        self.hud_action.toggled.connect(self.hud_toggled.emit)
+
+        export_action = QAction("성능 데이터 저장", self)
+        export_action.triggered.connect(self.export_diagnostics_requested.emit)
+
         quit_action = QAction("종료", self)
         # 앱의 quit_application 슬롯에 연결하여 정상 종료되도록 함
         if parent and hasattr(parent, 'quit_application'):
@@ -35,6 +55,13 @@ class SystemTrayIcon(QSystemTrayIcon):
             quit_action.triggered.connect(QApplication.instance().quit)
         
         menu.addAction(show_action)
+        menu.addSeparator()
+        menu.addAction(self.detect_action)
+        menu.addAction(template_action)
+        menu.addSeparator()
+        menu.addAction(self.hud_action)
+        menu.addAction(export_action)
+        menu.addSeparator()
         menu.addAction(quit_action)
         
         self.setContextMenu(menu)
@@ -0,0 +1,251 @@
+# template_matcher.py
+
+"""
+템플릿 매칭 (정규화 상호상관, NCC)
+
+채팅창이나 토큰 입력란처럼 모양이 고정된 UI 요소를 화면 캡처에서 찾습니다.
+
+- 분자(이미지와 평균을 뺀 템플릿의 상관)는 FFT로 모든 위치에 대해 한 번에 계산
+- 분모(각 창의 분산)는 적분 영상(integral image)으로 위치당 O(1)에 계산
+- 이미지 피라미드의 축소 단계에서 후보를 찾고, 원본 해상도에서는 후보 주변만 다시 확인
+
+Qt에 의존하지 않으므로 작업 스레드에서 그대로 사용할 수 있습니다.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# 축소 단계에서 템플릿의 짧은 변이 이보다 작아지지 않도록 피라미드 단계를 제한
+MIN_TEMPLATE_SIZE = 16
+
+# 축소 단계에서는 세부가 뭉개져 점수가 낮아지므로 후보 임계값을 이만큼 낮춤
+COARSE_THRESHOLD_SLACK = 0.15
+
+# 분산이 이보다 작은 창(단색 영역)은 비교하지 않음
+_EPSILON = 1e-6
+
+# 찾은 영역 하나 (프레임 픽셀 좌표)
+Match = namedtuple("Match", ["name", "x", "y", "width", "height", "score"])
+
+
+def to_gray(pixels):
+    """BGRA (H, W, 4) uint8 배열을 float32 명도 배열로 변환합니다."""
+    b = pixels[..., 0].astype(np.float32)
+    g = pixels[..., 1].astype(np.float32)
+    r = pixels[..., 2].astype(np.float32)
+    return 0.114 * b + 0.587 * g + 0.299 * r
+
+
+def downsample(image):
+    """2x2 블록 평균으로 가로/세로를 절반으로 줄입니다."""
+    h, w = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    image = image[:h, :w]
+    return 0.25 * (image[0::2, 0::2] + image[1::2, 0::2] + image[0::2, 1::2] + image[1::2, 1::2])
+
+
+def build_pyramid(image, levels):
+    """0단계(원본)부터 levels단계까지의 피라미드 목록을 반환합니다."""
+    pyramid = [image]
+    for _ in range(levels):
+        pyramid.append(downsample(pyramid[-1]))
+    return pyramid
+
+
+@lru_cache(maxsize=256)
+def _fast_length(n):
+    """n 이상인 가장 작은 5-smooth 수 (FFT가 빠른 길이)를 반환합니다."""
+    best = 1
+    while best < n:
+        best *= 2
+    power5 = 1
+    while power5 < best:
+        power3 = power5
+        while power3 < best:
+            candidate = power3
+            while candidate < n:
+                candidate *= 2
+            best = min(best, candidate)
+            power3 *= 3
+        power5 *= 5
+    return best
+
+
+def integral_images(image):
+    """합과 제곱합의 적분 영상을 반환합니다 (앞에 0 행/열이 붙은 float64)."""
+    h, w = image.shape
+    total = np.zeros((h + 1, w + 1), dtype=np.float64)
+    squared = np.zeros((h + 1, w + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(image, axis=0, dtype=np.float64), axis=1, out=total[1:, 1:])
+    np.cumsum(np.cumsum(np.square(image, dtype=np.float64), axis=0), axis=1, out=squared[1:, 1:])
+    return total, squared
+
+
+def window_sums(integral, height, width):
+    """모든 위치의 height x width 창 합계를 적분 영상에서 한 번에 계산합니다."""
+    return (integral[height:, width:] - integral[:-height, width:]
+            - integral[height:, :-width] + integral[:-height, :-width])
+
+
+def ncc_map(image, template):
+    """템플릿이 완전히 들어가는 모든 위치의 NCC 점수(-1~1) 배열을 반환합니다.
+
+    Returns:
+        numpy.ndarray: (H - th + 1, W - tw + 1) 크기의 점수. 이미지가 템플릿보다 작거나
+                       템플릿이 단색이면 None.
+    """
+    image_h, image_w = image.shape
+    th, tw = template.shape
+    if image_h < th or image_w < tw:
+        return None
+
+    zero_mean = template - template.mean()
+    template_norm = float(np.sqrt(np.square(zero_mean, dtype=np.float64).sum()))
+    if template_norm < _EPSILON:
+        return None
+
+    # 분자: sum(I * (T - mean(T))) = sum((I - mean(I)) * (T - mean(T)))
+    shape = (_fast_length(image_h + th - 1), _fast_length(image_w + tw - 1))
+    spectrum = np.fft.rfft2(image, shape) * np.fft.rfft2(zero_mean[::-1, ::-1], shape)
+    numerator = np.fft.irfft2(spectrum, shape)[th - 1:image_h, tw - 1:image_w]
+
+    # 분모: 각 창의 분산 합을 적분 영상으로 계산
+    total, squared = integral_images(image)
+    sums = window_sums(total, th, tw)
+    variance = window_sums(squared, th, tw) - sums * sums / (th * tw)
+    denominator = np.sqrt(np.maximum(variance, 0.0)) * template_norm
+
+    scores = np.zeros_like(numerator)
+    valid = denominator > _EPSILON * template_norm
+    scores[valid] = numerator[valid] / denominator[valid]
+    return scores
+
+
+def find_peaks(scores, threshold, max_count, suppress_h, suppress_w):
+    """점수가 높은 순으로 최대 max_count개의 위치를 찾습니다 (주변은 억제).
+
+    Returns:
+        list: (y, x, score) 목록.
+    """
+    scores = scores.copy()
+    width = scores.shape[1]
+    peaks = []
+    for _ in range(max_count):
+        index = int(np.argmax(scores))
+        y, x = divmod(index, width)
+        score = float(scores[y, x])
+        if score < threshold:
+            break
+        peaks.append((y, x, score))
+        scores[max(0, y - suppress_h):y + suppress_h + 1,
+               max(0, x - suppress_w):x + suppress_w + 1] = -1.0
+    return peaks
+
+
+class Template:
+    """찾을 대상 이미지 하나 (피라미드를 미리 계산해 둠)"""
+
+    def __init__(self, name, gray, levels=2):
+        """
+        Args:
+            name (str): 템플릿 이름.
+            gray (numpy.ndarray): float32 명도 배열.
+            levels (int): 최대 피라미드 단계.
+        """
+        self.name = name
+        self.height, self.width = gray.shape
+        self.pyramid = [gray]
+        for _ in range(levels):
+            smaller = downsample(self.pyramid[-1])
+            if min(smaller.shape) < MIN_TEMPLATE_SIZE:
+                break
+            self.pyramid.append(smaller)
+
+    @property
+    def levels(self):
+        return len(self.pyramid) - 1
+
+
+class TemplateMatcher:
+    """여러 템플릿을 화면 캡처에서 찾는 클래스"""
+
+    def __init__(self, threshold=0.85, levels=2, max_matches=4):
+        """
+        Args:
+            threshold (float): 원본 해상도에서 일치로 판단할 최소 NCC 점수.
+            levels (int): 최대 피라미드 단계 (단계마다 가로/세로 절반).
+            max_matches (int): 템플릿 하나당 찾을 최대 위치 수.
+        """
+        self.threshold = threshold
+        self.levels = levels
+        self.max_matches = max_matches
+        self.templates = []
+
+    def add_template(self, name, gray):
+        """템플릿을 추가합니다. 같은 이름이 있으면 바꿉니다."""
+        self.remove_template(name)
+        self.templates.append(Template(name, np.asarray(gray, dtype=np.float32), self.levels))
+
+    def remove_template(self, name):
+        self.templates = [t for t in self.templates if t.name != name]
+
+    def match(self, gray):
+        """명도 배열에서 모든 템플릿의 위치를 찾습니다.
+
+        Returns:
+            list: Match 목록 (템플릿별 점수 내림차순).
+        """
+        if not self.templates:
+            return []
+
+        deepest = max(t.levels for t in self.templates)
+        pyramid = build_pyramid(gray, deepest)
+
+        matches = []
+        for template in self.templates:
+            matches.extend(self._match_template(pyramid, template))
+        return matches
+
+    def _match_template(self, pyramid, template):
+        level = template.levels
+        scale = 1 << level
+        coarse_template = template.pyramid[level]
+        coarse = ncc_map(pyramid[level], coarse_template)
+        if coarse is None:
+            return []
+
+        candidates = find_peaks(
+            coarse,
+            self.threshold - COARSE_THRESHOLD_SLACK if level else self.threshold,
+            self.max_matches,
+            coarse_template.shape[0] // 2,
+            coarse_template.shape[1] // 2,
+        )
+
+        full = pyramid[0]
+        matches = []
+        for y, x, score in candidates:
+            if level:
+                # 원본 해상도에서 후보 주변(축소 배율 2칸)만 다시 비교해 위치를 보정
+                margin = 2 * scale
+                y0 = max(0, y * scale - margin)
+                x0 = max(0, x * scale - margin)
+                window = full[y0:y * scale + template.height + margin,
+                              x0:x * scale + template.width + margin]
+                refined = ncc_map(window, template.pyramid[0])
+                if refined is None:
+                    continue
+                index = int(np.argmax(refined))
+                dy, dx = divmod(index, refined.shape[1])
+                y, x, score = y0 + dy, x0 + dx, float(refined[dy, dx])
+                if score < self.threshold:
+                    continue
+
+            if any(abs(m.x - x) < template.width // 2 and abs(m.y - y) < template.height // 2
+                   for m in matches):
+                continue  # 보정 후 같은 위치로 모인 후보
+            matches.append(Match(template.name, x, y, template.width, template.height, score))
+
+        matches.sort(key=lambda m: m.score, reverse=True)
+        return matches
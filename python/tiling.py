@@ -0,0 +1,186 @@
+# tiling.py
+
+"""
+타일 기반 변경 영역(dirty region) 추적
+
+가리개 영역을 고정 크기 타일로 나누고, 각 타일의 시그니처를 이전 프레임과 비교해
+바뀐 타일만 골라냅니다. 소프트웨어 블러는 이 정보를 이용해 바뀐 타일과 블러 반경만큼의
+주변(halo)만 다시 계산합니다.
+
+시그니처는 타일 안 모든 픽셀에 위치마다 다른 홀수 가중치를 곱해 더한 값(mod 2^32)입니다.
+픽셀을 건너뛰며 샘플링하지 않으므로 1픽셀 너비의 커서나 글자 획이 바뀌어도 놓치지 않으며,
+픽셀 하나만 바뀐 경우는 가중치가 홀수라 항상 찾아냅니다. 같은 내용이 타일 안에서
+자리만 옮겨도 가중치가 달라 시그니처가 바뀝니다.
+"""
+
+import numpy as np
+
+# 시그니처 가중치 패턴의 난수 시드 (실행마다 같은 패턴을 쓰도록 고정)
+_WEIGHT_SEED = 0x5C12EE
+
+
+class TileTracker:
+    """프레임 간 바뀐 타일을 찾아 다시 블러할 영역 목록을 만드는 클래스"""
+
+    def __init__(self, tile_size=64):
+        """
+        Args:
+            tile_size (int): 타일 한 변의 크기 (픽셀).
+        """
+        self.tile_size = tile_size
+        pattern = np.random.default_rng(_WEIGHT_SEED).integers(
+            0, 2 ** 32, size=(tile_size, tile_size), dtype=np.uint32)
+        self._pattern = pattern | 1  # 홀수 가중치 (타일 하나 크기)
+        self._weights = None         # 이미지 크기에 맞춰 반복한 가중치
+
+        self._signature = None  # 이전 프레임의 타일별 시그니처
+        self._shape = None
+
+        # --- 프레임별 통계 ---
+        self.dirty_tiles = 0
+        self.clean_tiles = 0
+        self.masked_tiles = 0  # 가리개 모양 밖이라 블러하지 않은 타일 수
+
+    def reset(self):
+        """이전 프레임 정보를 버립니다. 다음 update()는 전체 영역을 바뀐 것으로 봅니다."""
+        self._signature = None
+        self._shape = None
+
+    def grid_shape(self, shape):
+        """(높이, 너비) 이미지 크기에 해당하는 (타일 행 수, 타일 열 수)를 반환합니다."""
+        height, width = shape[:2]
+        return (-(-height // self.tile_size), -(-width // self.tile_size))
+
+    def tile_coverage(self, mask):
+        """(H, W) 마스크에서 0이 아닌 픽셀이 하나라도 있는 타일을 (타일 행, 타일 열) 불리언 배열로 반환합니다."""
+        size = self.tile_size
+        rows, cols = self.grid_shape(mask.shape)
+        padded = np.zeros((rows * size, cols * size), dtype=bool)
+        padded[:mask.shape[0], :mask.shape[1]] = mask != 0
+        return padded.reshape(rows, size, cols, size).any(axis=(1, 3))
+
+    @property
+    def signature(self):
+        """마지막 프레임의 (타일 행, 타일 열) uint32 시그니처 배열 (아직 없으면 None)"""
+        return self._signature
+
+    def _make_signature(self, pixels):
+        """타일마다 모든 픽셀의 가중 합을 구해 (타일 행, 타일 열) uint32 배열로 반환합니다."""
+        # BGRA 4바이트를 픽셀 하나의 uint32 값으로 봄
+        values = np.ascontiguousarray(pixels).view(np.uint32)[..., 0]
+        height, width = values.shape
+        if self._weights is None or self._weights.shape != values.shape:
+            rows, cols = self.grid_shape(values.shape)
+            self._weights = np.tile(self._pattern, (rows, cols))[:height, :width]
+        # uint32 곱셈과 덧셈은 2^32에서 넘치며 되돌아가므로 그대로 mod 2^32 해시가 됨
+        weighted = values * self._weights
+
+        size = self.tile_size
+        full_rows, full_cols = height // size, width // size
+        signature = np.empty(self.grid_shape(values.shape), dtype=np.uint32)
+        # 크기가 나누어떨어지는 부분과 오른쪽/아래 가장자리의 자투리 타일을 나눠 더함
+        for y0, y1 in ((0, full_rows * size), (full_rows * size, height)):
+            for x0, x1 in ((0, full_cols * size), (full_cols * size, width)):
+                if y1 <= y0 or x1 <= x0:
+                    continue
+                tile_rows, tile_cols = -(-(y1 - y0) // size), -(-(x1 - x0) // size)
+                block = weighted[y0:y1, x0:x1].reshape(
+                    tile_rows, (y1 - y0) // tile_rows, tile_cols, (x1 - x0) // tile_cols)
+                signature[y0 // size:y0 // size + tile_rows, x0 // size:x0 // size + tile_cols] = \
+                    block.sum(axis=(1, 3), dtype=np.uint32)
+        return signature
+
+    @staticmethod
+    def _dilate(mask, cells):
+        """타일 마스크를 상하좌우 cells칸만큼 팽창시킵니다 (halo)."""
+        if cells <= 0 or not mask.any():
+            return mask
+        rows, cols = mask.shape
+        # 누적합으로 가로/세로 창 안에 참이 하나라도 있는지 검사
+        padded = np.pad(mask, cells).astype(np.int32)
+        summed = padded.cumsum(axis=0)
+        summed = np.vstack([summed[2 * cells:2 * cells + 1],
+                            summed[2 * cells + 1:] - summed[:-2 * cells - 1]])
+        summed = summed.cumsum(axis=1)
+        summed = np.hstack([summed[:, 2 * cells:2 * cells + 1],
+                            summed[:, 2 * cells + 1:] - summed[:, :-2 * cells - 1]])
+        return summed[:rows, :cols] > 0
+
+    def _merge(self, mask):
+        """타일 마스크를 픽셀 단위 사각형 목록 (y0, y1, x0, x1)으로 병합합니다.
+
+        같은 행의 연속된 타일을 하나의 구간으로 묶고, 위아래 행에서
+        같은 구간이 이어지면 세로로도 합쳐 블러 호출 수와 halo 낭비를 줄입니다.
+        """
+        height, width = self._shape[:2]
+        size = self.tile_size
+        regions = []
+        open_runs = {}  # (c0, c1) -> 시작 타일 행
+
+        for row in range(mask.shape[0] + 1):
+            runs = set()
+            if row < mask.shape[0]:
+                line = np.concatenate(([False], mask[row], [False]))
+                edges = np.flatnonzero(line[1:] != line[:-1])
+                runs = set(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+            for run in list(open_runs):
+                if run not in runs:
+                    start = open_runs.pop(run)
+                    regions.append((start * size, min(row * size, height),
+                                    run[0] * size, min(run[1] * size, width)))
+            for run in runs:
+                open_runs.setdefault(run, row)
+
+        return regions
+
+    def update(self, pixels, halo=0, visible=None):
+        """새 프레임을 받아 다시 블러해야 할 영역 목록을 반환합니다.
+
+        Args:
+            pixels (np.ndarray): (H, W, 4) uint8 BGRA 캡처 이미지.
+            halo (int): 바뀐 타일 주변으로 함께 갱신할 거리 (보통 블러 반경).
+            visible (np.ndarray, optional): tile_coverage()로 만든 타일 마스크.
+                False인 타일은 가리개 모양 밖이라 그려지지 않으므로 다시 블러하지 않습니다.
+                (바뀐 내용은 halo를 통해 모양 안쪽 타일에 반영됩니다.)
+
+        Returns:
+            list: 픽셀 단위 사각형 (y0, y1, x0, x1) 목록. 전체를 다시 그려야 하면
+                  이미지 전체 사각형 하나를 반환합니다.
+        """
+        signature = self._make_signature(pixels)
+        rows, cols = self.grid_shape(pixels.shape)
+        total = rows * cols
+
+        if self._signature is None or self._shape != pixels.shape:
+            self._signature = signature
+            self._shape = pixels.shape
+            self.dirty_tiles, self.clean_tiles = total, 0
+            if visible is None:
+                self.masked_tiles = 0
+                return [(0, pixels.shape[0], 0, pixels.shape[1])]
+            self.masked_tiles = total - int(visible.sum())
+            return self._merge(visible)
+
+        changed = signature != self._signature
+        self._signature = signature
+
+        self.dirty_tiles = int(changed.sum())
+        self.clean_tiles = total - self.dirty_tiles
+        if not self.dirty_tiles:
+            return []
+
+        halo_cells = -(-halo // self.tile_size)
+        dirty = self._dilate(changed, halo_cells)
+        self.masked_tiles = 0
+        if visible is not None:
+            self.masked_tiles = int((dirty & ~visible).sum())
+            dirty &= visible
+            if not dirty.any():
+                return []
+        return self._merge(dirty)
+
+    def stats(self):
+        """마지막 프레임의 바뀐/그대로인 타일 수를 반환합니다."""
+        return {"dirty_tiles": self.dirty_tiles, "clean_tiles": self.clean_tiles,
+                "masked_tiles": self.masked_tiles}
@@ -3,7 +3,10 @@
 import sys
 import ctypes
 
-def apply_blur(hwnd):
+# Windows가 아닐 때의 대체 안내는 가리개마다가 아니라 한 번만 출력
+_fallback_warned = False
+
+def apply_blur(hwnd, enable=True):
     """특정 창(hwnd)에 Windows의 내부 API를 사용하여 아크릴 블러 효과를 적용합니다.
     
     이 함수는 Windows 운영체제에서만 동작합니다.
@@ -12,11 +15,19 @@ def apply_blur(hwnd):
     Args:
         hwnd (int): 블러 효과를 적용할 창의 핸들 (Window Handle).
                      PySide/PyQt에서는 `self.winId()`를 통해 얻을 수 있습니다.
+        enable (bool): False이면 적용했던 블러 효과를 해제합니다 (모자이크 모드 전환 등).
+
+    Returns:
+        bool: 블러 효과가 적용되었으면 True. False이면 호출자가
+              소프트웨어 블러(soft_blur)로 대체해야 합니다.
     """
     # Windows 플랫폼이 아니면 함수를 즉시 종료
     if sys.platform != 'win32':
-        print("블러 효과는 Windows에서만 지원됩니다.")
-        return
+        global _fallback_warned
+        if enable and not _fallback_warned:
+            _fallback_warned = True
+            print("블러 효과는 Windows에서만 지원됩니다. 소프트웨어 블러를 사용합니다.")
+        return False
 
     # --- Win32 API 구조체 정의 ---
     # SetWindowCompositionAttribute 함수에 필요한 데이터 구조를 ctypes로 정의합니다.
@@ -42,12 +53,13 @@ def apply_blur(hwnd):
     # ACCENT_ENABLE_BLURBEHIND: 창 뒤의 콘텐츠를 흐리게 만드는 효과
     # 이 외에도 ACCENT_ENABLE_ACRYLICBLURBEHIND (아크릴 효과) 등이 있지만,
     # 여기서는 가장 기본적인 블러를 사용합니다.
+    ACCENT_DISABLED = 0
     ACCENT_ENABLE_BLURBEHIND = 3
     WCA_ACCENT_POLICY = 19
     
     # --- 구조체 인스턴스 생성 및 값 설정 ---
     accent = ACCENT_POLICY()
-    accent.AccentState = ACCENT_ENABLE_BLURBEHIND
+    accent.AccentState = ACCENT_ENABLE_BLURBEHIND if enable else ACCENT_DISABLED
     
     data = WINDOWCOMPOSITIONATTRIBDATA()
     data.Attribute = WCA_ACCENT_POLICY  # 액센트 정책을 설정하겠다고 지정
@@ -62,11 +74,159 @@ def apply_blur(hwnd):
         if not result:
             print(f"경고: 블러 효과 적용 실패 (hwnd: {hwnd})")
             print(f"      Windows 버전이 블러를 지원하지 않을 수 있습니다.")
+            return False
+        return True
     except AttributeError as e:
         print(f"오류: SetWindowCompositionAttribute 함수를 찾을 수 없습니다.")
         print(f"      이 기능은 Windows 10 이상에서만 지원됩니다.")
         print(f"      상세 오류: {e}")
+        return False
     except Exception as e:
         print(f"오류: 블러 효과 적용 중 예상치 못한 오류 발생")
         print(f"      hwnd: {hwnd}")
         print(f"      상세 오류: {type(e).__name__}: {e}")
+        return False
+
+# --- 계층(layered) 창을 뺀 화면 캡처 (Windows) ---
+WS_EX_LAYERED = 0x00080000
+GWL_EXSTYLE = -20
+SRCCOPY = 0x00CC0020
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+_gdi = None  # (user32, gdi32) 함수 원형을 설정한 DLL (처음 사용할 때 설정)
+
+
+def _win32_gdi():
+    """핸들을 포인터 크기로 주고받도록 함수 원형을 설정한 user32, gdi32를 반환합니다.
+
+    기본 반환형(c_int)을 쓰면 64비트에서 DC/비트맵 핸들이 잘립니다.
+    """
+    global _gdi
+    if _gdi is None:
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        gdi32 = ctypes.windll.gdi32
+        handle = ctypes.c_void_p
+        user32.GetDC.argtypes = [handle]
+        user32.GetDC.restype = handle
+        user32.ReleaseDC.argtypes = [handle, handle]
+        user32.GetWindowLongW.argtypes = [handle, ctypes.c_int]
+        user32.GetWindowLongW.restype = ctypes.c_long
+        user32.GetWindowRect.argtypes = [handle, ctypes.POINTER(wintypes.RECT)]
+        gdi32.CreateCompatibleDC.argtypes = [handle]
+        gdi32.CreateCompatibleDC.restype = handle
+        gdi32.CreateCompatibleBitmap.argtypes = [handle, ctypes.c_int, ctypes.c_int]
+        gdi32.CreateCompatibleBitmap.restype = handle
+        gdi32.SelectObject.argtypes = [handle, handle]
+        gdi32.SelectObject.restype = handle
+        gdi32.BitBlt.argtypes = [handle, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                 handle, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        gdi32.GetDIBits.argtypes = [handle, handle, wintypes.UINT, wintypes.UINT,
+                                    ctypes.c_void_p, ctypes.c_void_p, wintypes.UINT]
+        gdi32.DeleteObject.argtypes = [handle]
+        gdi32.DeleteDC.argtypes = [handle]
+        _gdi = (user32, gdi32)
+    return _gdi
+
+
+def is_layered_window(hwnd):
+    """창이 계층(WS_EX_LAYERED) 창인지 반환합니다 (Windows가 아니면 False).
+
+    반투명 배경의 프레임 없는 Qt 창은 계층 창으로 만들어집니다.
+    """
+    if sys.platform != 'win32':
+        return False
+    try:
+        user32, _ = _win32_gdi()
+        return bool(user32.GetWindowLongW(hwnd, GWL_EXSTYLE) & WS_EX_LAYERED)
+    except Exception as e:
+        print(f"경고: 창 스타일 확인 실패 (hwnd: {hwnd}): {type(e).__name__}: {e}")
+        return False
+
+
+def window_origin(hwnd):
+    """창의 왼쪽 위 화면 좌표(물리 픽셀)를 반환합니다 (실패 시 None)."""
+    if sys.platform != 'win32':
+        return None
+    from ctypes import wintypes
+
+    try:
+        user32, _ = _win32_gdi()
+        rect = wintypes.RECT()
+        if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            return None
+    except Exception as e:
+        print(f"경고: 창 위치 확인 실패 (hwnd: {hwnd}): {type(e).__name__}: {e}")
+        return None
+    return rect.left, rect.top
+
+
+def grab_screen_below_layered(x, y, width, height):
+    """계층 창을 뺀 화면 영역을 캡처합니다 (Windows 전용).
+
+    화면 DC에서 CAPTUREBLT 없이 BitBlt하면 계층 창이 그려지지 않은 화면을 얻습니다.
+    가리개 창은 계층 창이므로 가리개를 숨기거나 캡처에서 제외하지 않고도
+    가리개 아래의 내용만 캡처할 수 있습니다. 화면 공유/녹화 프로그램은 합성된 화면을
+    캡처하므로 가리개는 그대로 보입니다.
+
+    Args:
+        x, y, width, height (int): 가상 화면 기준 물리 픽셀 좌표.
+
+    Returns:
+        bytes: 위에서 아래 행 순서의 BGRX 픽셀 (한 행에 width * 4바이트). 실패하면 None.
+    """
+    if sys.platform != 'win32' or width <= 0 or height <= 0:
+        return None
+
+    class BITMAPINFOHEADER(ctypes.Structure):
+        _fields_ = [
+            ("biSize", ctypes.c_uint32),
+            ("biWidth", ctypes.c_int32),
+            ("biHeight", ctypes.c_int32),
+            ("biPlanes", ctypes.c_uint16),
+            ("biBitCount", ctypes.c_uint16),
+            ("biCompression", ctypes.c_uint32),
+            ("biSizeImage", ctypes.c_uint32),
+            ("biXPelsPerMeter", ctypes.c_int32),
+            ("biYPelsPerMeter", ctypes.c_int32),
+            ("biClrUsed", ctypes.c_uint32),
+            ("biClrImportant", ctypes.c_uint32),
+        ]
+
+    try:
+        user32, gdi32 = _win32_gdi()
+    except Exception as e:
+        print(f"경고: GDI 함수를 불러오지 못했습니다: {type(e).__name__}: {e}")
+        return None
+
+    screen_dc = user32.GetDC(None)
+    memory_dc = gdi32.CreateCompatibleDC(screen_dc)
+    bitmap = gdi32.CreateCompatibleBitmap(screen_dc, width, height)
+    try:
+        previous = gdi32.SelectObject(memory_dc, bitmap)
+        # CAPTUREBLT를 주지 않아야 계층 창(가리개)이 캡처에서 빠짐
+        copied = gdi32.BitBlt(memory_dc, 0, 0, width, height, screen_dc, x, y, SRCCOPY)
+        # GetDIBits는 DC에 선택되지 않은 비트맵에만 사용할 수 있음
+        gdi32.SelectObject(memory_dc, previous)
+        if not copied:
+            return None
+
+        header = BITMAPINFOHEADER()
+        header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height  # 음수: 위에서 아래 행 순서
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = BI_RGB
+        buffer = ctypes.create_string_buffer(width * height * 4)
+        rows = gdi32.GetDIBits(memory_dc, bitmap, 0, height, buffer, ctypes.byref(header),
+                               DIB_RGB_COLORS)
+        if rows != height:
+            return None
+        return buffer.raw
+    finally:
+        gdi32.DeleteObject(bitmap)
+        gdi32.DeleteDC(memory_dc)
+        user32.ReleaseDC(None, screen_dc)
@@ -1,26 +1,60 @@
 # viewport.py
 
 import sys
+from functools import partial
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QCloseEvent
+from PySide6.QtCore import Qt, Signal, QRect, QPoint
+from PySide6.QtGui import QCloseEvent, QPainter
 
 from .utils import apply_blur
+from .screen_capture import BelowCapture
+from .blur_pipeline import (BlurPipeline, DEFAULT_STRENGTH,
+                            MODE_BLUR, RENDER_MODES,
+                            AUTO_DOWNSCALE, MAX_DOWNSCALE)
+from .soft_blur import DEFAULT_BLOCK_SIZE
+from .cover_shape import shape_path, shape_region
+from .refresh_scheduler import default_scheduler
+from .blur_workers import default_blur_pool
+from .instrumentation import timed
 
 class Viewport(QWidget):
     """화면의 특정 영역을 흐리게 표시하는 가리개 위젯"""
 
     # 시그널 정의: 가리개가 닫히기 직전에 발생
     closing = Signal()
+    # 시그널 정의: 위치나 크기가 바뀌었을 때 새 전역 geometry를 전달
+    geometry_changed = Signal(QRect)
 
-    def __init__(self):
-        """생성자: 가리개 창의 시각적 속성만 설정합니다."""
+    def __init__(self, scheduler=None, blur_pool=None):
+        """생성자: 가리개 창의 시각적 속성만 설정합니다.
+
+        Args:
+            scheduler (RefreshScheduler, optional): 소프트웨어 블러 갱신 스케줄러.
+                                                    생략하면 공유 기본 스케줄러를 사용합니다.
+            blur_pool (BlurWorkerPool, optional): 블러 계산 스레드 풀.
+                                                  생략하면 공유 기본 풀을 사용합니다.
+        """
         super().__init__()
 
         # --- 상태 변수 초기화 ---
         self.is_locked = False  # 위치/크기 잠금 통합
         self._blur_applied = False  # 블러 효과 적용 여부
 
+        # --- 소프트웨어 블러 상태 ---
+        # 아크릴 API를 쓸 수 없는 환경(Linux 등)과 모자이크 모드에서 사용
+        self.blur_pipeline = BlurPipeline()
+        # 작업 스레드의 블러 결과가 반영되면 다시 그림
+        self.blur_pipeline.on_frame = self.update
+        self.blur_pool = blur_pool or default_blur_pool()
+        self._software_blur = False
+        # 가리개를 숨기거나 캡처에서 제외하지 않고 가리개 아래 화면만 캡처
+        self.below = BelowCapture(self)
+        self._acrylic_available = None  # 아크릴 API 사용 가능 여부 (처음 적용해 볼 때까지 모름)
+        self.scheduler = scheduler or default_scheduler()
+        self.refresh_class = "interactive"  # video / interactive / static
+        # 작업 스레드가 쓴 블러 계산 시간도 스케줄러의 CPU 예산에 포함
+        self.blur_pipeline.on_job_cost = partial(self.scheduler.report_cost, self)
+
         # --- 창 기본 속성 설정 ---
         # 항상 위에 표시는 필수 기능이므로 항상 활성화
         self.setWindowFlags(
@@ -34,18 +68,227 @@ class Viewport(QWidget):
 
         self.setGeometry(200, 200, 500, 400)
 
+    def prepare(self):
+        """네이티브 창을 만들고 블러 효과를 미리 적용합니다 (표시하지 않음).
+
+        창 풀이 가리개를 미리 만들어 둘 때 사용하며, 이후 showEvent에서는 이 단계를 건너뜁니다.
+        """
+        if self._blur_applied:
+            return
+        self._apply_render_path()
+        self._blur_applied = True
+
+    def _apply_render_path(self):
+        """표시 방식에 맞춰 아크릴 블러와 소프트웨어 렌더링 중 하나를 적용합니다.
+
+        모자이크는 아크릴 API로 표현할 수 없으므로 항상 소프트웨어로 그립니다.
+        """
+        hwnd = int(self.winId())
+        use_acrylic = self.blur_pipeline.mode == MODE_BLUR and self._acrylic_available is not False
+        if use_acrylic:
+            self._acrylic_available = apply_blur(hwnd)
+            use_acrylic = self._acrylic_available
+        elif self._acrylic_available and not self._software_blur:
+            # 아크릴 효과가 켜져 있던 창을 소프트웨어 렌더링으로 전환
+            apply_blur(hwnd, enable=False)
+
+        if use_acrylic == (not self._software_blur):
+            return  # 경로가 그대로
+
+        self._software_blur = not use_acrylic
+        if self._software_blur:
+            if self.isVisible():
+                self.scheduler.register(self, self.refresh_class)
+        else:
+            self.scheduler.unregister(self)
+            self.blur_pipeline.release()
+            self.update()
+
+    def reset(self):
+        """재사용을 위해 상태를 새 가리개와 같게 되돌립니다. 네이티브 창과 블러 적용 상태는 유지합니다."""
+        self.is_locked = False
+        self.set_shape(None)
+        self.blur_pipeline.release()
+        self.blur_pipeline.strength = DEFAULT_STRENGTH
+        self.blur_pipeline.block_size = DEFAULT_BLOCK_SIZE
+        self.blur_pipeline.downscale = AUTO_DOWNSCALE
+        if self.blur_pipeline.mode != MODE_BLUR:
+            self.set_render_mode(MODE_BLUR)
+        self.refresh_class = "interactive"
+
     # --- 외부에서 호출될 슬롯(Setter) 메서드들 ---
     def set_lock(self, checked):
         """'고정' 상태를 설정합니다 (위치와 크기 모두 고정)."""
         self.is_locked = checked
 
+    def set_blur_strength(self, strength):
+        """소프트웨어 블러 강도(시그마)를 설정합니다."""
+        self.blur_pipeline.strength = max(0, int(strength))
+        self.scheduler.wake(self)
+
+    @property
+    def blur_strength(self):
+        """소프트웨어 블러 강도 (가우시안 시그마, 픽셀)"""
+        return self.blur_pipeline.strength
+
+    def set_render_mode(self, mode):
+        """표시 방식(blur/pixelate)을 바꿉니다."""
+        if mode not in RENDER_MODES:
+            raise ValueError(f"알 수 없는 표시 방식: {mode}")
+        if mode == self.blur_pipeline.mode:
+            return
+        self.blur_pipeline.mode = mode
+        if self._blur_applied:
+            self._apply_render_path()
+        self.scheduler.wake(self)
+
+    @property
+    def render_mode(self):
+        """표시 방식 (blur / pixelate)"""
+        return self.blur_pipeline.mode
+
+    def set_block_size(self, block_size):
+        """모자이크 블록 크기(픽셀)를 설정합니다."""
+        self.blur_pipeline.block_size = max(2, int(block_size))
+        self.scheduler.wake(self)
+
+    @property
+    def block_size(self):
+        """모자이크 블록 크기 (픽셀)"""
+        return self.blur_pipeline.block_size
+
+    def set_downscale(self, downscale):
+        """소프트웨어 블러를 1/n 해상도로 계산하도록 설정합니다 (0이면 자동)."""
+        self.blur_pipeline.downscale = max(0, min(MAX_DOWNSCALE, int(downscale)))
+        self.scheduler.wake(self)
+
+    @property
+    def downscale(self):
+        """소프트웨어 블러 축소 배율 (0이면 자동)"""
+        return self.blur_pipeline.downscale
+
+    def set_shape(self, shape):
+        """가리개 모양(cover_shape.CoverShape)을 설정합니다. None이면 사각형입니다.
+
+        창 마스크를 모양에 맞춰 아크릴 블러도 모양 밖에는 적용되지 않게 합니다.
+        """
+        if shape == self.blur_pipeline.shape:
+            return
+        self.blur_pipeline.shape = shape
+        self._apply_shape_mask()
+        self.update()
+        self.scheduler.wake(self)
+
+    @property
+    def shape(self):
+        """가리개 모양 (사각형이면 None)"""
+        return self.blur_pipeline.shape
+
+    def _apply_shape_mask(self):
+        if self.shape is None:
+            self.clearMask()
+        else:
+            self.setMask(shape_region(self.shape, self.width(), self.height()))
+
+    def set_refresh_class(self, fps_class):
+        """소프트웨어 블러 갱신 등급(video/interactive/static)을 설정합니다."""
+        self.refresh_class = fps_class
+        self.scheduler.set_fps_class(self, fps_class)
+
+    @property
+    def uses_software_blur(self):
+        """아크릴 API 대신 소프트웨어 블러로 그리는 중인지 여부"""
+        return self._software_blur
+
+    # --- 위치/크기 변경 ---
+    # 가리개 아래를 직접 캡처할 수 없는 플랫폼에서는 옮기기 직전(아직 화면에 옛 위치로
+    # 그려져 있을 때)에 새 영역을 캡처해야 하므로 Python에서 호출하는 move/setGeometry를 가로챔
+    def move(self, *args):
+        target = args[0] if len(args) == 1 else QPoint(*args)
+        self._before_geometry_change(QRect(target, self.size()))
+        super().move(*args)
+
+    def setGeometry(self, *args):
+        self._before_geometry_change(QRect(*args))
+        super().setGeometry(*args)
+
+    def _before_geometry_change(self, rect):
+        if self._software_blur and self.isVisible() and rect != self.geometry():
+            self.below.before_move(rect)
+
+    # --- 소프트웨어 블러 ---
+    def _capture_source(self):
+        """가리개 아래의 화면 영역을 캡처해 QImage로 반환합니다 (가리개는 계속 보이는 상태)."""
+        return self.below.capture(self.geometry())
+
+    def refresh_blur(self):
+        """뒤 화면을 다시 캡처하여 블러 결과를 갱신합니다.
+
+        이전 프레임과 비교해 바뀐 타일(과 블러 반경만큼의 주변)만 다시 블러합니다.
+        블러 계산은 작업 스레드에서 실행되고, 끝나면 on_frame(update)으로 다시 그려집니다.
+
+        Returns:
+            bool: 화면 내용이 바뀌어 블러 작업을 제출했으면 True.
+        """
+        if not self._software_blur or not self.isVisible():
+            return False
+
+        source = self._capture_source()
+        if source is None:
+            return False
+
+        return self.blur_pipeline.submit(source, self.blur_pool)
+
+    @timed("viewport.paint")
+    def paintEvent(self, event):
+        """소프트웨어 블러 사용 시 마지막 블러 결과를 그립니다."""
+        frame = self.blur_pipeline.frame
+        if not self._software_blur or frame is None:
+            return
+        painter = QPainter(self)
+        # 축소 해상도로 계산한 결과를 창 크기로 늘려 그림
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.blur_pipeline.smooth_scaling)
+        if self.shape is not None:
+            painter.setClipPath(shape_path(self.shape, self.width(), self.height()))
+        painter.drawImage(self.rect(), frame)
+
     def showEvent(self, event):
         """가리개가 표시될 때 블러 효과를 적용합니다."""
         super().showEvent(event)
-        if not self._blur_applied:
-            # 윈도우가 완전히 생성된 후 블러 효과 적용
-            apply_blur(self.winId())
-            self._blur_applied = True
+        # 윈도우가 완전히 생성된 후 블러 효과 적용 (창 풀에서 꺼낸 가리개는 이미 적용됨)
+        self.prepare()
+
+        if self._software_blur:
+            # showEvent는 창이 실제로 화면에 나타나기 전에 오므로 아직 가리개가 없는 화면을 얻음
+            self.below.before_show(self.geometry())
+            # 첫 캡처는 스케줄러의 다음 틱에서 수행 (여러 가리개를 한꺼번에 표시할 때
+            # showEvent 안에서 캡처/블러가 줄줄이 실행되지 않도록)
+            self.scheduler.register(self, self.refresh_class)
+
+    def hideEvent(self, event):
+        """가리개가 숨겨지면 소프트웨어 블러 갱신을 멈추고 진행 중인 결과는 버립니다."""
+        super().hideEvent(event)
+        self.scheduler.unregister(self)
+        self.blur_pipeline.invalidate()
+        self.below.reset()
+
+    @timed("viewport.move")
+    def moveEvent(self, event):
+        """이동하면 뒤 화면이 바뀌므로 진행 중인 결과는 버리고 즉시 갱신을 요청합니다."""
+        super().moveEvent(event)
+        self.blur_pipeline.invalidate()
+        self.scheduler.wake(self)
+        self.geometry_changed.emit(self.geometry())
+
+    @timed("viewport.resize")
+    def resizeEvent(self, event):
+        """크기가 바뀌면 진행 중인 결과는 버리고 즉시 갱신을 요청합니다."""
+        super().resizeEvent(event)
+        if self.shape is not None:
+            self._apply_shape_mask()
+        self.blur_pipeline.invalidate()
+        self.scheduler.wake(self)
+        self.geometry_changed.emit(self.geometry())
 
     def closeEvent(self, event: QCloseEvent):
         """가리개가 닫히기 전에 closing 시그널을 발생시킵니다."""
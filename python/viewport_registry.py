@@ -0,0 +1,193 @@
+# viewport_registry.py
+
+"""
+여러 가리개를 관리하는 레지스트리
+
+가리개(Viewport)와 입력 창(InteractionHandler) 쌍을 ID로 보관하고,
+균일 격자(uniform grid) 공간 인덱스로 "이 점/사각형과 겹치는 가리개"를
+전체 목록을 훑지 않고 찾아줍니다.
+"""
+
+from collections import defaultdict
+from functools import partial
+from PySide6.QtCore import QRect, QPoint
+
+
+def _rect_bounds(rect):
+    """QRect를 (x0, y0, x1, y1) 반열린 구간 튜플로 변환합니다."""
+    return (rect.x(), rect.y(), rect.x() + rect.width(), rect.y() + rect.height())
+
+
+class SpatialGrid:
+    """사각형들을 고정 크기 셀에 나누어 담는 균일 격자 공간 인덱스
+
+    질의 비용은 전체 사각형 수가 아니라 질의 영역이 걸치는 셀 수와
+    그 셀에 들어 있는 사각형 수에만 비례합니다.
+    """
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)  # (셀 x, 셀 y) -> 키 집합
+        self._bounds = {}               # 키 -> (x0, y0, x1, y1)
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, key):
+        return key in self._bounds
+
+    def _cells_for(self, bounds):
+        """영역이 걸치는 셀 좌표들을 순회합니다."""
+        x0, y0, x1, y1 = bounds
+        size = self.cell_size
+        for cy in range(y0 // size, (max(y1, y0 + 1) - 1) // size + 1):
+            for cx in range(x0 // size, (max(x1, x0 + 1) - 1) // size + 1):
+                yield (cx, cy)
+
+    def insert(self, key, rect):
+        """키의 사각형을 추가하거나, 이미 있으면 위치를 갱신합니다."""
+        bounds = _rect_bounds(rect)
+        old = self._bounds.get(key)
+        if old == bounds:
+            return
+        if old is not None:
+            self.remove(key)
+        self._bounds[key] = bounds
+        for cell in self._cells_for(bounds):
+            self._cells[cell].add(key)
+
+    def remove(self, key):
+        """키를 인덱스에서 제거합니다."""
+        bounds = self._bounds.pop(key, None)
+        if bounds is None:
+            return
+        for cell in self._cells_for(bounds):
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+
+    def bounds(self, key):
+        """저장된 (x0, y0, x1, y1)을 반환합니다."""
+        return self._bounds.get(key)
+
+    def query_rect(self, rect):
+        """사각형과 겹치는 키 집합을 반환합니다."""
+        qx0, qy0, qx1, qy1 = bounds = _rect_bounds(rect)
+        candidates = set()
+        for cell in self._cells_for(bounds):
+            keys = self._cells.get(cell)
+            if keys:
+                candidates |= keys
+
+        result = set()
+        for key in candidates:
+            x0, y0, x1, y1 = self._bounds[key]
+            if x0 < qx1 and qx0 < x1 and y0 < qy1 and qy0 < y1:
+                result.add(key)
+        return result
+
+    def query_point(self, point):
+        """점을 포함하는 키 집합을 반환합니다."""
+        px, py = point.x(), point.y()
+        keys = self._cells.get((px // self.cell_size, py // self.cell_size), ())
+        result = set()
+        for key in keys:
+            x0, y0, x1, y1 = self._bounds[key]
+            if x0 <= px < x1 and y0 <= py < y1:
+                result.add(key)
+        return result
+
+
+class CoverEntry:
+    """레지스트리에 등록된 가리개 하나 (Viewport + InteractionHandler 쌍)"""
+
+    __slots__ = ("cover_id", "viewport", "handler", "geometry_slot")
+
+    def __init__(self, cover_id, viewport, handler):
+        self.cover_id = cover_id
+        self.viewport = viewport
+        self.handler = handler
+        self.geometry_slot = None  # geometry_changed에 연결된 슬롯 (해제용)
+
+
+class ViewportRegistry:
+    """여러 가리개를 ID로 관리하고 공간 질의를 제공하는 레지스트리"""
+
+    def __init__(self, cell_size=256):
+        self._entries = {}        # cover_id -> CoverEntry
+        self._by_viewport = {}    # id(viewport) -> cover_id
+        self._next_id = 1
+        self.index = SpatialGrid(cell_size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        """등록 순서(아래에서 위로 쌓인 순서)대로 CoverEntry를 순회합니다."""
+        return iter(list(self._entries.values()))
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def add(self, viewport, handler):
+        """가리개 쌍을 등록하고 ID를 반환합니다.
+
+        가리개가 이동/크기 변경될 때마다 공간 인덱스가 자동으로 갱신됩니다.
+        """
+        cover_id = self._next_id
+        self._next_id += 1
+
+        entry = CoverEntry(cover_id, viewport, handler)
+        entry.geometry_slot = partial(self.update_geometry, cover_id)
+        self._entries[cover_id] = entry
+        self._by_viewport[id(viewport)] = cover_id
+        self.index.insert(cover_id, viewport.geometry())
+        viewport.geometry_changed.connect(entry.geometry_slot)
+        return cover_id
+
+    def remove(self, cover_id):
+        """가리개를 레지스트리에서 제거하고 CoverEntry를 반환합니다 (창은 닫지 않음)."""
+        entry = self._entries.pop(cover_id, None)
+        if entry is None:
+            return None
+        self._by_viewport.pop(id(entry.viewport), None)
+        self.index.remove(cover_id)
+        try:
+            entry.viewport.geometry_changed.disconnect(entry.geometry_slot)
+        except (RuntimeError, TypeError):
+            pass
+        return entry
+
+    def remove_viewport(self, viewport):
+        """Viewport 객체로 가리개를 찾아 제거합니다."""
+        cover_id = self._by_viewport.get(id(viewport))
+        if cover_id is None:
+            return None
+        return self.remove(cover_id)
+
+    def get(self, cover_id):
+        return self._entries.get(cover_id)
+
+    def id_of(self, viewport):
+        """Viewport 객체의 가리개 ID를 반환합니다 (없으면 None)."""
+        return self._by_viewport.get(id(viewport))
+
+    def update_geometry(self, cover_id, rect):
+        """가리개의 위치/크기 변경을 공간 인덱스에 반영합니다."""
+        if cover_id in self._entries:
+            self.index.insert(cover_id, rect)
+
+    def covers_in(self, rect: QRect):
+        """사각형과 겹치는 가리개들을 아래에서 위 순서로 반환합니다."""
+        return [self._entries[cid] for cid in sorted(self.index.query_rect(rect))]
+
+    def covers_at(self, point: QPoint):
+        """점을 포함하는 가리개들을 위에서 아래 순서(최근 생성 우선)로 반환합니다."""
+        return [self._entries[cid] for cid in sorted(self.index.query_point(point), reverse=True)]
+
+    def close_all(self):
+        """등록된 모든 가리개를 닫습니다."""
+        for entry in self:
+            entry.viewport.close()
@@ -0,0 +1,26 @@
+# conftest.py
+
+"""
+테스트 공통 설정
+
+디스플레이 없이 실행되도록 Qt offscreen 플랫폼을 사용하고, 저장소 루트를 import 경로에 추가합니다.
+위젯과 QImage/QPainter를 쓰는 테스트를 위해 세션 동안 QApplication 하나를 유지합니다.
+"""
+
+import os
+import sys
+
+# Qt가 import되기 전에 설정해야 함
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def qt_app():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
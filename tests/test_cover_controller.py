@@ -0,0 +1,64 @@
+# test_cover_controller.py
+
+"""cover_controller: 가리개 생성/변경 시그널"""
+
+import sys
+
+import pytest
+from PySide6.QtCore import QObject, QRect, Signal
+
+from python.cover_controller import CoverController
+
+
+class _Probe(QObject):
+    fired = Signal(int)
+
+
+def _emit_leaks_bool():
+    """설치된 PySide6가 emit()의 반환값(bool)을 과하게 해제하는지 확인합니다."""
+    probe = _Probe()
+    before = sys.getrefcount(True)
+    for i in range(20):
+        probe.fired.emit(i)
+    return sys.getrefcount(True) < before
+
+
+@pytest.fixture
+def controller(qt_app):
+    if _emit_leaks_bool():
+        pytest.fail("설치된 PySide6가 Signal.emit()의 반환값을 과하게 해제합니다 "
+                    "(requirements.txt의 버전을 사용하세요)")
+    controller = CoverController(0)
+    yield controller
+    controller.shutdown()
+    controller.deleteLater()
+    qt_app.processEvents()
+
+
+def test_cover_created_comes_before_cover_changed(qt_app, controller):
+    events = []
+    controller.cover_created.connect(lambda cover_id: events.append(("created", cover_id)))
+    controller.cover_changed.connect(lambda cover_id, rect: events.append(("changed", cover_id)))
+
+    cover_id = controller.create_cover(QRect(50, 50, 300, 200))
+    qt_app.processEvents()
+    assert events[0] == ("created", cover_id)
+
+
+def test_moving_a_cover_many_times_keeps_bool_refcount(qt_app, controller):
+    # 회귀: 시그널 emit을 슬롯으로 직접 연결하면 이동마다 True의 참조 수가 줄어 결국 중단됨
+    changes = []
+    controller.cover_changed.connect(lambda cover_id, rect: changes.append(rect))
+    cover_id = controller.create_cover(QRect(50, 50, 300, 200))
+    qt_app.processEvents()
+
+    before = sys.getrefcount(True)
+    for i in range(1200):
+        controller.update_cover(cover_id, rect=QRect(50 + i % 300, 50 + i % 7, 300, 200))
+        if i % 50 == 0:
+            qt_app.processEvents()
+    qt_app.processEvents()
+
+    assert len(changes) >= 1000
+    assert sys.getrefcount(True) >= before - 10
+    assert controller.viewports.get(cover_id).viewport.geometry() == QRect(50 + 1199 % 300, 50 + 1199 % 7, 300, 200)
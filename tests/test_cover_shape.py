@@ -0,0 +1,65 @@
+# test_cover_shape.py
+
+"""cover_shape: 가리개 모양 생성, 저장 형식, 래스터 마스크"""
+
+import numpy as np
+import pytest
+
+from python.cover_shape import (make_shape, shape_to_data, shape_from_data, shape_mask,
+                                shape_region, CoverShape, SHAPE_ELLIPSE, SHAPE_POLYGON)
+
+
+def _mask_array(image):
+    width, height = image.width(), image.height()
+    data = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.sizeInBytes())
+    return data.reshape(height, image.bytesPerLine())[:, :width]
+
+
+def test_rect_is_no_shape():
+    assert make_shape("rect") is None
+    assert shape_to_data(None) is None
+    assert shape_from_data(None) is None
+
+
+def test_polygon_points_are_rounded_and_hashable():
+    shape = make_shape("polygon", [(0, 0), (1, 0), (0.333333333, 1)])
+    assert shape == CoverShape(SHAPE_POLYGON, ((0.0, 0.0), (1.0, 0.0), (0.3333, 1.0)))
+    # 캐시 키로 쓰이므로 해시 가능해야 함
+    assert hash(shape) == hash(make_shape("polygon", shape.points))
+
+
+@pytest.mark.parametrize("kind, points", [("unknown", ()), ("polygon", [(0, 0), (1, 1)])])
+def test_invalid_shapes_raise_value_error(kind, points):
+    with pytest.raises(ValueError):
+        make_shape(kind, points)
+
+
+@pytest.mark.parametrize("shape", [
+    make_shape("ellipse"),
+    make_shape("rounded"),
+    make_shape("polygon", [(0, 0), (1, 0.5), (0, 1)]),
+])
+def test_data_round_trip(shape):
+    assert shape_from_data(shape_to_data(shape)) == shape
+
+
+@pytest.mark.parametrize("data", ["ellipse", [], ["polygon", 0, 0, 1]])
+def test_invalid_data_raises_value_error(data):
+    with pytest.raises(ValueError):
+        shape_from_data(data)
+
+
+def test_ellipse_mask_covers_center_not_corners():
+    mask = _mask_array(shape_mask(make_shape(SHAPE_ELLIPSE), 101, 61))
+    assert mask.shape == (61, 101)
+    assert mask[30, 50] == 255
+    assert mask[0, 0] == 0 and mask[60, 100] == 0
+    # 타원 넓이 비율 pi / 4
+    assert abs((mask > 127).mean() - np.pi / 4) < 0.03
+
+
+def test_region_matches_polygon():
+    region = shape_region(make_shape("polygon", [(0, 0), (1, 0), (0, 1)]), 100, 100)
+    assert region.contains(region.boundingRect().topLeft())
+    bounds = region.boundingRect()
+    assert bounds.width() <= 100 and bounds.height() <= 100
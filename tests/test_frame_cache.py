@@ -0,0 +1,79 @@
+# test_frame_cache.py
+
+"""frame_cache: 블러 결과 LRU 캐시"""
+
+import numpy as np
+
+from python.frame_cache import FrameCache, content_signature
+
+
+def _frame(value, size=10):
+    return np.full((size, size, 4), value, dtype=np.uint8)
+
+
+def test_content_signature_depends_on_values():
+    signature = np.arange(12, dtype=np.uint32).reshape(3, 4)
+    changed = signature.copy()
+    changed[2, 3] += 1
+    assert len(content_signature(signature)) == 16
+    assert content_signature(signature) == content_signature(signature.copy())
+    assert content_signature(signature) != content_signature(changed)
+    # 연속되지 않은 배열도 받음
+    assert content_signature(signature[:, ::2]) == content_signature(signature[:, ::2].copy())
+
+
+def test_make_key_includes_shape_and_params():
+    signature = np.zeros((2, 2), dtype=np.uint32)
+    key = FrameCache.make_key(_frame(0), ("blur", 4.0, 2, None), signature)
+    assert key != FrameCache.make_key(_frame(0, 12), ("blur", 4.0, 2, None), signature)
+    assert key != FrameCache.make_key(_frame(0), ("blur", 5.0, 2, None), signature)
+
+
+def test_get_and_put_count_hits_and_freeze_arrays():
+    cache = FrameCache(max_bytes=10_000)
+    frame = _frame(1)
+    assert cache.get("a") is None
+    cache.put("a", frame)
+    assert cache.get("a") is frame
+    assert not frame.flags.writeable
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 400)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = FrameCache(max_bytes=1000)  # 400바이트 배열 두 개까지
+    cache.put("a", _frame(1))
+    cache.put("b", _frame(2))
+    cache.get("a")
+    cache.put("c", _frame(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_replacing_key_and_oversized_arrays():
+    cache = FrameCache(max_bytes=500)
+    cache.put("a", _frame(1))
+    cache.put("a", _frame(2))
+    assert len(cache) == 1 and cache.stats()["bytes"] == 400
+    cache.put("big", _frame(0, 20))
+    assert cache.get("big") is None
+
+
+def test_shrinking_and_disabling():
+    cache = FrameCache(max_bytes=10_000)
+    for key in range(5):
+        cache.put(key, _frame(key))
+    cache.set_max_bytes(800)
+    assert len(cache) == 2 and cache.get(4) is not None
+    cache.set_max_bytes(0)
+    assert len(cache) == 0
+    cache.put("a", _frame(1))
+    assert len(cache) == 0
+
+    cache.set_max_bytes(1000)
+    cache.put("a", _frame(1))
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["bytes"] == 0
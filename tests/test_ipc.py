@@ -0,0 +1,187 @@
+# test_ipc.py
+
+"""ipc: 실행 중인 인스턴스 제어 채널 (줄 단위 JSON 프로토콜, 응답 시간 제한, 인스턴스 잠금)"""
+
+import os
+import sys
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from python import ipc
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="Unix 도메인 소켓 경로만 검사")
+
+
+@pytest.fixture(autouse=True)
+def runtime(tmp_path, monkeypatch):
+    # 실제 사용자 디렉터리의 소켓/잠금 파일을 건드리지 않도록 임시 디렉터리를 사용
+    os.chmod(tmp_path, 0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _run_client(qt_app, commands):
+    """Qt 이벤트를 처리하면서 다른 스레드에서 send_commands()를 실행합니다."""
+    result = {}
+
+    def run():
+        try:
+            result["replies"] = ipc.send_commands(commands)
+        except ipc.IpcError as e:
+            result["error"] = e
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    deadline = time.monotonic() + 5.0
+    while worker.is_alive() and time.monotonic() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.001)
+    worker.join()
+    return result
+
+
+def _fake_server(path, respond):
+    """연결 하나를 받아 respond(sock)를 실행하는 Unix 소켓 서버를 시작합니다."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn:
+            respond(conn)
+        listener.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_server_name_is_in_private_runtime_dir(runtime):
+    assert ipc.server_name() == os.path.join(str(runtime), "screenblur-ipc.sock")
+
+
+def test_no_server_returns_none():
+    assert ipc.send_commands([{"cmd": "show"}]) is None
+
+
+def test_stale_socket_file_returns_none():
+    # 비정상 종료 후 남은 소켓 파일: 연결이 거부되면 서버 없음으로 봄
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(ipc.server_name())
+    stale.close()
+    assert ipc.send_commands([{"cmd": "show"}]) is None
+
+
+def test_round_trip_through_ipc_server(qt_app):
+    received = []
+
+    def handler(command):
+        received.append(command)
+        return {"ok": True, "echo": command["cmd"]}
+
+    server = ipc.IpcServer(handler)
+    assert server.listen()
+    try:
+        result = _run_client(qt_app, [{"cmd": "create", "rect": [1, 2, 3, 4]}, {"cmd": "가리개"}])
+    finally:
+        server.close()
+
+    assert result["replies"] == [{"ok": True, "echo": "create"}, {"ok": True, "echo": "가리개"}]
+    assert received[0] == {"cmd": "create", "rect": [1, 2, 3, 4]}
+
+
+def test_server_reports_bad_commands_and_handler_errors(qt_app):
+    def handler(command):
+        raise RuntimeError("boom")
+
+    server = ipc.IpcServer(handler)
+    assert server.listen()
+    try:
+        result = _run_client(qt_app, [{"no_cmd": 1}, {"cmd": "x"}])
+    finally:
+        server.close()
+
+    first, second = result["replies"]
+    assert not first["ok"] and "cmd" in first["error"]
+    assert second == {"ok": False, "error": "RuntimeError: boom"}
+
+
+def test_second_server_does_not_remove_live_socket(qt_app):
+    first = ipc.IpcServer(lambda command: {"ok": True})
+    assert first.listen()
+    try:
+        second = ipc.IpcServer(lambda command: {"ok": False})
+        assert not second.listen()
+        assert second.already_running
+        assert os.path.exists(ipc.server_name())
+        assert _run_client(qt_app, [{"cmd": "show"}])["replies"] == [{"ok": True}]
+    finally:
+        first.close()
+
+    # 첫 인스턴스가 닫히면 잠금이 풀려 다음 인스턴스가 서버를 열 수 있음
+    third = ipc.IpcServer(lambda command: {"ok": True})
+    assert third.listen()
+    third.close()
+
+
+def test_partial_lines_are_framed_by_newline():
+    def respond(conn):
+        conn.recv(4096)
+        # 응답을 두 번에 나눠 보내도 줄바꿈까지 한 응답으로 읽어야 함
+        conn.sendall(b'{"ok": tr')
+        time.sleep(0.05)
+        conn.sendall(b'ue}\nnot json\n')
+        conn.recv(4096)
+
+    thread = _fake_server(ipc.server_name(), respond)
+    replies = ipc.send_commands([{"cmd": "a"}, {"cmd": "b"}])
+    thread.join(2)
+    assert replies == [{"ok": True}, {"ok": False, "error": "잘못된 응답"}]
+
+
+def test_slow_server_raises_instead_of_reporting_no_server(monkeypatch):
+    monkeypatch.setattr(ipc, "REPLY_TIMEOUT", 0.2)
+    received = []
+    release = threading.Event()
+
+    def respond(conn):
+        received.append(conn.recv(4096))
+        release.wait(2)
+
+    thread = _fake_server(ipc.server_name(), respond)
+    with pytest.raises(ipc.IpcError):
+        ipc.send_commands([{"cmd": "load_layout", "name": "big"}])
+    release.set()
+    thread.join(2)
+    assert json.loads(received[0]) == {"cmd": "load_layout", "name": "big"}
+
+
+def test_wait_for_server_does_not_resend_after_timeout(monkeypatch):
+    calls = []
+
+    def send(commands):
+        calls.append(commands)
+        if len(calls) == 1:
+            return None
+        raise ipc.IpcError("응답 없음")
+
+    monkeypatch.setattr(ipc, "send_commands", send)
+    with pytest.raises(ipc.IpcError):
+        ipc.wait_for_server([{"cmd": "create"}], timeout=2.0, interval=0.01)
+    assert len(calls) == 2
+
+
+def test_instance_lock_is_exclusive(runtime):
+    path = os.path.join(str(runtime), "test.lock")
+    first, second = ipc.InstanceLock(path), ipc.InstanceLock(path)
+    assert first.acquire()
+    assert first.acquire()  # 이미 잡은 잠금은 그대로 성공
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
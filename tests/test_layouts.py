@@ -0,0 +1,60 @@
+# test_layouts.py
+
+"""layouts: 가리개 레이아웃 저장 형식"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from PySide6.QtCore import QRect
+
+from python.layouts import serialize_covers, parse_layout, LAYOUT_VERSION
+from python.cover_shape import make_shape
+
+
+def _entry(rect, locked=False, compositor=False, mode="blur", strength=12,
+           block_size=16, downscale=0, shape=None):
+    viewport = SimpleNamespace(geometry=lambda: rect, is_locked=locked, render_mode=mode,
+                               blur_strength=strength, block_size=block_size,
+                               downscale=downscale, shape=shape)
+    return SimpleNamespace(viewport=viewport, handler=None if compositor else object())
+
+
+def test_round_trip_through_json():
+    triangle = make_shape("polygon", [(0, 0), (1, 0), (0.5, 1)])
+    entries = [
+        _entry(QRect(10, 20, 300, 200)),
+        _entry(QRect(-50, 0, 80, 60), locked=True, compositor=True, mode="pixelate",
+               strength=4, block_size=24, downscale=2, shape=triangle),
+    ]
+    data = json.loads(json.dumps(serialize_covers(entries)))
+    assert data["v"] == LAYOUT_VERSION
+
+    first, second = parse_layout(data)
+    assert first.rect == QRect(10, 20, 300, 200)
+    assert (first.locked, first.compositor, first.pixelate) == (False, False, False)
+    assert (first.strength, first.block_size, first.downscale, first.shape) == (12, 16, 0, None)
+
+    assert second.rect == QRect(-50, 0, 80, 60)
+    assert (second.locked, second.compositor, second.pixelate) == (True, True, True)
+    assert (second.strength, second.block_size, second.downscale) == (4, 24, 2)
+    assert second.shape == triangle
+
+
+def test_older_entries_without_optional_fields():
+    specs = parse_layout({"v": LAYOUT_VERSION, "covers": [[0, 0, 100, 100, 1, 8]]})
+    assert len(specs) == 1
+    assert specs[0].locked and specs[0].strength == 8
+    assert (specs[0].block_size, specs[0].downscale, specs[0].shape) == (None, None, None)
+
+
+@pytest.mark.parametrize("data", [
+    {"v": LAYOUT_VERSION + 1, "covers": []},
+    {"covers": []},
+    [1, 2, 3],
+    {"v": LAYOUT_VERSION, "covers": [[0, 0, 100, 100]]},
+    {"v": LAYOUT_VERSION, "covers": [[0, 0, 10, 10, 0, 8, 16, 0, ["hexagon"]]]},
+])
+def test_invalid_layouts_raise_value_error(data):
+    with pytest.raises(ValueError):
+        parse_layout(data)
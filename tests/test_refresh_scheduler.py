@@ -0,0 +1,161 @@
+# test_refresh_scheduler.py
+
+"""refresh_scheduler: back-off, park, wake, CPU 예산"""
+
+import time
+
+import pytest
+
+from python.refresh_scheduler import RefreshScheduler
+
+
+class _Target:
+    """refresh_blur()가 정해진 변경 여부를 반환하는 가짜 가리개"""
+
+    def __init__(self, changed=False, on_refresh=None):
+        self.changed = changed
+        self.on_refresh = on_refresh
+        self.calls = 0
+
+    def refresh_blur(self):
+        self.calls += 1
+        if self.on_refresh is not None:
+            self.on_refresh(self)
+        return self.changed
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = RefreshScheduler()
+    yield scheduler
+    scheduler._timer.stop()
+
+
+def _run(scheduler):
+    """모든 항목을 지금 실행할 차례로 만들고 한 틱을 실행합니다."""
+    for entry in scheduler._entries.values():
+        entry.next_due = 0.0
+    scheduler._resume_at = 0.0
+    scheduler._run_due()
+
+
+def test_unchanged_content_backs_off_to_max_then_parks(scheduler):
+    target = _Target(changed=False)
+    scheduler.register(target, "video")
+    entry = scheduler._entries[id(target)]
+
+    intervals = []
+    while entry.interval < scheduler.MAX_INTERVAL:
+        _run(scheduler)
+        intervals.append(entry.interval)
+    # 매번 두 배씩 늘어나고 최대 간격에서 멈춤
+    assert intervals[0] == pytest.approx(2.0 / 30)
+    assert all(b == pytest.approx(min(a * 2.0, scheduler.MAX_INTERVAL))
+               for a, b in zip(intervals, intervals[1:]))
+
+    for _ in range(scheduler.PARK_AFTER - 1):
+        _run(scheduler)
+        assert not entry.parked
+    _run(scheduler)
+    assert entry.parked
+    assert scheduler.stats()["parked"] == 1
+    # 모두 잠들면 타이머도 멈춤
+    assert not scheduler._timer.isActive()
+
+    calls = target.calls
+    _run(scheduler)
+    assert target.calls == calls
+
+
+def test_wake_resets_backoff_and_parking(scheduler):
+    target = _Target(changed=False)
+    scheduler.register(target, "static")
+    entry = scheduler._entries[id(target)]
+    while not entry.parked:
+        _run(scheduler)
+
+    scheduler.wake(target)
+    assert not entry.parked
+    assert entry.interval == pytest.approx(0.5)
+    assert entry.idle_at_max == 0
+    assert scheduler._timer.isActive()
+
+
+def test_changed_content_resets_interval(scheduler):
+    target = _Target(changed=False)
+    scheduler.register(target, "interactive")
+    entry = scheduler._entries[id(target)]
+    for _ in range(3):
+        _run(scheduler)
+    assert entry.interval > entry.base_interval
+
+    target.changed = True
+    _run(scheduler)
+    assert entry.interval == entry.base_interval
+    assert entry.idle_at_max == 0
+
+
+def test_set_fps_class_changes_interval(scheduler):
+    target = _Target()
+    scheduler.register(target, "static")
+    scheduler.set_fps_class(target, "video")
+    assert scheduler._entries[id(target)].interval == pytest.approx(1.0 / 30)
+    with pytest.raises(ValueError):
+        scheduler.set_fps_class(target, "cinema")
+    with pytest.raises(ValueError):
+        scheduler.register(_Target(), "cinema")
+
+
+def test_budget_defers_expensive_targets_by_priority(scheduler):
+    cost = scheduler.frame_budget * 0.6
+    cheap = _Target(changed=True)
+    costly = [_Target(changed=True, on_refresh=lambda t: time.sleep(cost)) for _ in range(3)]
+    scheduler.register(cheap, "video")
+    for target in costly:
+        scheduler.register(target, "static")
+        scheduler._entries[id(target)].last_cost = cost
+
+    _run(scheduler)
+    # video 등급이 먼저, 그 뒤 예산 안에 드는 static 하나만 실행
+    assert cheap.calls == 1
+    assert [t.calls for t in costly] == [1, 0, 0]
+    assert scheduler.deferred == 2
+
+
+def test_first_target_runs_even_over_budget(scheduler):
+    target = _Target(changed=True)
+    scheduler.register(target, "video")
+    scheduler._entries[id(target)].last_cost = scheduler.frame_budget * 10
+    _run(scheduler)
+    assert target.calls == 1
+
+
+def test_worker_cost_counts_against_next_tick(scheduler):
+    first = _Target(changed=True, on_refresh=lambda t: scheduler.report_cost(t, scheduler.frame_budget * 2))
+    second = _Target(changed=True)
+    scheduler.register(first, "video")
+    scheduler.register(second, "static")
+
+    _run(scheduler)
+    assert (first.calls, second.calls) == (1, 1)
+    assert scheduler._entries[id(first)].last_cost >= scheduler.frame_budget * 2
+
+    # 지난 틱의 작업 스레드 시간이 예산을 넘었으므로 이번 틱은 모두 미룸
+    for entry in scheduler._entries.values():
+        entry.next_due = 0.0
+    scheduler._run_due()
+    assert (first.calls, second.calls) == (1, 1)
+    assert scheduler.stats()["background_ms"] == pytest.approx(16.0)
+
+    # 작업 스레드 시간이 쌓이지 않았으면 다시 실행
+    first.on_refresh = None
+    _run(scheduler)
+    assert first.calls == 2
+
+
+def test_unregister_during_refresh(scheduler):
+    target = _Target(changed=True, on_refresh=lambda t: scheduler.unregister(t))
+    scheduler.register(target)
+    _run(scheduler)
+    assert not scheduler.is_registered(target)
+    assert not scheduler._timer.isActive()
@@ -0,0 +1,114 @@
+# test_settings.py
+
+"""settings: 메모리 캐시, 쓰기 지연(write-behind) 저장, flush"""
+
+import json
+import time
+
+import pytest
+
+from python.settings import SettingsManager
+
+
+@pytest.fixture(autouse=True)
+def appdata(tmp_path, monkeypatch):
+    # 실제 사용자 설정 폴더를 건드리지 않도록 임시 폴더를 APPDATA로 사용
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    return tmp_path
+
+
+def _read(manager):
+    with open(manager.settings_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_defaults_without_file(appdata):
+    manager = SettingsManager()
+    assert manager.settings_file == appdata / "ScreenBlur" / "settings.json"
+    assert manager.get("minimize_to_tray") is True
+    assert manager.get("missing", 7) == 7
+    assert not manager.settings_file.exists()
+
+
+def test_immediate_mode_writes_on_set():
+    manager = SettingsManager(write_behind=False)
+    manager.set("blur_workers", 3)
+    assert _read(manager)["blur_workers"] == 3
+    # 다시 읽으면 저장된 값과 기본값이 병합됨
+    reloaded = SettingsManager(write_behind=False)
+    assert reloaded.get("blur_workers") == 3
+    assert reloaded.get("compositor_mode") is False
+
+
+def test_write_behind_coalesces_changes():
+    manager = SettingsManager(debounce_ms=50)
+    writes = []
+    original = manager._write_file
+    manager._write_file = lambda: (writes.append(1), original())[1]
+
+    for value in range(10):
+        manager.set("blur_workers", value)
+    # debounce 시간 안에는 파일을 쓰지 않음
+    assert not manager.settings_file.exists()
+
+    deadline = time.monotonic() + 5.0
+    while not manager.settings_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert _read(manager)["blur_workers"] == 9
+    assert len(writes) == 1
+
+
+def test_flush_writes_pending_changes_immediately():
+    manager = SettingsManager(debounce_ms=60_000)
+    manager.set("compositor_mode", True)
+    assert not manager.settings_file.exists()
+    manager.flush()
+    assert _read(manager)["compositor_mode"] is True
+    assert manager._save_timer is None
+    # 바뀐 것이 없으면 다시 쓰지 않음
+    manager.settings_file.unlink()
+    manager.flush()
+    assert not manager.settings_file.exists()
+
+
+def test_unchanged_value_does_not_schedule_save():
+    manager = SettingsManager(debounce_ms=60_000)
+    manager.set("minimize_to_tray", True)
+    assert manager._save_timer is None
+
+
+def test_list_values_are_copied():
+    manager = SettingsManager(write_behind=False)
+    layout = [{"x": 1}]
+    manager.set("layout", layout)
+    layout[0]["x"] = 2
+    assert manager.get("layout") == [{"x": 1}]
+
+    # 가져온 값을 고쳐서 다시 set()하면 변경으로 인식됨
+    value = manager.get("layout")
+    value[0]["x"] = 3
+    assert manager.get("layout") == [{"x": 1}]
+    manager.set("layout", value)
+    assert _read(manager)["layout"] == [{"x": 3}]
+
+
+def test_subscribers_receive_changes():
+    manager = SettingsManager(write_behind=False)
+    seen, every = [], []
+    manager.subscribe("blur_workers", lambda key, value: seen.append(value))
+    manager.subscribe(None, lambda key, value: every.append(key))
+    manager.subscribe("blur_workers", lambda key, value: 1 / 0)  # 실패해도 다른 알림은 계속됨
+
+    manager.set("blur_workers", 2)
+    manager.set("frame_cache_mb", 32)
+    assert seen == [2]
+    assert every == ["blur_workers", "frame_cache_mb"]
+
+
+def test_corrupt_file_falls_back_to_defaults(appdata):
+    folder = appdata / "ScreenBlur"
+    folder.mkdir()
+    (folder / "settings.json").write_text("{not json", encoding="utf-8")
+    manager = SettingsManager()
+    assert manager.get("minimize_to_tray") is True
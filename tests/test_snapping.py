@@ -0,0 +1,54 @@
+# test_snapping.py
+
+"""snapping.EdgeIndex: 드래그 중 가장자리 자석 맞춤"""
+
+from PySide6.QtCore import QRect, QPoint
+
+from python.snapping import EdgeIndex
+
+
+def test_snaps_to_nearby_edges():
+    index = EdgeIndex(threshold=8)
+    index.add_rect(QRect(0, 0, 1920, 1080))
+    assert len(index) == 4
+
+    # 왼쪽 위 모서리 근처 -> (0, 0)으로 붙음
+    assert index.snap(QRect(5, -6, 100, 100)) == QPoint(0, 0)
+    # 오른쪽 변이 화면 오른쪽 경계 근처 -> 오른쪽 변이 1920에 맞도록 이동
+    assert index.snap(QRect(1815, 500, 100, 100)) == QPoint(1820, 500)
+
+
+def test_out_of_threshold_does_not_move():
+    index = EdgeIndex(threshold=8)
+    index.add_rect(QRect(0, 0, 1920, 1080))
+    assert index.snap(QRect(20, 30, 100, 100)) == QPoint(20, 30)
+
+
+def test_closest_edge_wins():
+    index = EdgeIndex(threshold=10)
+    index.add_rect(QRect(100, 0, 50, 1000))   # 세로선 x=100, x=150
+    index.add_rect(QRect(104, 0, 50, 1000))   # 세로선 x=104, x=154
+    # 왼쪽 변 x=103: 104가 100보다 가까움
+    assert index.snap(QRect(103, 500, 40, 40)).x() == 104
+
+
+def test_ignores_edges_that_do_not_overlap_span():
+    index = EdgeIndex(threshold=8)
+    # x=500 세로선은 y 0~100에만 있음
+    index.add_rect(QRect(400, 0, 100, 100))
+    assert index.snap(QRect(503, 900, 50, 50)) == QPoint(503, 900)
+    assert index.snap(QRect(503, 50, 50, 50)) == QPoint(500, 50)
+
+
+def test_zero_threshold_disables_snapping():
+    index = EdgeIndex(threshold=0)
+    index.add_rect(QRect(0, 0, 100, 100))
+    assert index.snap(QRect(1, 1, 10, 10)) == QPoint(1, 1)
+
+
+def test_adding_rect_after_snap_rebuilds_index():
+    index = EdgeIndex(threshold=8)
+    index.add_rect(QRect(0, 0, 100, 100))
+    assert index.snap(QRect(300, 300, 10, 10)) == QPoint(300, 300)
+    index.add_rect(QRect(0, 0, 296, 296))
+    assert index.snap(QRect(300, 300, 10, 10)) == QPoint(296, 296)
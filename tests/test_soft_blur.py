@@ -0,0 +1,102 @@
+# test_soft_blur.py
+
+"""soft_blur: 박스 블러 근사와 모자이크(합 영역 테이블)"""
+
+import numpy as np
+import pytest
+
+from python.soft_blur import (box_kernel, blur_radius, blur_array, summed_area_table,
+                              pixelate_array, BlurEngine, PixelateEngine)
+
+
+def _random_pixels(height, width, channels=4, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, channels), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("strength", [0.5, 2, 7.25, 12, 40])
+def test_box_kernel_matches_gaussian_variance(strength):
+    # 박스 너비 w의 분산은 (w^2 - 1) / 12, 반복하면 분산이 더해짐
+    radii = box_kernel(strength)
+    variance = sum(((2 * r + 1) ** 2 - 1) / 12.0 for r in radii)
+    assert len(radii) == 3
+    assert abs(variance ** 0.5 - strength) < 1.0
+
+
+def test_box_kernel_without_strength():
+    assert box_kernel(0) == ()
+    assert blur_radius(0) == 0
+
+
+@pytest.mark.parametrize("value", [0, 1, 128, 254, 255])
+@pytest.mark.parametrize("strength", [1, 3, 12, 30, 80])
+def test_flat_frame_is_not_darkened(value, strength):
+    pixels = np.full((90, 120, 3), value, dtype=np.uint8)
+    assert np.array_equal(blur_array(pixels, strength), pixels)
+
+
+def test_blur_preserves_mean_brightness():
+    pixels = _random_pixels(120, 160, 3)
+    blurred = blur_array(pixels, 6)
+    assert blurred.shape == pixels.shape
+    assert blurred.dtype == np.uint8
+    assert abs(float(blurred.mean()) - float(pixels.mean())) < 1.0
+    # 흐리게 만들면 이웃 픽셀 차이가 줄어듦
+    assert np.abs(np.diff(blurred.astype(int), axis=1)).mean() < np.abs(np.diff(pixels.astype(int), axis=1)).mean()
+
+
+def test_wide_box_uses_wider_accumulator():
+    # 255 * 박스 너비가 uint16 범위를 넘는 강도에서도 평평한 값이 유지되어야 함
+    pixels = np.full((40, 40, 3), 255, dtype=np.uint8)
+    assert np.array_equal(blur_array(pixels, 200), pixels)
+
+
+@pytest.mark.parametrize("region", [(0, 64, 0, 64), (30, 70, 50, 130), (90, 120, 140, 160)])
+def test_blur_region_matches_full_blur(region):
+    engine = BlurEngine()
+    pixels = _random_pixels(120, 160)
+    full = engine.blur_pixels(pixels, 5)
+
+    out = np.zeros_like(pixels)
+    engine.blur_region(pixels, out, region, 5)
+    y0, y1, x0, x1 = region
+    assert np.array_equal(out[y0:y1, x0:x1], full[y0:y1, x0:x1])
+
+
+def test_blur_pixels_keeps_alpha_opaque():
+    pixels = _random_pixels(32, 32)
+    out = BlurEngine().blur_pixels(pixels, 3)
+    assert (out[:, :, 3] == 255).all()
+
+
+def test_summed_area_table_block_sums():
+    pixels = _random_pixels(37, 53, 3)
+    table = summed_area_table(pixels)
+    assert table.shape == (38, 54, 3)
+    assert np.array_equal(table[-1, -1], pixels.sum(axis=(0, 1)).astype(np.uint32))
+    block = table[30, 40] - table[10, 40] - table[30, 5] + table[10, 5]
+    assert np.array_equal(block, pixels[10:30, 5:40].sum(axis=(0, 1)))
+
+
+@pytest.mark.parametrize("block", [2, 7, 16])
+def test_pixelate_matches_block_means(block):
+    pixels = _random_pixels(45, 70, 3)
+    out = pixelate_array(pixels, block)
+    for y in range(0, 45, block):
+        for x in range(0, 70, block):
+            tile = pixels[y:y + block, x:x + block].astype(np.float64)
+            expected = np.floor(tile.mean(axis=(0, 1)) + 0.5)
+            assert (out[y:y + block, x:x + block] == expected).all()
+
+
+def test_pixelate_block_one_is_identity():
+    pixels = _random_pixels(10, 10, 3)
+    assert np.array_equal(pixelate_array(pixels, 1), pixels)
+
+
+def test_pixelate_region_matches_full():
+    engine = PixelateEngine()
+    pixels = _random_pixels(80, 100)
+    full = engine.blur_pixels(pixels, 12)
+    out = np.zeros_like(pixels)
+    engine.blur_region(pixels, out, (5, 50, 17, 91), 12)
+    assert np.array_equal(out[5:50, 17:91], full[5:50, 17:91])
@@ -0,0 +1,129 @@
+# test_template_matcher.py
+
+"""template_matcher: FFT + 적분 영상 NCC와 피라미드 탐색"""
+
+import numpy as np
+import pytest
+
+from python.template_matcher import (TemplateMatcher, Template, ncc_map, find_peaks,
+                                     integral_images, window_sums, to_gray, _fast_length)
+
+
+def _brute_ncc(image, template):
+    th, tw = template.shape
+    t = template - template.mean()
+    out = np.zeros((image.shape[0] - th + 1, image.shape[1] - tw + 1))
+    for y in range(out.shape[0]):
+        for x in range(out.shape[1]):
+            w = image[y:y + th, x:x + tw]
+            w = w - w.mean()
+            out[y, x] = (w * t).sum() / np.sqrt((w * w).sum() * (t * t).sum())
+    return out
+
+
+def _scene(seed=0, size=(160, 200)):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 255, size).astype(np.float32)
+
+
+@pytest.mark.parametrize("n", [1, 7, 17, 97, 251, 1000])
+def test_fast_length_is_smallest_5_smooth(n):
+    def smooth(m):
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        return m == 1
+
+    length = _fast_length(n)
+    assert length >= n and smooth(length)
+    assert not any(smooth(m) for m in range(n, length))
+
+
+def test_window_sums_match_direct_sums():
+    image = _scene(1, (20, 30))
+    total, squared = integral_images(image)
+    sums = window_sums(total, 5, 7)
+    assert sums.shape == (16, 24)
+    assert np.allclose(sums[3, 4], image[3:8, 4:11].sum(dtype=np.float64))
+    assert np.allclose(window_sums(squared, 5, 7)[3, 4],
+                       np.square(image[3:8, 4:11], dtype=np.float64).sum())
+
+
+def test_ncc_map_matches_brute_force():
+    image = _scene(2, (30, 40))
+    template = image[10:18, 5:17].copy()
+    scores = ncc_map(image, template)
+    assert scores.shape == (23, 29)
+    assert np.allclose(scores, _brute_ncc(image.astype(np.float64), template.astype(np.float64)),
+                       atol=1e-4)
+    assert np.unravel_index(np.argmax(scores), scores.shape) == (10, 5)
+
+
+def test_ncc_map_rejects_flat_or_oversized_template():
+    image = _scene(3, (20, 20))
+    assert ncc_map(image, np.full((4, 4), 9.0, dtype=np.float32)) is None
+    assert ncc_map(image, np.ones((30, 5), dtype=np.float32)) is None
+
+
+def test_ncc_map_ignores_flat_windows():
+    image = np.zeros((20, 20), dtype=np.float32)
+    image[:, 10:] = _scene(4, (20, 10))
+    scores = ncc_map(image, _scene(5, (5, 5)))
+    assert np.all(scores[:, :6] == 0.0)
+
+
+def test_find_peaks_suppresses_neighbours():
+    scores = np.zeros((20, 20))
+    scores[5, 5], scores[5, 6], scores[15, 15] = 0.99, 0.98, 0.9
+    peaks = find_peaks(scores, 0.5, 4, 2, 2)
+    assert [(y, x) for y, x, _ in peaks] == [(5, 5), (15, 15)]
+
+
+def test_template_pyramid_stops_at_min_size():
+    assert Template("t", _scene(6, (40, 80)), levels=3).levels == 1
+    assert Template("t", _scene(6, (64, 64)), levels=3).levels == 2
+
+
+def test_matcher_finds_template_through_pyramid():
+    # 축소 단계에서도 구조가 남도록 블록 단위 무늬를 사용 (축소 격자와 어긋난 홀수 위치)
+    rng = np.random.default_rng(7)
+    scene = np.kron(rng.uniform(0, 255, (40, 50)), np.ones((8, 8))).astype(np.float32)
+    template = scene[61:101, 83:131].copy()
+
+    matcher = TemplateMatcher(threshold=0.9, levels=2)
+    matcher.add_template("chat", template)
+    assert matcher.templates[0].levels == 1
+    matches = matcher.match(scene)
+    assert len(matches) >= 1
+    best = matches[0]
+    assert (best.name, best.x, best.y, best.width, best.height) == ("chat", 83, 61, 48, 40)
+    assert best.score == pytest.approx(1.0, abs=1e-3)
+
+
+def test_matcher_finds_repeated_templates_once_each():
+    rng = np.random.default_rng(8)
+    scene = rng.uniform(0, 60, (120, 160)).astype(np.float32)
+    patch = rng.uniform(100, 255, (20, 20)).astype(np.float32)
+    scene[10:30, 15:35] = patch
+    scene[70:90, 110:130] = patch
+
+    matcher = TemplateMatcher(threshold=0.9, levels=0)
+    matcher.add_template("token", patch)
+    found = sorted((m.x, m.y) for m in matcher.match(scene))
+    assert found == [(15, 10), (110, 70)]
+
+
+def test_add_template_replaces_same_name():
+    matcher = TemplateMatcher()
+    assert matcher.match(_scene()) == []
+    matcher.add_template("a", _scene(9, (20, 20)))
+    matcher.add_template("a", _scene(10, (24, 24)))
+    assert [(t.name, t.height) for t in matcher.templates] == [("a", 24)]
+    matcher.remove_template("a")
+    assert matcher.templates == []
+
+
+def test_to_gray_weights_channels():
+    pixels = np.zeros((1, 3, 4), dtype=np.uint8)
+    pixels[0, 0, 0] = pixels[0, 1, 1] = pixels[0, 2, 2] = 255  # B, G, R
+    assert np.allclose(to_gray(pixels)[0], [0.114 * 255, 0.587 * 255, 0.299 * 255])
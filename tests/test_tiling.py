@@ -0,0 +1,82 @@
+# test_tiling.py
+
+"""tiling.TileTracker: 바뀐 타일 판별과 영역 병합"""
+
+import numpy as np
+import pytest
+
+from python.tiling import TileTracker
+
+
+def _random_pixels(height, width, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+def test_first_update_is_full_frame():
+    tracker = TileTracker(tile_size=32)
+    pixels = _random_pixels(100, 70)
+    assert tracker.update(pixels) == [(0, 100, 0, 70)]
+    assert tracker.dirty_tiles == 4 * 3
+    assert tracker.signature.shape == (4, 3)
+
+
+def test_unchanged_frame_has_no_regions():
+    tracker = TileTracker(tile_size=32)
+    pixels = _random_pixels(100, 70)
+    tracker.update(pixels)
+    assert tracker.update(pixels.copy()) == []
+    assert tracker.clean_tiles == 12
+
+
+@pytest.mark.parametrize("y, x", [(0, 0), (99, 69), (40, 69), (99, 10), (50, 33)])
+def test_single_pixel_change_is_detected(y, x):
+    # 1픽셀짜리 변경도 샘플링 간격에 가려지지 않아야 함 (가장자리 자투리 타일 포함)
+    tracker = TileTracker(tile_size=32)
+    pixels = _random_pixels(100, 70)
+    tracker.update(pixels)
+    changed = pixels.copy()
+    changed[y, x, 0] ^= 1
+
+    regions = tracker.update(changed)
+    assert tracker.dirty_tiles == 1
+    row, col = y // 32, x // 32
+    assert regions == [(row * 32, min(row * 32 + 32, 100), col * 32, min(col * 32 + 32, 70))]
+
+
+def test_moving_content_inside_tile_is_detected():
+    tracker = TileTracker(tile_size=32)
+    pixels = np.zeros((32, 32, 4), dtype=np.uint8)
+    pixels[10, 10] = 200
+    tracker.update(pixels)
+    moved = np.zeros_like(pixels)
+    moved[10, 11] = 200
+    assert tracker.update(moved) == [(0, 32, 0, 32)]
+
+
+def test_halo_expands_dirty_tiles():
+    tracker = TileTracker(tile_size=16)
+    pixels = _random_pixels(64, 64)
+    tracker.update(pixels)
+    changed = pixels.copy()
+    changed[20, 20, 1] ^= 0xFF
+    assert tracker.update(changed, halo=10) == [(0, 48, 0, 48)]
+
+
+def test_visible_mask_skips_tiles_outside_shape():
+    tracker = TileTracker(tile_size=16)
+    mask = np.zeros((32, 64), dtype=np.uint8)
+    mask[:, :20] = 255
+    visible = tracker.tile_coverage(mask)
+    assert visible.tolist() == [[True, True, False, False], [True, True, False, False]]
+
+    assert tracker.update(_random_pixels(32, 64), visible=visible) == [(0, 32, 0, 32)]
+    assert tracker.masked_tiles == 4
+
+
+def test_reset_and_resize_force_full_frame():
+    tracker = TileTracker(tile_size=16)
+    pixels = _random_pixels(32, 32)
+    tracker.update(pixels)
+    tracker.reset()
+    assert tracker.update(pixels) == [(0, 32, 0, 32)]
+    assert tracker.update(_random_pixels(40, 32)) == [(0, 40, 0, 32)]
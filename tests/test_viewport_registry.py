@@ -0,0 +1,71 @@
+# test_viewport_registry.py
+
+"""viewport_registry.SpatialGrid: 균일 격자 공간 인덱스"""
+
+import random
+
+from PySide6.QtCore import QRect, QPoint
+
+from python.viewport_registry import SpatialGrid
+
+
+def _brute_force_rect(rects, query):
+    return {key for key, rect in rects.items() if rect.intersects(query)}
+
+
+def _brute_force_point(rects, point):
+    return {key for key, rect in rects.items() if rect.contains(point)}
+
+
+def test_insert_query_and_remove():
+    grid = SpatialGrid(cell_size=100)
+    grid.insert("a", QRect(0, 0, 50, 50))
+    grid.insert("b", QRect(90, 90, 200, 20))
+
+    assert len(grid) == 2 and "a" in grid
+    assert grid.bounds("b") == (90, 90, 290, 110)
+    assert grid.query_rect(QRect(40, 40, 60, 60)) == {"a", "b"}
+    assert grid.query_point(QPoint(250, 100)) == {"b"}
+
+    grid.remove("a")
+    assert "a" not in grid
+    assert grid.query_rect(QRect(0, 0, 50, 50)) == set()
+    grid.remove("missing")  # 없는 키는 무시
+
+
+def test_edges_are_half_open():
+    grid = SpatialGrid(cell_size=64)
+    grid.insert(1, QRect(0, 0, 64, 64))
+    assert grid.query_point(QPoint(63, 63)) == {1}
+    assert grid.query_point(QPoint(64, 10)) == set()
+    assert grid.query_rect(QRect(64, 0, 10, 10)) == set()
+
+
+def test_move_updates_cells():
+    grid = SpatialGrid(cell_size=64)
+    grid.insert(1, QRect(0, 0, 10, 10))
+    grid.insert(1, QRect(500, 500, 10, 10))
+    assert grid.query_point(QPoint(5, 5)) == set()
+    assert grid.query_point(QPoint(505, 505)) == {1}
+    assert len(grid) == 1
+
+
+def test_matches_brute_force_with_negative_coordinates():
+    rng = random.Random(7)
+    grid = SpatialGrid(cell_size=128)
+    rects = {}
+    for key in range(200):
+        rect = QRect(rng.randint(-1000, 1000), rng.randint(-800, 800),
+                     rng.randint(1, 400), rng.randint(1, 300))
+        rects[key] = rect
+        grid.insert(key, rect)
+    for key in range(0, 200, 3):
+        grid.remove(key)
+        del rects[key]
+
+    for _ in range(100):
+        query = QRect(rng.randint(-1100, 1100), rng.randint(-900, 900),
+                      rng.randint(1, 500), rng.randint(1, 500))
+        assert grid.query_rect(query) == _brute_force_rect(rects, query)
+        point = QPoint(rng.randint(-1100, 1100), rng.randint(-900, 900))
+        assert grid.query_point(point) == _brute_force_point(rects, point)